@@ -3,11 +3,433 @@ from solid.utils import *
 import os
 import subprocess
 import math
+import contextlib
+import concurrent.futures
+import functools
+import hashlib
+import keyword
+import numbers
+import io
+import sys
+import types
+import time
+import tracemalloc
+import argparse
+import copy
+import http.server
+import socket
+import tempfile
+import urllib.request
+import struct
+import zlib
+import difflib
+import json
+import threading
+import queue
+import collections
+import shutil
+import zipfile
+import xml.sax.saxutils
+import numpy as np
+
+
+##################################################################
+# The parts are built out of these instead of the SolidPython
+# objects.  A SolidPython object carries a dict of params, a list
+# of children, a parent pointer, traits, hole flags, ... and the
+# parts make thousands of them (every tick mark, every bolt hole).
+# A CsgNode is three slots: an interned operator name, a tuple of
+# (key, value) params and a tuple of children.  Nodes are never
+# changed after they are made, so a node can be shared by many
+# trees.  to_solid() turns a tree into SolidPython objects if you
+# ever need them, ScadWriter writes them straight to a scad file.
+##################################################################
+class CsgNode:
+    __slots__ = ("name", "params", "children")
+
+    # so it can be written the same way as a SolidPython object
+    modifier = ""
+    is_hole = False
+
+    # the order of the children of these does not change the shape
+    commutative = frozenset(("union", "intersection", "hull", "minkowski"))
+
+    def __init__(self, name, params=(), children=()):
+        self.name = sys.intern(name)
+        self.params = params
+        self.children = children
+
+    # union()(a, b) or translate(v)(a).  Makes a new node with the children added.
+    def __call__(self, *args):
+        if len(args) == 1 and type(args[0]) is CsgNode:
+            return CsgNode(self.name, self.params, self.children + args)
+        children = []
+        for arg in args:
+            if isinstance(arg, (list, tuple)):
+                children.extend(arg)
+            elif isinstance(arg, CsgNode):
+                children.append(arg)
+            elif arg != 0:  # so sum() works
+                raise ValueError("can not add {} to a {}".format(arg, self.name))
+        if not children:
+            return self
+        return CsgNode(self.name, self.params, self.children + tuple(children))
+
+    # a + b is union()(a, b), except that (a + b) + c is union()(a, b, c) and not union()(union()(a, b), c)
+    # same for - and *.
+    def combine(self, name, other):
+        if self.name == name:
+            return CsgNode(name, (), self.children + (other,))
+        return CsgNode(name, (), (self, other))
+
+    def __add__(self, other):
+        return self.combine("union", other)
+
+    def __radd__(self, other):
+        if isinstance(other, CsgNode):
+            return other.combine("union", self)
+        return self  # 0 + node for sum()
+
+    def __sub__(self, other):
+        return self.combine("difference", other)
+
+    def __mul__(self, other):
+        return self.combine("intersection", other)
+
+    def __repr__(self):
+        return "CsgNode({}, {}, {} children)".format(self.name, dict(self.params), len(self.children))
+
+    def to_solid(self):
+        converted = dict()
+        stack = [(self, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if id(node) in converted:
+                continue
+            if not children_done:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.children if id(child) not in converted)
+                continue
+            obj = OpenSCADObject(node.name, dict(node.params))
+            obj.add([converted[id(child)] for child in node.children])
+            converted[id(node)] = obj
+        return converted[id(self)]
+
+    # A hash of the shape the tree makes rather than of how it was written: the children of a union
+    # (intersection, hull, minkowski) are sorted and nested unions are flattened, the children of a
+    # difference after the first are sorted, and numbers are rounded to 1e-6.  So two parts that are
+    # built differently but come out the same have the same hash.
+    def structural_hash(self):
+        digests = dict()
+        operands = dict()  # the flattened children of the commutative nodes
+        stack = [(self, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if id(node) in digests:
+                continue
+            if not children_done:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.children if id(child) not in digests)
+                continue
+            children = [digests[id(child)] for child in node.children]
+            if node.name in self.commutative and not node.params:
+                children = []
+                for child in node.children:
+                    if child.name == node.name and id(child) in operands:
+                        children.extend(operands[id(child)])
+                    else:
+                        children.append(digests[id(child)])
+                children.sort()
+                operands[id(node)] = children
+                if len(children) == 1:
+                    digests[id(node)] = children[0]
+                    continue
+            elif node.name == "difference":
+                children[1:] = sorted(children[1:])
+            sha1 = hashlib.sha1(node.name.encode())
+            sha1.update(repr(_csg_rounded(node.params)).encode())
+            for digest in children:
+                sha1.update(digest)
+            digests[id(node)] = sha1.digest()
+        return digests[id(self)].hex()
+
+
+def _csg_rounded(value):
+    if type(value) is float or type(value) is int:
+        return round(value, 6) + 0.0  # 1 and 1.0 are the same, and no -0.0
+    if type(value) is tuple:
+        return tuple(_csg_rounded(v) for v in value)
+    return value
+
+
+# make a value safe to keep in a node, lists become tuples.  This is called for every
+# parameter of every node so the common cases are checked first.
+def _csg_value(value):
+    kind = type(value)
+    if kind is tuple or kind is float or kind is int:
+        return value
+    if kind is list:
+        return tuple(value)
+    if isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, numbers.Integral):  # numpy numbers
+        return int(value)
+    if isinstance(value, numbers.Real):
+        return float(value)
+    if hasattr(value, "__iter__"):
+        return tuple(_csg_value(v) for v in value)
+    return value
+
+
+def _csg_params(**params):
+    return tuple([(key, _csg_value(value)) for key, value in params.items() if value is not None])
+
+
+# the transforms are made a lot, so skip the keyword handling for them
+def _csg_vector_node(name, key, v):
+    if v is None:
+        return CsgNode(name)
+    kind = type(v)
+    if kind is not tuple:
+        v = tuple(v) if kind is list else _csg_value(v)
+    return CsgNode(name, ((key, v),))
+
+
+# These replace the SolidPython objects of the same name.
+def cube(size=None, center=None):
+    if center is None:
+        return _csg_vector_node("cube", "size", size)
+    return CsgNode("cube", _csg_params(size=size, center=center))
+
+
+def sphere(r=None, d=None, segments=None):
+    return CsgNode("sphere", _csg_params(r=r, d=d, segments=segments))
+
+
+def cylinder(r=None, h=None, r1=None, r2=None, d=None, d1=None, d2=None, center=None, segments=None):
+    return CsgNode("cylinder", _csg_params(r=r, h=h, r1=r1, r2=r2, d=d, d1=d1, d2=d2, center=center,
+                                           segments=segments))
+
+
+def circle(r=None, d=None, segments=None):
+    return CsgNode("circle", _csg_params(r=r, d=d, segments=segments))
+
+
+def square(size=None, center=None):
+    return CsgNode("square", _csg_params(size=size, center=center))
+
+
+def polygon(points, paths=None, convexity=None):
+    points = [(p[0], p[1]) for p in points]
+    return CsgNode("polygon", _csg_params(points=points, convexity=convexity, paths=paths or None))
+
+
+def text(text, size=None, font=None, halign=None, valign=None, spacing=None, direction=None,
+         language=None, script=None, segments=None):
+    return CsgNode("text", _csg_params(text=text, size=size, font=font, halign=halign, valign=valign,
+                                       spacing=spacing, direction=direction, language=language, script=script,
+                                       segments=segments))
+
+
+def import_(file, origin=(0, 0), convexity=None, layer=None):
+    return CsgNode("import", _csg_params(file=file, origin=origin, convexity=convexity, layer=layer))
+
+
+def translate(v=None):
+    return _csg_vector_node("translate", "v", v)
+
+
+def rotate(a=None, v=None):
+    if v is None:
+        return _csg_vector_node("rotate", "a", a)
+    return CsgNode("rotate", _csg_params(a=a, v=v))
+
+
+def scale(v=None):
+    return _csg_vector_node("scale", "v", v)
+
+
+def mirror(v):
+    return CsgNode("mirror", _csg_params(v=v))
+
+
+def multmatrix(m):
+    return CsgNode("multmatrix", _csg_params(m=m))
+
+
+def color(c, alpha=1.0):
+    return CsgNode("color", _csg_params(c=c, alpha=alpha))
+
+
+def union():
+    return CsgNode("union")
+
+
+def difference():
+    return CsgNode("difference")
+
+
+def intersection():
+    return CsgNode("intersection")
+
+
+def hull():
+    return CsgNode("hull")
+
+
+def minkowski():
+    return CsgNode("minkowski")
+
+
+def linear_extrude(height=None, center=None, convexity=None, twist=None, slices=None, scale=None):
+    return CsgNode("linear_extrude", _csg_params(height=height, center=center, convexity=convexity, twist=twist,
+                                                 slices=slices, scale=scale))
+
+
+def rotate_extrude(angle=360, convexity=None, segments=None):
+    return CsgNode("rotate_extrude", _csg_params(angle=angle, convexity=convexity, segments=segments))
+
+
+# Raised when a part writes to the model while it is being generated
+class ModelMutationError(RuntimeError):
+    pass
+
+
+# Raised at the end of a build that made an empty or broken mesh
+class MeshError(RuntimeError):
+    pass
+
+
+##################################################################
+# A frozen, hashable snapshot of all the values a model is built
+# from.  Two models with the same values have equal parameters, so
+# this is what part results are keyed on.
+##################################################################
+class BandSawParameters:
+    # values that change where and how the files are made, not what is in them
+    not_parameters = {"make_stl", "output_directory", "production_output_directory", "scad_float_format",
+                      "openscad_executable", "stl_memory_budget_mb", "stl_max_jobs", "stl_max_waiting",
+                      "render_farm_host", "render_farm_max_jobs", "render_farm_heartbeat_timeout", "make_previews",
+                      "preview_backend", "preview_size", "preview_cameras", "preview_views", "stl_format", "plates",
+                      "symmetric_meshing", "diff_voxel_size", "diff_max_lines",
+                      "draft_voxel_size", "draft_slices", "assembly_parts", "bolt_hole_tolerance",
+                      "fasteners", "printers", "tolerance_printer", "tolerance_samples", "fit_limits"}
+
+    def __init__(self, items):
+        object.__setattr__(self, "_items", tuple(sorted(items)))
+        object.__setattr__(self, "_values", dict(self._items))
+        object.__setattr__(self, "_hash", hash(self._items))
+
+    @classmethod
+    def from_model(cls, model):
+        items = []
+        for key, value in cls.model_values(model):
+            value = cls.freeze(value)
+            if value is not None:
+                items.append((key, value))
+        return cls(items)
+
+    @classmethod
+    def model_values(cls, model):
+        for key, value in vars(model).items():
+            if not key.startswith("_") and key not in cls.not_parameters:
+                yield key, value
+        for key, value in vars(model.tools).items():
+            if not key.startswith("_"):
+                yield "tools." + key, value
+
+    # the parameters as plain values for the manifest, a dict is flattened into "key.inner_key" values so a
+    # diff of two builds can tell which of its values changed (e.g. tools.bolt_sizes.1/4.bolt)
+    @classmethod
+    def flatten(cls, model):
+        flat = dict()
+
+        def add(key, value):
+            if isinstance(value, dict):
+                for inner_key, inner_value in value.items():
+                    add("{}.{}".format(key, inner_key), inner_value)
+            elif cls.freeze(value) is not None:
+                flat[key] = value
+        for key, value in cls.model_values(model):
+            add(key, value)
+        return flat
+
+    # turn a value into something hashable, or None if it is not a parameter (parts lists, tools, ...)
+    @classmethod
+    def freeze(cls, value):
+        if isinstance(value, (bool, int, float, str)):
+            return value
+        if isinstance(value, (list, tuple)):
+            frozen = tuple(cls.freeze(v) for v in value)
+            return None if None in frozen else frozen
+        if isinstance(value, dict):
+            frozen = tuple(sorted((k, cls.freeze(v)) for k, v in value.items()))
+            return None if any(v is None for _, v in frozen) else frozen
+        return None
+
+    def __getattr__(self, key):
+        try:
+            return self._values[key]
+        except KeyError:
+            raise AttributeError(key)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("BandSawParameters is frozen")
+
+    def __eq__(self, other):
+        return isinstance(other, BandSawParameters) and self._items == other._items
+
+    def __hash__(self):
+        return self._hash
+
+    def items(self):
+        return self._items
+
+    # a short stable string that identifies these values across runs
+    def fingerprint(self):
+        return hashlib.sha1(repr(self._items).encode()).hexdigest()[:16]
+
+
+##################################################################
+# How many sides the circles get.
+#
+# The segments of a circle are worked out from its radius so the
+# polygon is never further than chord_error from the real circle:
+# r * (1 - cos(180 / segments)) <= chord_error.  So a wheel gets a
+# lot of segments and a bolt hole a few, and the whole model gets
+# coarser or finer by picking a profile.  Segments are rounded up to
+# a multiple of 4 so circles still touch their bounding box.
+##################################################################
+class Resolution:
+    profiles = dict(
+        draft=dict(chord_error=8.0, min_segments=4, max_segments=12, slivers=3, sweep_steps=10),
+        preview=dict(chord_error=0.1, min_segments=12, max_segments=180, slivers=5, sweep_steps=10),
+        production=dict(chord_error=0.01, min_segments=24, max_segments=720, slivers=20, sweep_steps=40),
+    )
+
+    def __init__(self, profile="preview"):
+        if profile not in self.profiles:
+            raise ValueError("unknown resolution profile {}, use one of {}".format(profile, ", ".join(self.profiles)))
+        self.profile = profile
+        self.chord_error = self.profiles[profile]["chord_error"]
+        self.min_segments = self.profiles[profile]["min_segments"]
+        self.max_segments = self.profiles[profile]["max_segments"]
+        self.slivers = self.profiles[profile]["slivers"]  # the cones the crown of a wheel is made of
+        self.sweep_steps = self.profiles[profile]["sweep_steps"]  # of the miter rotation slot
+
+    def segments(self, r):
+        if r <= self.chord_error:
+            return self.min_segments
+        segments = math.ceil(math.pi / math.acos(1 - self.chord_error / r))
+        segments = 4 * math.ceil(segments / 4)
+        return min(max(segments, self.min_segments), self.max_segments)
 
 
 # Design tools that have nothing to do with the band saw.
 class HelperTools:
-    def __init__(self):
+    def __init__(self, resolution=None):
+        self.resolution = resolution or Resolution()
+
         self.bolt_sizes = dict()
         self.bolt_sizes["3mm"] = dict(bolt=3.3, nut=5, depth=3)
         self.bolt_sizes["4mm"] = dict(bolt=4.4, nut=6.7, depth=4)
@@ -23,19 +445,110 @@ class HelperTools:
         self.round_bolt_sizes = dict()
         self.round_bolt_sizes["5mm"] = dict(bolt=5.5, nut=9.5, depth=5, flat=8.3)
         self.round_bolt_sizes["4mm"] = dict(bolt=4.5, nut=7.2, depth=5)
-
-    def horizontal_cylinder_d(self, d, h, center=False, segments=30):
-        obj = rotate((-90, 0, 0))(cylinder(d=d, h=h, center=center, segments=segments))
+        self._holes = None  # a list while the bolt holes are registered, see BandSaw.check_bolt_holes()
+
+    # the number of segments for a circle of radius r, segments is only given for shapes like hexagons
+    def segments(self, r, segments=None):
+        if segments:
+            return max(int(segments), 3)
+        return self.resolution.segments(r)
+
+    # every cylinder goes through here so it gets the segments of the resolution
+    def cylinder(self, r=None, h=None, r1=None, r2=None, d=None, d1=None, d2=None, center=None, segments=None):
+        radius = max(value for value in (r, r1, r2, d and d / 2.0, d1 and d1 / 2.0, d2 and d2 / 2.0, 0)
+                     if value is not None)
+        return cylinder(r=r, h=h, r1=r1, r2=r2, d=d, d1=d1, d2=d2, center=center,
+                        segments=self.segments(radius, segments))
+
+    def circle(self, r=None, d=None, segments=None):
+        return circle(r=r, d=d, segments=self.segments(r if r is not None else d / 2.0, segments))
+
+    def horizontal_cylinder_d(self, d, h, center=False, segments=None):
+        obj = rotate((-90, 0, 0))(self.cylinder(d=d, h=h, center=center, segments=segments))
         return obj
 
-    def horizontal_cylinder_d1d2(self, d1, d2, h, center=False, segments=30):
-        obj = rotate((-90, 0, 0))(cylinder(d1=d1, d2=d2, h=h, center=center, segments=segments))
+    def horizontal_cylinder_d1d2(self, d1, d2, h, center=False, segments=None):
+        obj = rotate((-90, 0, 0))(self.cylinder(d1=d1, d2=d2, h=h, center=center, segments=segments))
         return obj
 
     def horizontal_cylinder_r(self, r, h, center=False):
-        obj = rotate((-90, 0, 0))(cylinder(r=r, h=h, center=center))
+        obj = rotate((-90, 0, 0))(self.cylinder(r=r, h=h, center=center))
+        return obj
+
+    # counter clockwise convex hull of 2d points without the points in the middle of an edge.
+    def convex_hull_2d(self, points):
+        points = np.unique(np.round(np.asarray(points, dtype=float), 9), axis=0).tolist()
+
+        def cross(o, a, b):
+            return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+        def chain(points):
+            result = []
+            for p in points:
+                while len(result) >= 2 and cross(result[-2], result[-1], p) <= 0:
+                    result.pop()
+                result.append(p)
+            return result[:-1]
+
+        return np.array(chain(points) + chain(points[::-1]))
+
+    # The outline of the hull of circles of diameter d around each (x, y) of centers.  The circles have
+    # the same corners as our cylinders, so the extruded outline is the same solid as the hull() of the
+    # cylinders.
+    def slot_outline(self, d, centers, segments=None):
+        r = d / 2.0
+        n = self.segments(r, segments)
+        angles = 2 * math.pi * np.arange(n) / n
+        circle = r * np.column_stack((np.cos(angles), np.sin(angles)))
+        points = np.asarray(centers, dtype=float)[:, None, :] + circle[None, :, :]
+        return self.convex_hull_2d(points.reshape(-1, 2))
+
+    # hull() of self.cylinder(d=d, h=h) standing on each (x, y) of centers, made as one extruded polygon.
+    # Two centers give a slot, more give a polygon with round corners.
+    def slot_d(self, d, h, centers, center=False, segments=None):
+        outline = self.slot_outline(d, centers, segments)
+        return linear_extrude(height=h, center=center)(polygon(outline.tolist()))
+
+    # hull() of horizontal_cylinder_d at each (x, z) of centers, along y like horizontal_cylinder_d.
+    def horizontal_slot_d(self, d, h, centers, center=False, segments=None):
+        obj = rotate((-90, 0, 0))(self.slot_d(d, h, [(x, -z) for x, z in centers], center, segments))
         return obj
 
+    # The outline of a slot that follows an arc around the origin: the ring between radius - width / 2
+    # and radius + width / 2 from start_angle to end_angle (degrees, counter clockwise from x) with
+    # round ends.  segments is for a full circle, like $fn, the ends use end_segments.  Both come from
+    # the resolution if they are not given.
+    def arc_slot_outline(self, radius, width, start_angle, end_angle, segments=None, end_segments=None):
+        segments = self.segments(radius + width / 2.0, segments)
+        end_segments = self.segments(width / 2.0, end_segments)
+        start = math.radians(start_angle)
+        end = math.radians(end_angle)
+        arc_steps = max(int(math.ceil(segments * (end_angle - start_angle) / 360.0)), 1)
+        cap_steps = max(int(math.ceil(end_segments / 2.0)), 2)
+
+        arc = np.linspace(start, end, arc_steps + 1)
+        cap = np.linspace(0, math.pi, cap_steps + 1)[1:-1]  # the ends of the caps are on the arcs
+
+        def ring(angles, r):
+            return np.column_stack((r * np.cos(angles), r * np.sin(angles)))
+
+        def end_cap(angle, sweep):
+            center = radius * np.array((math.cos(angle), math.sin(angle)))
+            return center + ring(angle + sweep, width / 2.0)
+
+        outline = np.concatenate((ring(arc, radius + width / 2.0),
+                                  end_cap(end, cap),
+                                  ring(arc[::-1], radius - width / 2.0),
+                                  end_cap(start, cap + math.pi)))
+        return outline
+
+    # a slot following an arc in the xy plane, made as one extruded polygon instead of a union of
+    # cylinders along the arc.  It is height tall, like a cylinder.
+    def arc_slot(self, radius, width, start_angle, end_angle, height, center=False, segments=None,
+                 end_segments=None):
+        outline = self.arc_slot_outline(radius, width, start_angle, end_angle, segments, end_segments)
+        return linear_extrude(height=height, center=center)(polygon(outline.tolist()))
+
     def round_bolt_hole_z(self, size, length, make_head=True):
 
         data = self.round_bolt_sizes[size]
@@ -43,12 +556,12 @@ class HelperTools:
         nut_diameter = data['nut']
         nut_depth = data['depth']
         if make_head:
-            hole = cylinder(d=bolt_diameter, h=length + nut_depth, segments=30)
+            hole = self.cylinder(d=bolt_diameter, h=length + nut_depth)
             # make the head part really long
-            hole += translate((0, 0, -1000))(cylinder(d=nut_diameter, h=nut_depth + 1000, segments=30))
-        else:
-            hole = cylinder(d=bolt_diameter, h=1000, segments=30, center=True)
-        return hole
+            hole += translate((0, 0, -1000))(self.cylinder(d=nut_diameter, h=nut_depth + 1000))
+            return self.register_hole(hole, size, bolt_diameter, -1000, length + nut_depth)
+        hole = self.cylinder(d=bolt_diameter, h=1000, center=True)
+        return self.register_hole(hole, size, bolt_diameter, -500, 500)
 
     def round_bolt_hole_y(self, size, length, make_head=True):
         hole = rotate((-90, 0, 0))(self.round_bolt_hole_z(size, length, make_head))
@@ -65,11 +578,22 @@ class HelperTools:
         nut_diameter = data['nut']
         nut_depth = data['depth']
         if make_head:
-            hole = cylinder(d=bolt_diameter, h=length + nut_depth, segments=30)
+            hole = self.cylinder(d=bolt_diameter, h=length + nut_depth)
             # make the hexagonal part really long
-            hole += translate((0, 0, -1000))(cylinder(d=nut_diameter, h=nut_depth + 1000, segments=6))
-        else:
-            hole = cylinder(d=bolt_diameter, h=1000, segments=30, center=True)
+            hole += translate((0, 0, -1000))(self.cylinder(d=nut_diameter, h=nut_depth + 1000, segments=6))
+            return self.register_hole(hole, size, bolt_diameter, -1000, length + nut_depth)
+        hole = self.cylinder(d=bolt_diameter, h=1000, center=True)
+        return self.register_hole(hole, size, bolt_diameter, -500, 500)
+
+    # A bolt hole along z, from start to end, is remembered with the method of the part that made it (e.g.
+    # blade_protector_bolts) while BandSaw.check_bolt_holes is looking for them.
+    def register_hole(self, hole, size, diameter, start, end):
+        if self._holes is not None:
+            frame = sys._getframe(1)
+            while frame is not None and frame.f_locals.get("self") is self:
+                frame = frame.f_back
+            self._holes.append(dict(node=hole, size=size, diameter=diameter, start=start, end=end,
+                                    made_by=frame.f_code.co_name if frame is not None else None))
         return hole
 
     def hexagonal_bolt_hole_y(self, size, length, make_head=True):
@@ -87,46 +611,2377 @@ class HelperTools:
         return three_bolts
 
     def wheel_cover(self, diameter, thickness, depth, cover_width):
-        cover = translate((0, 0, thickness + 1))(cylinder(d=diameter + 2 * thickness, h=depth - 1))
+        cover = translate((0, 0, thickness + 1))(self.cylinder(d=diameter + 2 * thickness, h=depth - 1))
 
         # cut out the insede
-        cover -= cylinder(d=diameter, h=depth)
+        cover -= self.cylinder(d=diameter, h=depth)
 
-        cover -= cylinder(d=diameter - 2 * cover_width + 2 * thickness, h=300, center=True)
+        cover -= self.cylinder(d=diameter - 2 * cover_width + 2 * thickness, h=300, center=True)
 
-        cover -= cylinder(d=20, h=200, center=True)
+        cover -= self.cylinder(d=20, h=200, center=True)
         cover -= translate((-1000, 0, 0))(cube((2000, 2000, depth)))
         cover = rotate((-90, 0, 0))(cover)
         cover = scale((1, -1, 1))(cover)
         cover = translate((0, thickness + depth, 0))(cover)
         square_cutter = translate((-diameter / 2 + cover_width - thickness, -150, -diameter / 2 - 30))(
             cube((300, 300, diameter / 2 + 30)))
-        cutter = translate((80, 0, -100))(
-            rotate((90, 0, 0))(
-                cylinder(d=diameter * 1.8, h=300, center=True)
-            )
-        )
         cover -= square_cutter
 
-        def spoke(length, angle):
-            spoke = translate((0, -5, 0))(cube((length, 10, thickness)))
-            spoke = rotate((0, 0, angle))(spoke)
-
-            return spoke
-
         # make the cover for the left hand side of the blade only.
         cover = cover - translate((-50, -1000, -1000))(cube((2000, 2000, 2000)))
 
         return cover
 
 
+# Writes path + ".partial" and renames it to path when the with block is done, so path is always either
+# the old file or the whole new one.  A run that is killed half way never leaves half a file behind.
+@contextlib.contextmanager
+def atomic_file(path, mode="w", **kwargs):
+    partial = path + ".partial"
+    try:
+        with open(partial, mode, **kwargs) as f:
+            yield f
+        os.replace(partial, path)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+
+
+##################################################################
+# Writes a tree of objects out as SCAD code.
+#
+# scad_render_to_file builds the whole file as one string, and it
+# does it recursively, re-indenting the text of every subtree at
+# every level.  This walks the tree with an explicit stack and
+# writes each line straight to a buffered file as it goes, so the
+# memory used does not depend on the size of the part and a long
+# chain of a += b does not hit the recursion limit.
+#
+# With the default float format the output is identical to
+# scad_render_to_file(obj, path, include_orig_code=False)
+##################################################################
+class ScadWriter:
+    def __init__(self, float_format="{:.10f}", buffer_size=1 << 16):
+        self.float_format = float_format
+        self.buffer_size = buffer_size
+
+    def write(self, obj, path):
+        with atomic_file(path, "w", buffering=self.buffer_size) as out:
+            self.write_to(obj, out)
+        return path
+
+    def to_string(self, obj):
+        out = io.StringIO()
+        self.write_to(obj, out)
+        return out.getvalue()
+
+    def write_to(self, obj, out):
+        write = out.write
+        write("\n")
+        heads = dict()  # a node that is used many times only has its parameters formatted once
+        # each entry is (node, depth), a depth of -1 - d means close the node opened at depth d
+        stack = [(obj, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if depth < 0:
+                write("\n" + "\t" * (-1 - depth) + "}")
+                continue
+            if node.is_hole or node.name in ("hole", "part"):
+                raise ValueError("ScadWriter does not support hole() and part()")
+            head = heads.get(id(node))
+            if head is None:
+                head = heads[id(node)] = self.format_head(node)
+            children = node.children
+            if not children:
+                write("\n" + "\t" * depth + head + ";")
+                continue
+            write("\n" + "\t" * depth + head + " {")
+            stack.append((node, -1 - depth))
+            for child in reversed(children):
+                stack.append((child, depth + 1))
+
+    def format_head(self, node):
+        params = dict(node.params)
+        # OpenSCAD doesn't have a 'segments' argument, it has '$fn'
+        if "segments" in params:
+            params["$fn"] = params.pop("segments")
+        args = []
+        for key in sorted(params, key=str):
+            value = params[key]
+            if value is None:
+                continue
+            if isinstance(key, int):
+                args.append(self.format_value(value))
+                continue
+            # python reserved words get an underscore on the end in python, e.g. or_ => or
+            if key.endswith("_") and keyword.iskeyword(key[:-1]):
+                key = key[:-1]
+            args.append(key + " = " + self.format_value(value))
+        return node.modifier + node.name + "(" + ", ".join(args) + ")"
+
+    def format_value(self, value):
+        if type(value) == bool:
+            return "true" if value else "false"
+        if type(value) == float:
+            return self.float_format.format(value)
+        if type(value) == str:
+            return '"' + value + '"'
+        if hasattr(value, "__iter__"):
+            return "[" + ", ".join(self.format_value(v) for v in value) + "]"
+        return str(value)
+
+
+##################################################################
+# Runs the OpenSCAD jobs that turn the scad files into stl files.
+#
+# The big parts (c_form, base_back_plate, blade_protector_cover)
+# use a lot of memory in production, so running them all at once
+# can run the machine out of memory, but running everything one at
+# a time wastes the other cores.  Every job records its peak memory
+# and cpu time (from wait4) in a history file, and the next run uses
+# that to start as many jobs as fit in the memory budget, biggest
+# first.  A job we have never seen is assumed to need
+# default_memory_mb.
+#
+# The history also has how long each job took, so the jobs are
+# started longest first (a long c_form started last is what makes a
+# run long) and we can print how much longer the run will take.
+#
+# OpenSCAD writes to output_file, name.partial.stl, and the stl is
+# only renamed to stl_file once OpenSCAD finished without an error,
+# so a killed job never leaves a half written stl.
+#
+# A job that imports the stl of another job (see split_parent) waits
+# for it, and is not run at all if that job failed.  Jobs can be
+# submitted while the others run, render_split cuts a part up as soon
+# as its stl is made.
+#
+# Inside batch() the jobs start as soon as they are submitted, so
+# OpenSCAD meshes the first parts while python builds and writes the
+# next ones.  The jobs run in threads but what happens when a job is
+# done (job.after: making the stl binary, checking it, cutting it up)
+# runs in the thread that submits the jobs, when it calls poll() or
+# submit(), so the model is only ever used from one thread.  When
+# more than max_waiting jobs are waiting for memory or a free core,
+# submit() waits for a running job to finish before it returns, so
+# the scad side never gets far ahead of the meshing.
+##################################################################
+class StlJob:
+    def __init__(self, name, mode, command, scad_file, stl_file, depends_on=(), output_file=None):
+        self.name = name
+        self.mode = mode  # the resolution the scad was made with, the same part costs a lot more in production
+        self.command = command
+        self.scad_file = scad_file
+        self.stl_file = stl_file
+        self.output_file = output_file or stl_file  # where the command writes the stl
+        self.depends_on = list(depends_on)  # stl files this scad imports, they have to be made first
+        self.after = []  # called with the job when the stl was made, they can submit more jobs
+        self.made_by = "meshed"  # how the stl is made, for the build summary
+        self.backend = "openscad"  # what made the mesh, openscad or numpy
+        self.imports = []  # the files the scad imports, a RenderFarm worker needs them too
+        self.remote = False  # made by a RenderFarm worker, it uses no memory here
+        self.key = "{}:{}".format(name, mode)
+        self.memory_mb = 0  # the estimates used for scheduling
+        self.seconds = None  # None if this job has never been run before
+        self.started = None
+        self.returncode = None
+        self.finished = False  # the runner is done with it, job.after was called
+        self.peak_rss_mb = 0
+        self.cpu_seconds = 0
+        self.wall_seconds = 0
+
+
+class StlJobRunner:
+    def __init__(self, history_file, memory_budget_mb=8000, max_jobs=None, default_memory_mb=2000, max_waiting=None):
+        self.history_file = history_file
+        self.memory_budget_mb = memory_budget_mb
+        self.max_jobs = max_jobs or os.cpu_count() or 1
+        self.default_memory_mb = default_memory_mb
+        self.max_waiting = max_waiting or 4 * self.max_jobs
+        self.history = self.load_history()
+        self.waiting = []
+        self.running = []
+        self.done = queue.Queue()  # the running jobs put themselves here when they are done
+        self.memory_in_use = 0
+        self.finished = []
+        self.failed_files = set()
+        self.in_batch = False
+        self.in_after = False
+        self.jobs_by_file = dict()
+
+    def load_history(self):
+        if not os.path.isfile(self.history_file):
+            return dict()
+        try:
+            with open(self.history_file) as f:
+                return json.load(f)
+        except ValueError:
+            print("Ignoring the broken stl history in {}".format(self.history_file))
+            return dict()
+
+    def save_history(self):
+        with atomic_file(self.history_file) as f:
+            json.dump(self.history, f, indent=1, sort_keys=True)
+
+    # add a job and start it if it fits.  Outside batch() this waits until it and the jobs it started are done.
+    # Returns the job, or the job already waiting to make the same stl file.
+    def submit(self, job):
+        if job.stl_file in self.jobs_by_file:
+            return self.jobs_by_file[job.stl_file]  # a split parent that is also a part of its own
+        self.jobs_by_file[job.stl_file] = job
+        job.memory_mb = self.estimate_memory_mb(job)
+        job.seconds = self.estimate_seconds(job)
+        self.waiting.append(job)
+        # longest first so the short ones fill in the gaps at the end
+        self.waiting.sort(key=self.longest_first)
+        self.start_jobs()
+        if self.in_after:
+            return job  # a job.after submitting more, the jobs are handled by whoever called it
+        if not self.in_batch:
+            self.run()
+        while len(self.waiting) > self.max_waiting and self.running:
+            self.finish(self.done.get())
+        return job
+
+    @contextlib.contextmanager
+    def batch(self):
+        self.in_batch = True
+        try:
+            yield self
+        finally:
+            self.in_batch = False
+        self.run()
+
+    def estimate_memory_mb(self, job):
+        if job.remote:
+            return 0
+        return self.history.get(job.key, dict()).get("peak_rss_mb", self.default_memory_mb)
+
+    def estimate_seconds(self, job):
+        return self.history.get(job.key, dict()).get("wall_seconds")
+
+    # jobs we know nothing about go first, they could be the long ones
+    def longest_first(self, job):
+        return (job.seconds is not None, -(job.seconds or 0), -job.memory_mb)
+
+    # how long until everything is done, with as many jobs at a time as can run: max_jobs, fewer when fewer are
+    # left or when only that many of them fit in the memory budget.  None if some of the jobs have never been run.
+    def eta_seconds(self, jobs, running):
+        now = time.perf_counter()
+        remaining = []
+        for job in jobs + running:
+            if job.seconds is None:
+                return None
+            elapsed = now - job.started if job.started else 0
+            remaining.append(max(job.seconds - elapsed, 0))
+        if not remaining:
+            return 0
+        memory_mb = sum(job.memory_mb for job in jobs + running) / len(remaining)
+        fit = int(self.memory_budget_mb // memory_mb) if memory_mb > 0 else len(remaining)
+        at_a_time = max(min(self.max_jobs, len(remaining), fit), 1)
+        return max(max(remaining), sum(remaining) / at_a_time)
+
+    def print_eta(self, jobs, running):
+        eta = self.eta_seconds(jobs, running)
+        left = len(jobs) + len(running)
+        if eta is None:
+            print("{} stl jobs left, no estimate yet".format(left))
+        else:
+            print("{} stl jobs left, about {:.0f}m {:02.0f}s to go".format(left, eta // 60, eta % 60))
+
+    # wait for all the jobs, the ones they submit too
+    def run(self):
+        if not (self.waiting or self.running):
+            return []
+        self.print_eta(self.waiting, self.running)
+        while self.waiting or self.running:
+            self.start_jobs()
+            if self.running:
+                self.finish(self.done.get())
+        self.save_history()
+        return self.finished
+
+    # handle the jobs that are done without waiting for the others
+    def poll(self):
+        while True:
+            try:
+                job = self.done.get_nowait()
+            except queue.Empty:
+                return
+            self.finish(job)
+
+    # start everything that fits, a job that is bigger than the whole budget runs on its own
+    def start_jobs(self):
+        waiting = set(job.stl_file for job in self.waiting + self.running)
+        for job in list(self.waiting):
+            if len(self.running) >= self.max_jobs:
+                break
+            if any(stl_file in waiting for stl_file in job.depends_on):
+                continue
+            failed = [stl_file for stl_file in job.depends_on if stl_file in self.failed_files]
+            if failed:
+                self.waiting.remove(job)
+                job.returncode = -1
+                job.finished = True
+                print("Skipping {}, {} failed".format(job.stl_file, failed[0]))
+                self.finished.append(job)
+                self.failed_files.add(job.stl_file)
+                waiting.discard(job.stl_file)
+                continue
+            if self.running and self.memory_in_use + job.memory_mb > self.memory_budget_mb:
+                continue
+            self.waiting.remove(job)
+            self.running.append(job)
+            job.started = time.perf_counter()
+            self.memory_in_use += job.memory_mb
+            print("Creating the stl file {} ({} running, ~{:.0f} of {} MB)".format(
+                job.stl_file, len(self.running), self.memory_in_use, self.memory_budget_mb))
+            threading.Thread(target=self.run_job, args=(job, self.done), daemon=True).start()
+
+    def finish(self, job):
+        self.running.remove(job)
+        self.memory_in_use -= job.memory_mb
+        self.in_after = True
+        try:
+            self.record(job)
+        finally:
+            self.in_after = False
+        self.start_jobs()
+        if self.waiting or self.running:
+            self.print_eta(self.waiting, self.running)
+
+    # runs in its own thread.  wait4 gives us the resources used by just this child.
+    def run_job(self, job, done):
+        start = time.perf_counter()
+        try:
+            if callable(job.command):
+                job.returncode = self.run_python_job(job)
+            else:
+                process = subprocess.Popen(job.command)
+                _, status, usage = os.wait4(process.pid, 0)
+                process.returncode = job.returncode = os.waitstatus_to_exitcode(status)
+                # linux reports ru_maxrss in kilobytes, macOS in bytes
+                scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+                job.peak_rss_mb = usage.ru_maxrss / scale
+                job.cpu_seconds = usage.ru_utime + usage.ru_stime
+            if job.output_file != job.stl_file:
+                if job.returncode == 0:
+                    os.replace(job.output_file, job.stl_file)
+                elif os.path.exists(job.output_file):
+                    os.remove(job.output_file)
+        except OSError as e:
+            print("Could not make {}: {}".format(job.stl_file, e))
+            job.returncode = -1
+        job.wall_seconds = time.perf_counter() - start
+        done.put(job)
+
+    # a job whose command is a function that makes the stl itself (see BandSaw.render_symmetric).  It
+    # returns the exit code, an error in it fails the job instead of the thread.
+    @staticmethod
+    def run_python_job(job):
+        start = time.thread_time()
+        try:
+            return job.command(job)
+        except Exception as e:
+            print("Could not make {}: {!r}".format(job.stl_file, e))
+            return -1
+        finally:
+            job.cpu_seconds = time.thread_time() - start
+
+    def record(self, job):
+        self.finished.append(job)
+        job.finished = True
+        if job.returncode != 0:
+            self.failed_files.add(job.stl_file)
+            print("FAILED: {} exited with {}".format(job.stl_file, job.returncode))
+            return
+        print("Finished {} in {:.1f}s, peak memory {:.0f} MB, cpu {:.1f}s".format(
+            job.name, job.wall_seconds, job.peak_rss_mb, job.cpu_seconds))
+        entry = self.history.setdefault(job.key, dict(runs=0))
+        entry["runs"] += 1
+        entry["peak_rss_mb"] = round(job.peak_rss_mb, 1)
+        entry["cpu_seconds"] = round(job.cpu_seconds, 2)
+        entry["wall_seconds"] = round(job.wall_seconds, 2)
+        for after in job.after:
+            after(job)
+
+
+##################################################################
+# A render farm, for when one machine is not enough (a dozen
+# variants of the saw in production).  python BandSaw.py --farm PORT
+# runs render_all with a RenderFarm: the stl jobs do not run
+# OpenSCAD, they put the scad on the farm's queue and wait.  Workers,
+# python BandSaw.py --worker http://host:PORT on as many machines as
+# you have, take the jobs, mesh them and send the stl back:
+#   POST /take            {"worker": name} -> a job, or 204 if there is none
+#   GET  /import/<id>/<f> a file the scad of job <id> imports
+#   POST /heartbeat       {"worker": name, "id": id} while OpenSCAD runs
+#                         -> {"cancel": true} when the job is not needed any more
+#   POST /result/<id>     the stl, with X-Worker and X-Returncode headers
+#   GET  /status          the workers and the jobs
+#
+# The stl files are kept in cache_directory under the sha1 of what
+# they are made from (the scad, the files it imports and the stl
+# format), so a job that was made before, for any variant, is copied
+# from there and never goes to a worker.
+#
+# A worker that has not been heard from for heartbeat_timeout
+# seconds is taken for dead and its jobs go back to the front of the
+# queue.  When the queue is empty an idle worker takes a copy of the
+# job that has been running the longest (for more than steal_after
+# seconds), so one slow machine does not hold up the end of the run.
+# The first stl back is used and the other worker is told to stop.
+# A worker that fails only fails the job if no other worker has it.
+##################################################################
+class RenderFarm:
+    def __init__(self, cache_directory, stl_format, host="127.0.0.1", port=8766, heartbeat_timeout=30, steal_after=10):
+        self.cache_directory = cache_directory
+        self.stl_format = stl_format
+        self.address = (host, port)
+        self.heartbeat_timeout = heartbeat_timeout
+        self.steal_after = steal_after
+        self.queue = collections.deque()  # the jobs no worker has
+        self.jobs = dict()  # every job of the run by id, see queue_job()
+        self.workers = dict()  # when each worker was last heard from
+        self.lock = threading.Lock()
+        self.server = None
+        self.stopped = threading.Event()
+        os.makedirs(cache_directory, exist_ok=True)
+
+    def start(self):
+        self.server = http.server.ThreadingHTTPServer(self.address, RenderFarmHandler)
+        self.server.daemon_threads = True
+        self.server.render_farm = self
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        threading.Thread(target=self.watch_workers, daemon=True).start()
+        print("Render farm waiting for workers on http://{}:{}".format(*self.address))
+
+    def stop(self):
+        self.stopped.set()
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+    # the command of a farm StlJob (see StlJobRunner.run_python_job), it waits until a worker made the stl
+    def make(self, job):
+        key = self.content_key(job)
+        cached = os.path.join(self.cache_directory, key + ".stl")
+        if os.path.isfile(cached):
+            job.made_by = "cached"
+        else:
+            farm_job = self.queue_job(key, job)
+            farm_job["done"].wait()
+            if farm_job["returncode"] != 0:
+                print("FAILED: {} on {}".format(job.name, farm_job["worker"]))
+                return farm_job["returncode"]
+            job.made_by = "meshed by {}".format(farm_job["worker"])
+        shutil.copyfile(cached, job.output_file)
+        return 0
+
+    # the sha1 of everything the stl is made from
+    def content_key(self, job):
+        sha1 = hashlib.sha1(self.stl_format.encode())
+        for path in [job.scad_file] + sorted(job.imports):
+            sha1.update(os.path.basename(path).encode())
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    sha1.update(chunk)
+        return sha1.hexdigest()
+
+    def queue_job(self, key, job):
+        with self.lock:
+            farm_job = self.jobs.get(key)
+            if farm_job is not None and (not farm_job["done"].is_set() or farm_job["returncode"] == 0):
+                return farm_job  # the same stl for another output
+            with open(job.scad_file) as f:
+                scad = f.read()
+            farm_job = dict(id=key, name=job.name, scad=scad, stl_format=self.stl_format,
+                            imports=dict((os.path.basename(path), path) for path in job.imports),
+                            workers=dict(), worker=None, returncode=None, done=threading.Event(), lost=0)
+            self.jobs[key] = farm_job
+            self.queue.append(farm_job)
+            return farm_job
+
+    # a worker asks for a job.  None if there is nothing for it to do
+    def take(self, worker):
+        now = time.time()
+        with self.lock:
+            if worker not in self.workers:
+                print("Worker {} joined the farm".format(worker))
+            self.workers[worker] = now
+            if self.queue:
+                farm_job = self.queue.popleft()
+            else:
+                running = [farm_job for farm_job in self.jobs.values()
+                           if not farm_job["done"].is_set() and len(farm_job["workers"]) == 1
+                           and worker not in farm_job["workers"]
+                           and now - min(farm_job["workers"].values()) > self.steal_after]
+                if not running:
+                    return None
+                farm_job = min(running, key=lambda farm_job: min(farm_job["workers"].values()))
+                holder, started = next(iter(farm_job["workers"].items()))
+                print("{} is helping {} with {}, it has had it for {:.0f}s".format(
+                    worker, holder, farm_job["name"], now - started))
+            farm_job["workers"][worker] = now
+        return dict(id=farm_job["id"], name=farm_job["name"], scad=farm_job["scad"],
+                    stl_format=farm_job["stl_format"], imports=sorted(farm_job["imports"]))
+
+    # True if the worker should keep going
+    def heartbeat(self, worker, job_id):
+        with self.lock:
+            self.workers[worker] = time.time()
+            farm_job = self.jobs.get(job_id)
+            return farm_job is not None and not farm_job["done"].is_set()
+
+    def import_file(self, job_id, file_name):
+        with self.lock:
+            farm_job = self.jobs.get(job_id)
+            path = farm_job and farm_job["imports"].get(file_name)
+        return path
+
+    def result(self, worker, job_id, returncode, data):
+        with self.lock:
+            self.workers[worker] = time.time()
+            farm_job = self.jobs.get(job_id)
+            if farm_job is None or farm_job["done"].is_set():
+                return  # another worker was quicker
+            if returncode != 0 and len(farm_job["workers"]) > 1:
+                # the job is only failed when no other worker still has it
+                farm_job["workers"].pop(worker, None)
+                print("{} failed to make {}, waiting for {}".format(
+                    worker, farm_job["name"], ", ".join(sorted(farm_job["workers"]))))
+                return
+            if returncode == 0:
+                with atomic_file(os.path.join(self.cache_directory, job_id + ".stl"), "wb") as f:
+                    f.write(data)
+            farm_job.update(returncode=returncode, worker=worker)
+            farm_job["done"].set()
+
+    # put the jobs of the workers that stopped answering back on the queue
+    def watch_workers(self):
+        while not self.stopped.wait(self.heartbeat_timeout / 4.0):
+            now = time.time()
+            with self.lock:
+                dead = set(worker for worker, seen in self.workers.items() if now - seen > self.heartbeat_timeout)
+                for worker in dead:
+                    print("Worker {} stopped answering".format(worker))
+                    del self.workers[worker]
+                for farm_job in self.jobs.values():
+                    if farm_job["done"].is_set() or not dead.intersection(farm_job["workers"]):
+                        continue
+                    for worker in dead.intersection(farm_job["workers"]):
+                        del farm_job["workers"][worker]
+                    if not farm_job["workers"]:
+                        farm_job["lost"] += 1
+                        print("Giving {} to another worker".format(farm_job["name"]))
+                        self.queue.appendleft(farm_job)
+
+    def status(self):
+        with self.lock:
+            now = time.time()
+            return dict(workers=dict((worker, round(now - seen, 1)) for worker, seen in self.workers.items()),
+                        queued=[farm_job["name"] for farm_job in self.queue],
+                        running=dict((farm_job["name"], sorted(farm_job["workers"])) for farm_job in self.jobs.values()
+                                     if farm_job["workers"] and not farm_job["done"].is_set()),
+                        done=sum(1 for farm_job in self.jobs.values() if farm_job["done"].is_set()))
+
+
+class RenderFarmHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        farm = self.server.render_farm
+        if self.path == "/status":
+            self.reply(200, json.dumps(farm.status(), indent=1, sort_keys=True).encode())
+            return
+        parts = self.path.split("/")
+        path = farm.import_file(parts[2], parts[3]) if len(parts) == 4 and parts[1] == "import" else None
+        if path is None or not os.path.isfile(path):
+            self.reply(404, b"")
+            return
+        with open(path, "rb") as f:
+            self.reply(200, f.read(), "application/octet-stream")
+
+    def do_POST(self):
+        farm = self.server.render_farm
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path == "/take":
+            job = farm.take(json.loads(body)["worker"])
+            if job is None:
+                self.reply(204, b"")
+            else:
+                self.reply(200, json.dumps(job).encode())
+        elif self.path == "/heartbeat":
+            request = json.loads(body)
+            self.reply(200, json.dumps(dict(cancel=not farm.heartbeat(request["worker"], request["id"]))).encode())
+        elif self.path.startswith("/result/"):
+            farm.result(self.headers["X-Worker"], self.path[len("/result/"):], int(self.headers["X-Returncode"]), body)
+            self.reply(200, b"{}")
+        else:
+            self.reply(404, b"")
+
+    def reply(self, status, data, content_type="application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass  # the workers poll all the time
+
+
+# python BandSaw.py --worker http://host:port [--worker-jobs N] runs N OpenSCADs at a time for a RenderFarm
+class RenderWorker:
+    def __init__(self, url, openscad_executable, jobs=1, heartbeat_seconds=5, poll_seconds=1):
+        self.url = url.rstrip("/")
+        self.openscad_executable = openscad_executable
+        self.jobs = jobs
+        self.heartbeat_seconds = heartbeat_seconds
+        self.poll_seconds = poll_seconds
+
+    def run(self):
+        for slot in range(self.jobs):
+            name = "{}:{}:{}".format(socket.gethostname(), os.getpid(), slot + 1)
+            threading.Thread(target=self.work, args=(name,), daemon=True).start()
+        print("Working for {} with {} jobs at a time".format(self.url, self.jobs))
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+    def work(self, name):
+        waiting = False
+        while True:
+            try:
+                job = self.post("/take", dict(worker=name))
+                if job is None:
+                    time.sleep(self.poll_seconds)
+                    continue
+                waiting = False
+                self.make(name, job)
+            except OSError as e:
+                if not waiting:
+                    print("{} can not reach {}, waiting for it: {}".format(name, self.url, e))
+                waiting = True
+                time.sleep(self.poll_seconds)
+
+    def make(self, name, job):
+        print("{} is making {}".format(name, job["name"]))
+        with tempfile.TemporaryDirectory() as directory:
+            scad_file = os.path.join(directory, job["name"] + ".scad")
+            stl_file = os.path.join(directory, job["name"] + ".stl")
+            with open(scad_file, "w") as f:
+                f.write(job["scad"])
+            for file_name in job["imports"]:
+                with urllib.request.urlopen("{}/import/{}/{}".format(self.url, job["id"], file_name)) as response:
+                    with open(os.path.join(directory, file_name), "wb") as f:
+                        shutil.copyfileobj(response, f)
+            start = time.perf_counter()
+            if self.openscad_executable == "stand-in":
+                self.stand_in_mesh(stl_file)
+                returncode = 0
+            else:
+                returncode = self.run_openscad(name, job, scad_file, stl_file)
+                if returncode is None:
+                    return
+            data = b""
+            if returncode == 0:
+                if job["stl_format"] == "binary" and not MeshFiles.is_binary_stl(stl_file):
+                    MeshFiles.make_binary(stl_file)
+                with open(stl_file, "rb") as f:
+                    data = f.read()
+            self.send_result(name, job, returncode, data)
+            print("{} made {} in {:.1f}s".format(name, job["name"], time.perf_counter() - start))
+
+    # the return code of OpenSCAD, None when the job was made by another worker first
+    def run_openscad(self, name, job, scad_file, stl_file):
+        try:
+            process = subprocess.Popen([self.openscad_executable, "-o", stl_file, scad_file])
+        except OSError as e:
+            print("{} could not run {}: {}".format(name, self.openscad_executable, e))
+            return -1
+        while True:
+            try:
+                return process.wait(self.heartbeat_seconds)
+            except subprocess.TimeoutExpired:
+                if self.post("/heartbeat", dict(worker=name, id=job["id"]))["cancel"]:
+                    print("{} stopped {}, another worker made it".format(name, job["name"]))
+                    process.kill()
+                    process.wait()
+                    return None
+
+    # what --worker-openscad stand-in sends back instead of running OpenSCAD: a closed 10 mm cube for every job,
+    # to try the farm with a few workers on one machine
+    @staticmethod
+    def stand_in_mesh(stl_file, size=10.0):
+        MeshFiles.write_stl(stl_file, MeshFiles.box((size, size, size)))
+
+    def send_result(self, name, job, returncode, data):
+        request = urllib.request.Request(self.url + "/result/" + job["id"], data=data, method="POST", headers={
+            "X-Worker": name, "X-Returncode": str(returncode)})
+        urllib.request.urlopen(request).close()
+
+    # the json answer, None if there is none
+    def post(self, path, values):
+        request = urllib.request.Request(self.url + path, data=json.dumps(values).encode(), method="POST",
+                                         headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request) as response:
+            data = response.read()
+        return json.loads(data) if data else None
+
+
+##################################################################
+# Reads and writes the mesh files.
+#
+# OpenSCAD writes ascii stl files, about five times the size of the
+# same mesh in binary.  ascii_to_binary converts them a chunk at a
+# time: each chunk is cut after its last complete facet, the numbers
+# of the chunk are parsed at once with numpy and written out as
+# binary records, and the triangle count is written into the header
+# at the end.  So converting a huge stl uses the same memory as a
+# small one.
+#
+# stats() memory maps a binary stl and works on the records where
+# they are in the file, a chunk at a time, so checking a big mesh
+# does not read it all into memory first.  A mesh that is closed
+# has every edge in exactly two triangles, once in each direction.
+#
+# write_3mf puts several meshes in one 3mf file, laid out next to
+# each other on a plate, so a plate of parts is one file to open in
+# the slicer.  The model is written into the zip file as it is made,
+# one mesh at a time.
+##################################################################
+class MeshFiles:
+    stl_record = np.dtype([("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attribute", "<u2")])
+    stl_header = b"binary stl written by BandSaw.py".ljust(80, b" ")
+
+    three_mf_content_types = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>'
+        '</Types>\n')
+    three_mf_relationships = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Target="/3D/3dmodel.model" Id="rel0" '
+        'Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>'
+        '</Relationships>\n')
+
+    @classmethod
+    def is_binary_stl(cls, path):
+        with open(path, "rb") as f:
+            header = f.read(84)
+        return len(header) == 84 and os.path.getsize(path) == 84 + 50 * int.from_bytes(header[80:84], "little")
+
+    @classmethod
+    def read_stl(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) >= 84 and len(data) == 84 + 50 * int.from_bytes(data[80:84], "little"):
+            records = np.frombuffer(data, dtype=cls.stl_record, offset=84)
+            return records["vertices"].astype(float)
+        return cls.ascii_records(data)["vertices"].astype(float)
+
+    @classmethod
+    def write_stl(cls, path, triangles):
+        records = np.zeros(len(triangles), dtype=cls.stl_record)
+        normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+        lengths = np.linalg.norm(normals, axis=1)
+        records["normal"] = normals / np.where(lengths > 0, lengths, 1)[:, None]
+        records["vertices"] = triangles
+        with atomic_file(path, "wb") as f:
+            f.write(cls.stl_header)
+            f.write(np.uint32(len(triangles)).tobytes())
+            records.tofile(f)
+
+    # the facets in a piece of an ascii stl as binary records
+    @classmethod
+    def ascii_records(cls, text):
+        words = np.array(text.split())
+        normals = np.flatnonzero(words == b"normal")
+        vertices = np.flatnonzero(words == b"vertex")
+        if len(vertices) != 3 * len(normals):
+            raise ValueError("broken ascii stl: {} normals and {} vertices".format(len(normals), len(vertices)))
+        records = np.zeros(len(normals), dtype=cls.stl_record)
+        if len(normals):
+            records["normal"] = words[normals[:, None] + np.arange(1, 4)].astype(np.float32)
+            records["vertices"] = words[vertices[:, None] + np.arange(1, 4)].astype(np.float32).reshape(-1, 3, 3)
+        return records
+
+    # Returns the number of triangles.  target can be source.
+    @classmethod
+    def ascii_to_binary(cls, source, target, chunk_size=1 << 22):
+        count = 0
+        rest = b""
+        with open(source, "rb") as f, atomic_file(target, "wb") as out:
+            out.write(cls.stl_header)
+            out.write(bytes(4))  # the triangle count, we only know it at the end
+            while True:
+                data = f.read(chunk_size)
+                text = rest + data
+                end = text.rfind(b"endfacet") if data else len(text)
+                if end < 0:
+                    rest = text
+                    continue
+                records = cls.ascii_records(text[:end])
+                records.tofile(out)
+                count += len(records)
+                rest = text[end:]
+                if not data:
+                    break
+            out.seek(80)
+            out.write(np.uint32(count).tobytes())
+        return count
+
+    # the records of a binary stl, straight from the file.  None for an ascii stl.
+    @classmethod
+    def map_stl(cls, path):
+        if not cls.is_binary_stl(path):
+            return None
+        with open(path, "rb") as f:
+            count = int.from_bytes(f.read(84)[80:84], "little")
+        if count == 0:
+            return np.zeros(0, dtype=cls.stl_record)
+        return np.memmap(path, dtype=cls.stl_record, mode="r", offset=84, shape=(count,))
+
+    @classmethod
+    def stats(cls, path, chunk_size=1 << 20):
+        records = cls.map_stl(path)
+        if records is None:
+            records = cls.ascii_records(open(path, "rb").read())
+        vertices = records["vertices"]
+        stats = dict(triangles=len(records), volume=0.0, area=0.0, degenerate=0, bounding_box=None,
+                     boundary_edges=0, non_manifold_edges=0, flipped_edges=0)
+        if len(records) == 0:
+            return stats
+        low = np.full(3, np.inf)
+        high = np.full(3, -np.inf)
+        for start in range(0, len(records), chunk_size):
+            triangles = vertices[start:start + chunk_size].astype(float)
+            low = np.minimum(low, triangles.min(axis=(0, 1)))
+            high = np.maximum(high, triangles.max(axis=(0, 1)))
+            a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+            stats["volume"] += np.einsum("ij,ij->", a, np.cross(b, c)) / 6.0
+            doubled_area = np.linalg.norm(np.cross(b - a, c - a), axis=1)
+            stats["area"] += doubled_area.sum() / 2.0
+            stats["degenerate"] += int(np.count_nonzero(doubled_area < 1e-12))
+        stats["bounding_box"] = (low.tolist(), high.tolist())
+        stats["volume"] = float(stats["volume"])
+        stats["area"] = float(stats["area"])
+        stats.update(cls.edge_stats(vertices, chunk_size))
+        return stats
+
+    # the edges that are not in exactly two triangles, and the edges that two triangles both use in
+    # the same direction (one of them is inside out).  The edges are split by a hash of their ends into
+    # one group per chunk of triangles, each group is counted in a pass over the file of its own, so
+    # only a chunk worth of edges is in memory at a time.
+    @classmethod
+    def edge_stats(cls, vertices, chunk_size=1 << 20):
+        groups = max(1, -(-len(vertices) // chunk_size))
+        stats = dict(boundary_edges=0, non_manifold_edges=0, flipped_edges=0)
+        if len(vertices) == 0:
+            return stats
+        for group in range(groups):
+            starts, ends = [], []
+            for first in range(0, len(vertices), chunk_size):
+                triangles = np.ascontiguousarray(vertices[first:first + chunk_size])
+                start = triangles.reshape(-1, 3)
+                end = np.roll(triangles, -1, axis=1).reshape(-1, 3)
+                if groups > 1:
+                    # an edge and the same edge the other way round are in the same group
+                    keep = (cls.point_hash(start) ^ cls.point_hash(end)) % np.uint64(groups) == group
+                    start, end = start[keep], end[keep]
+                starts.append(start)
+                ends.append(end)
+            points = np.concatenate(starts + ends)
+            if len(points) == 0:
+                continue  # no edge hashed to this group
+            _, ids = np.unique(points.view(np.dtype((np.void, points.dtype.itemsize * 3))), return_inverse=True)
+            ids = ids.reshape(-1).astype(np.int64)
+            start, end = ids[:len(ids) // 2], ids[len(ids) // 2:]
+            start, end = start[start != end], end[start != end]  # the edges of degenerate triangles
+            count = ids.max() + 1
+            used = np.unique(np.minimum(start, end) * count + np.maximum(start, end), return_counts=True)[1]
+            directed = np.unique(start * count + end, return_counts=True)[1]
+            stats["boundary_edges"] += int(np.count_nonzero(used == 1))
+            stats["non_manifold_edges"] += int(np.count_nonzero(used > 2))
+            stats["flipped_edges"] += int(np.count_nonzero(directed > 1))
+        return stats
+
+    # a hash of the bytes of each point, the same point always gets the same one
+    @staticmethod
+    def point_hash(points):
+        words = points.view(np.uint32 if points.dtype.itemsize == 4 else np.uint64).astype(np.uint64)
+        hashed = np.full(len(points), 14695981039346656037, dtype=np.uint64)
+        for column in words.T:
+            hashed = (hashed ^ column) * np.uint64(1099511628211)
+        return hashed
+
+    # the triangles of a box from the origin to size
+    @staticmethod
+    def box(size):
+        corners = np.array([(x, y, z) for x in (0, size[0]) for y in (0, size[1]) for z in (0, size[2])], dtype=float)
+        # two triangles for each side, counter clockwise seen from outside
+        sides = [(0, 1, 3), (0, 3, 2), (4, 6, 7), (4, 7, 5), (0, 4, 5), (0, 5, 1),
+                 (2, 3, 7), (2, 7, 6), (0, 2, 6), (0, 6, 4), (1, 5, 7), (1, 7, 3)]
+        return corners[np.array(sides)]
+
+    # triangles moved by a 4x4 matrix.  A mirror turns the triangles inside out, so they are turned back.
+    @classmethod
+    def transform(cls, triangles, matrix):
+        moved = triangles @ matrix[:3, :3].T + matrix[:3, 3]
+        if np.linalg.det(matrix[:3, :3]) < 0:
+            moved = moved[:, ::-1]
+        return moved + 0.0  # no -0.0, it is not the same vertex as 0.0 in the file
+
+    # half and its mirror image as one mesh, or None if half is on both sides of the mirror.  The faces
+    # of half on the mirror plane are inside the whole part, they go and the halves meet at their edges.
+    @classmethod
+    def mirror_stitch(cls, half, reflection, tolerance=1e-4):
+        values, vectors = np.linalg.eigh(reflection[:3, :3])
+        normal = vectors[:, np.argmin(values)]
+        point = reflection[:3, 3] / 2
+        distance = (half - point) @ normal
+        if distance.min() < -tolerance and distance.max() > tolerance:
+            return None
+        on_plane = np.abs(distance) <= tolerance
+        half = half - np.where(on_plane, distance, 0)[:, :, None] * normal  # exactly on the plane
+        keep = ~np.all(on_plane, axis=1)
+        half, on_plane = half[keep], on_plane[keep]
+        mirrored = half @ reflection[:3, :3].T + reflection[:3, 3]
+        mirrored[on_plane] = half[on_plane]  # the same vertices, not ones that are off by a rounding error
+        return np.concatenate((half, mirrored[:, ::-1])) + 0.0
+
+    # a copy of triangles moved by each of matrices, or None if two of the copies could touch
+    @classmethod
+    def place_copies(cls, triangles, matrices, gap=1e-4):
+        copies = [cls.transform(triangles, matrix) for matrix in matrices]
+        boxes = [(copy.reshape(-1, 3).min(axis=0), copy.reshape(-1, 3).max(axis=0)) for copy in copies]
+        for i in range(len(boxes)):
+            for j in range(i):
+                if np.all(boxes[i][0] - gap < boxes[j][1]) and np.all(boxes[j][0] - gap < boxes[i][1]):
+                    return None
+        return np.concatenate(copies)
+
+    # replaces an ascii stl with the binary one, the ascii file stays if the conversion fails
+    @classmethod
+    def make_binary(cls, path):
+        return cls.ascii_to_binary(path, path)
+
+    # objects is a list of (name, triangles).  The objects are put in rows on a plate of plate_size,
+    # gap apart, starting in a new row when the next one does not fit.  Returns the objects that
+    # did not fit on the plate.
+    @classmethod
+    def write_3mf(cls, path, objects, plate_size=(250, 250), gap=5):
+        items = []
+        left_over = []
+        x = y = row_depth = 0
+        with atomic_file(path, "wb") as f, zipfile.ZipFile(f, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("[Content_Types].xml", cls.three_mf_content_types)
+            archive.writestr("_rels/.rels", cls.three_mf_relationships)
+            with archive.open("3D/3dmodel.model", "w", force_zip64=True) as raw:
+                model = io.TextIOWrapper(raw, encoding="utf-8")
+                model.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                            '<model unit="millimeter" xml:lang="en-US" '
+                            'xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">\n'
+                            ' <resources>\n')
+                for name, triangles in objects:
+                    low = triangles.reshape(-1, 3).min(axis=0)
+                    size = triangles.reshape(-1, 3).max(axis=0) - low
+                    if x > 0 and x + size[0] > plate_size[0]:
+                        x, y, row_depth = 0, y + row_depth + gap, 0
+                    if x + size[0] > plate_size[0] or y + size[1] > plate_size[1]:
+                        left_over.append(name)
+                        continue
+                    object_id = len(items) + 1
+                    cls.write_3mf_object(model, object_id, name, triangles)
+                    items.append((object_id, (x - low[0] + 0.0, y - low[1] + 0.0, 0.0 - low[2])))
+                    x += size[0] + gap
+                    row_depth = max(row_depth, size[1])
+                model.write(' </resources>\n <build>\n')
+                for object_id, offset in items:
+                    model.write('  <item objectid="{}" transform="1 0 0 0 1 0 0 0 1 {:.5f} {:.5f} {:.5f}"/>\n'.format(
+                        object_id, *offset))
+                model.write(' </build>\n</model>\n')
+                model.flush()
+                model.detach()
+        return left_over
+
+    @classmethod
+    def write_3mf_object(cls, model, object_id, name, triangles):
+        # 3mf meshes share their vertices, and a triangle can not use the same vertex twice
+        vertices, indices = np.unique(triangles.reshape(-1, 3).astype(np.float32), axis=0, return_inverse=True)
+        indices = indices.reshape(-1, 3)
+        indices = indices[(indices[:, 0] != indices[:, 1]) & (indices[:, 1] != indices[:, 2]) &
+                          (indices[:, 2] != indices[:, 0])]
+        model.write('  <object id="{}" name={} type="model">\n   <mesh>\n    <vertices>\n'.format(
+            object_id, xml.sax.saxutils.quoteattr(name)))
+        np.savetxt(model, vertices, fmt='     <vertex x="%.5f" y="%.5f" z="%.5f"/>')
+        model.write('    </vertices>\n    <triangles>\n')
+        np.savetxt(model, indices, fmt='     <triangle v1="%d" v2="%d" v3="%d"/>')
+        model.write('    </triangles>\n   </mesh>\n  </object>\n')
+
+
+##################################################################
+# Finds outputs that are made of copies of one shape, so the shape
+# is only meshed once (see BandSaw.render_symmetric).
+#
+# transform_of() takes the translate, rotate, scale, mirror and
+# multmatrix nodes off the top of a tree and returns the matrix they
+# make and the tree under them.  Trees with the same structural hash
+# under their transforms are the same shape moved.  That gives:
+#   - an output that is another output moved, turned or mirrored
+#     (fence_bar_attachment_back is the front one mirrored), made by
+#     moving the mesh of the other output;
+#   - an output that is a union of pairs that are all mirrored the
+#     same way (the slivers of wheel_crowned), made by meshing one of
+#     each pair and stitching that half to its mirror image;
+#   - an output that is a union of copies of one shape, made by
+#     meshing the shape once, if the copies do not touch.
+##################################################################
+class Symmetry:
+    transforms = frozenset(("translate", "rotate", "scale", "mirror", "multmatrix", "color"))
+
+    @classmethod
+    def matrix(cls, node):
+        params = dict(node.params)
+        matrix = np.eye(4)
+        if node.name == "translate" and "v" in params:
+            matrix[:3, 3] = params["v"]
+        elif node.name == "scale" and "v" in params:
+            matrix[:3, :3] = np.diag(np.broadcast_to(np.asarray(params["v"], dtype=float), (3,)))
+        elif node.name == "mirror":
+            normal = np.asarray(params["v"], dtype=float)
+            matrix[:3, :3] -= 2 * np.outer(normal, normal) / np.dot(normal, normal)
+        elif node.name == "multmatrix":
+            given = np.asarray(params["m"], dtype=float)
+            matrix[:given.shape[0], :given.shape[1]] = given
+        elif node.name == "rotate":
+            matrix[:3, :3] = cls.rotation(params.get("a", 0), params.get("v"))
+        return matrix
+
+    # the rotation of OpenSCAD's rotate(a, v)
+    @staticmethod
+    def rotation(a, v=None):
+        def about(axis, degrees):
+            c, s = math.cos(math.radians(degrees)), math.sin(math.radians(degrees))
+            x, y, z = np.asarray(axis, dtype=float) / np.linalg.norm(axis)
+            return np.array([[c + x * x * (1 - c), x * y * (1 - c) - z * s, x * z * (1 - c) + y * s],
+                             [y * x * (1 - c) + z * s, c + y * y * (1 - c), y * z * (1 - c) - x * s],
+                             [z * x * (1 - c) - y * s, z * y * (1 - c) + x * s, c + z * z * (1 - c)]])
+
+        if isinstance(a, tuple):
+            a = tuple(a) + (0,) * (3 - len(a))
+            return about((0, 0, 1), a[2]) @ about((0, 1, 0), a[1]) @ about((1, 0, 0), a[0])
+        return about(v if v is not None else (0, 0, 1), a)
+
+    @classmethod
+    def transform_of(cls, node):
+        matrix = np.eye(4)
+        while len(node.children) == 1 and (node.name in cls.transforms or (node.name == "union" and not node.params)):
+            matrix = matrix @ cls.matrix(node)
+            node = node.children[0]
+        return matrix, node
+
+    # the children of a union, with the unions in it opened up
+    @classmethod
+    def operands(cls, node):
+        found = []
+        stack = [node]
+        while stack:
+            child = stack.pop()
+            if child.name == "union" and not child.params:
+                stack.extend(reversed(child.children))
+            else:
+                found.append(child)
+        return found
+
+    @staticmethod
+    def is_reflection(matrix, tolerance=1e-6):
+        linear = matrix[:3, :3]
+        return abs(np.linalg.det(linear) + 1) < tolerance and np.allclose(linear @ linear.T, np.eye(3), atol=tolerance) \
+            and np.allclose(matrix @ matrix, np.eye(4), atol=tolerance)
+
+    # (half, reflection) if node is a union of pairs that are all mirrored by the same reflection
+    @classmethod
+    def mirror_half(cls, node):
+        if node.name != "union" or node.params:
+            return None
+        operands = cls.operands(node)
+        if len(operands) < 2 or len(operands) % 2:
+            return None
+        moved = [cls.transform_of(operand) for operand in operands]
+        hashes = [shape.structural_hash() for _, shape in moved]
+        unmatched = list(range(len(operands)))
+        reflection = None
+        half = []
+        while unmatched:
+            i = unmatched.pop(0)
+            for j in unmatched:
+                if hashes[j] != hashes[i] or abs(np.linalg.det(moved[i][0])) < 1e-9:
+                    continue
+                relative = moved[j][0] @ np.linalg.inv(moved[i][0])
+                if reflection is None and cls.is_reflection(relative):
+                    reflection = relative
+                if reflection is not None and np.allclose(relative, reflection, atol=1e-6):
+                    break
+            else:
+                return None
+            unmatched.remove(j)
+            half.append(operands[i])
+        return union()(*half), reflection
+
+    # (shape, matrices) if node is a union of copies of one shape
+    @classmethod
+    def copies(cls, node):
+        if node.name != "union" or node.params:
+            return None
+        moved = [cls.transform_of(operand) for operand in cls.operands(node)]
+        if len(moved) < 2 or len(set(shape.structural_hash() for _, shape in moved)) != 1:
+            return None
+        return moved[0][1], [matrix for matrix, _ in moved]
+
+
+##################################################################
+# Draws a mesh into a png, for the previews of machines that do not
+# have OpenSCAD (see BandSaw.write_previews).
+#
+# The camera works like the one of OpenSCAD: the mesh is turned by
+# rotate = (x, y, z) degrees (rotate(x) rotate(y) rotate(z) mesh),
+# then seen from the front, from -y with z up, and zoomed to fit.
+#
+# The triangles are drawn with a z buffer, all of them at once: the
+# triangles are put in groups by the size of the box of pixels they
+# cover, every pixel of the box of every triangle of a group is tried
+# in one go, and the nearest triangle of each pixel wins.  Each
+# triangle is one shade, brighter the more it faces the camera.
+##################################################################
+class MeshPreview:
+    color = np.array((249, 215, 44), dtype=float)  # the yellow of the OpenSCAD preview
+    background = (255, 255, 255)
+
+    @staticmethod
+    def camera(rotate):
+        def about(axis, degrees):
+            c, s = math.cos(math.radians(degrees)), math.sin(math.radians(degrees))
+            i, j = (axis + 1) % 3, (axis + 2) % 3
+            matrix = np.eye(3)
+            matrix[i, i], matrix[i, j], matrix[j, i], matrix[j, j] = c, -s, s, c
+            return matrix
+        return about(0, rotate[0]) @ about(1, rotate[1]) @ about(2, rotate[2])
+
+    @classmethod
+    def draw(cls, triangles, rotate, size=(400, 300), margin=0.05, max_pixels=1 << 22):
+        width, height = size
+        image = np.empty((height * width, 3), dtype=np.uint8)
+        image[:] = cls.background
+        if len(triangles) == 0:
+            return image.reshape(height, width, 3)
+        seen = triangles.reshape(-1, 3) @ cls.camera(rotate).T
+        # x across, z up, y away from the camera
+        screen = seen[:, [0, 2]]
+        low, high = screen.min(axis=0), screen.max(axis=0)
+        scale = (1 - 2 * margin) * min(width / max(high[0] - low[0], 1e-9), height / max(high[1] - low[1], 1e-9))
+        center = (low + high) / 2
+        points = np.empty((len(seen), 3))
+        points[:, 0] = (screen[:, 0] - center[0]) * scale + width / 2.0
+        points[:, 1] = height / 2.0 - (screen[:, 1] - center[1]) * scale
+        points[:, 2] = seen[:, 1]
+        points = points.reshape(-1, 3, 3)
+
+        corners = seen.reshape(-1, 3, 3)
+        normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+        lengths = np.linalg.norm(normals, axis=1)
+        # the depth of a triangle over the screen is a plane, depth = a x + b y + c
+        plane = np.cross(points[:, 1] - points[:, 0], points[:, 2] - points[:, 0])
+        keep = (lengths > 0) & (np.abs(plane[:, 2]) > 1e-12)
+        points, normals, lengths, plane = points[keep], normals[keep], lengths[keep], plane[keep]
+        shade = 0.3 + 0.7 * np.abs(normals[:, 1]) / lengths  # the camera looks along y
+        slope = -plane[:, :2] / plane[:, 2, None]
+        offset = points[:, 0, 2] - np.einsum("ij,ij->i", slope, points[:, 0, :2])
+
+        depth = np.full(height * width, np.inf)
+        owner = np.full(height * width, -1)
+        # so the pixels tried at once stay under max_pixels
+        area = np.prod(np.ptp(points[:, :, :2], axis=1) + 2, axis=1)
+        bounds = np.searchsorted(np.cumsum(area), np.arange(1, int(area.sum() // max_pixels) + 1) * max_pixels)
+        for start, end in zip(np.concatenate(([0], bounds)), np.concatenate((bounds, [len(points)]))):
+            if end > start:
+                cls.fill(points[start:end], slope[start:end], offset[start:end], start, width, height, depth, owner)
+        drawn = owner >= 0
+        image[drawn] = (cls.color * shade[owner[drawn], None]).astype(np.uint8)
+        return image.reshape(height, width, 3)
+
+    # the pixel rows each triangle crosses, the run of pixels of each row inside it, and the nearest triangle
+    # of each pixel wins
+    @staticmethod
+    def fill(points, slope, offset, first, width, height, depth, owner):
+        y = points[:, :, 1]
+        top = np.maximum(np.ceil(y.min(axis=1) - 0.5), 0).astype(int)
+        bottom = np.minimum(np.floor(y.max(axis=1) - 0.5), height - 1).astype(int)
+        rows = np.maximum(bottom - top + 1, 0)
+        triangle = np.repeat(np.arange(len(points)), rows)
+        row = np.repeat(top - np.cumsum(rows) + rows, rows) + np.arange(rows.sum())
+        center = row + 0.5
+
+        # where the row crosses the three edges
+        left = np.full(len(row), np.inf)
+        right = np.full(len(row), -np.inf)
+        for k in range(3):
+            p, q = points[triangle, k], points[triangle, (k + 1) % 3]
+            crosses = (np.minimum(p[:, 1], q[:, 1]) <= center) & (center <= np.maximum(p[:, 1], q[:, 1])) & \
+                      (p[:, 1] != q[:, 1])
+            x = p[:, 0] + (center - p[:, 1]) * (q[:, 0] - p[:, 0]) / np.where(crosses, q[:, 1] - p[:, 1], 1)
+            left = np.where(crosses, np.minimum(left, x), left)
+            right = np.where(crosses, np.maximum(right, x), right)
+        begin = np.maximum(np.ceil(left - 0.5), 0)
+        end = np.minimum(np.floor(right - 0.5), width - 1)
+        runs = np.where(np.isfinite(begin) & np.isfinite(end), np.maximum(end - begin + 1, 0), 0).astype(int)
+        begin = np.where(runs > 0, begin, 0).astype(int)
+
+        triangle = np.repeat(triangle, runs)
+        row = np.repeat(row, runs)
+        column = np.repeat(begin - np.cumsum(runs) + runs, runs) + np.arange(runs.sum())
+        z = slope[triangle, 0] * (column + 0.5) + slope[triangle, 1] * (row + 0.5) + offset[triangle]
+        flat = row * width + column
+        np.minimum.at(depth, flat, z)
+        nearest = z <= depth[flat]
+        owner[flat[nearest]] = triangle[nearest] + first
+
+    @staticmethod
+    def write_png(path, image):
+        def chunk(kind, data):
+            return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+        height, width = image.shape[:2]
+        rows = np.zeros((height, width * 3 + 1), dtype=np.uint8)  # every row starts with filter 0
+        rows[:, 1:] = image.reshape(height, width * 3)
+        with atomic_file(path, "wb") as f:
+            f.write(b"\x89PNG\r\n\x1a\n")
+            f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+            f.write(chunk(b"IDAT", zlib.compress(rows.tobytes(), 6)))
+            f.write(chunk(b"IEND", b""))
+
+
+##################################################################
+# Compares two meshes without meshing anything, for BandSaw.diff.
+#
+# Both meshes are turned into voxels on the same grid: for every
+# column of voxels the triangles above it are found (like the pixels
+# of MeshPreview, all the triangles at once, in groups by the number
+# of columns they cover), every triangle facing down adds one to the
+# voxels above where it crosses the column and every triangle facing
+# up takes one off, and a running sum up the column is the number of
+# times the mesh is entered.  Where one mesh has material and the
+# other does not is what was added or removed.
+##################################################################
+class MeshDiff:
+    added_color = (40, 170, 40)
+    removed_color = (220, 40, 40)
+    kept_color = (190, 190, 190)
+    background = (255, 255, 255)
+
+    # the grid around both meshes, voxels of voxel_size mm unless that makes more than max_voxels
+    @staticmethod
+    def grid(boxes, voxel_size=0.5, max_voxels=1 << 23):
+        low = np.min([box[0] for box in boxes], axis=0)
+        high = np.max([box[1] for box in boxes], axis=0)
+        extent = np.maximum(high - low, 1e-6)
+        voxel = max(voxel_size, (np.prod(extent) / max_voxels) ** (1.0 / 3))
+        shape = tuple(int(n) for n in np.ceil(extent / voxel) + 1)
+        # off the round numbers, so no column goes exactly through an edge
+        low = low - voxel / 2 - voxel * 1.2345e-3
+        return low, voxel, shape
+
+    @classmethod
+    def voxels(cls, triangles, low, voxel, shape, max_columns=1 << 22):
+        nx, ny, nz = shape
+        crossings = np.zeros(nx * ny * (nz + 1), dtype=np.int16)
+        points = (triangles - low) / voxel - 0.5  # in voxels, the centers are on whole numbers
+        # the projection on xy is turned the other way when the triangle faces down
+        area = (points[:, 1, 0] - points[:, 0, 0]) * (points[:, 2, 1] - points[:, 0, 1]) - \
+               (points[:, 2, 0] - points[:, 0, 0]) * (points[:, 1, 1] - points[:, 0, 1])
+        points = points[area != 0]
+        area = area[area != 0]
+        first = np.maximum(np.ceil(points[:, :, :2].min(axis=1)), 0).astype(int)
+        last = np.minimum(np.floor(points[:, :, :2].max(axis=1)), (nx - 1, ny - 1)).astype(int)
+        counts = np.prod(np.maximum(last - first + 1, 0), axis=1)
+        bounds = np.searchsorted(np.cumsum(counts), np.arange(1, int(counts.sum() // max_columns) + 1) * max_columns)
+        for start, end in zip(np.concatenate(([0], bounds)), np.concatenate((bounds, [len(points)]))):
+            if end > start:
+                cls.cross(points[start:end], area[start:end], first[start:end], last[start:end], counts[start:end],
+                          shape, crossings)
+        crossings = crossings.reshape(nx, ny, nz + 1)
+        return np.cumsum(crossings[:, :, :nz], axis=2, dtype=np.int16) != 0
+
+    # where each triangle crosses the columns under it
+    @staticmethod
+    def cross(points, area, first, last, counts, shape, crossings):
+        nx, ny, nz = shape
+        rows = last[:, 1] - first[:, 1] + 1
+        triangle = np.repeat(np.arange(len(points)), counts)
+        index = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        x = first[triangle, 0] + index // rows[triangle]
+        y = first[triangle, 1] + index % rows[triangle]
+        weights = []
+        for k in range(3):
+            p, q = points[triangle, (k + 1) % 3], points[triangle, (k + 2) % 3]
+            weights.append(((q[:, 0] - p[:, 0]) * (y - p[:, 1]) - (x - p[:, 0]) * (q[:, 1] - p[:, 1])) / area[triangle])
+        weights = np.array(weights)
+        inside = (weights >= 0).all(axis=0)
+        triangle, x, y, weights = triangle[inside], x[inside], y[inside], weights[:, inside]
+        z = np.einsum("ki,ik->i", weights, points[triangle, :, 2])
+        above = np.clip(np.ceil(z), 0, nz).astype(int)
+        step = np.where(area[triangle] < 0, 1, -1)
+        crossings += np.bincount((x * ny + y) * (nz + 1) + above, weights=step,
+                                 minlength=len(crossings)).astype(np.int16)
+
+    # the layer with the most change (added and removed material in color, the rest grey) next to a map of
+    # how much changed in each column (the color of what there is more of)
+    @classmethod
+    def heatmap(cls, old, new, scale=None):
+        added, removed = new & ~old, old & ~new
+        layer = int(np.argmax((added | removed).sum(axis=(0, 1))))
+        nx, ny = old.shape[:2]
+        image = np.empty((ny, 2 * nx + 1, 3))
+        image[:] = cls.background
+        left = image[:, :nx]
+        left[(old | new)[:, :, layer].T] = cls.kept_color
+        left[added[:, :, layer].T] = cls.added_color
+        left[removed[:, :, layer].T] = cls.removed_color
+        more = (added.sum(axis=2) - removed.sum(axis=2)).T
+        amount = np.abs(more) / max(np.abs(more).max(), 1)
+        color = np.where((more > 0)[:, :, None], cls.added_color, cls.removed_color)
+        image[:, nx + 1:] = (1 - amount[:, :, None]) * np.array(cls.background) + amount[:, :, None] * color
+        image[:, nx] = 0
+        image = image[::-1]  # y up
+        scale = scale or max(1, 400 // max(nx, ny))
+        return np.repeat(np.repeat(image.astype(np.uint8), scale, axis=0), scale, axis=1), layer
+
+
+##################################################################
+# Draft voxels of a part straight from its CsgNode tree, without
+# OpenSCAD (see BandSaw.draft).
+#
+# inside(node, points) tells which points are inside the node, for
+# all the points at once: the transforms move the points instead of
+# the shape, a union only asks each child about the points in the
+# box of that child that are not inside yet, a difference only asks
+# the children it takes away about the points that are still inside,
+# and so on, so a bolt hole only looks at the points around it.
+# Circles are round, whatever their segments.  A hull (and a
+# minkowski) is taken as the convex shape bounded by planes in
+# hull_directions around the points of its children (the corners of
+# the cubes, points around the circles of the cylinders), a bit
+# bigger than the real hull.  Text and imported files are left out.
+#
+# voxels() asks about the centers of the voxels of the box of the
+# part, max_points at a time.  surface() makes a closed mesh of the
+# faces between full and empty voxels, and slices() draws the
+# voxels of a few layers.
+##################################################################
+class CsgEvaluator:
+    shapes_2d = frozenset(("circle", "square", "polygon", "text"))
+    circle_points = 32
+
+    def __init__(self, max_points=1 << 16, hull_directions=64):
+        self.max_points = max_points
+        # the axes (so the box of a hull is exact) and directions spread over the sphere
+        i = np.arange(hull_directions) + 0.5
+        z = 1 - 2 * i / hull_directions
+        angle = math.pi * (1 + 5 ** 0.5) * i
+        spread = np.stack((np.sqrt(1 - z * z) * np.cos(angle), np.sqrt(1 - z * z) * np.sin(angle), z), axis=1)
+        self.directions = np.concatenate((np.eye(3), -np.eye(3), spread))
+        self._points = dict()  # id(node) -> the points of the node for hulls, see hull_points()
+        self._boxes = dict()
+        self._support = dict()  # id(node) -> how far the hull goes in each direction
+        self.left_out = collections.Counter()  # the nodes that could not be evaluated
+
+    # the matrix of a transform, the 2d ones have 2d vectors
+    @staticmethod
+    def matrix(node):
+        params = dict(node.params)
+        v = params.get("v")
+        if node.name in ("translate", "scale", "mirror") and isinstance(v, tuple) and len(v) == 2:
+            params["v"] = v + ((1,) if node.name == "scale" else (0,))
+            node = CsgNode(node.name, tuple(params.items()))
+        return Symmetry.matrix(node)
+
+    @staticmethod
+    def cylinder_radii(params):
+        def radius(r, d):
+            if r is not None:
+                return r
+            return d / 2.0 if d is not None else None
+        r = radius(params.get("r"), params.get("d"))
+        r1 = radius(params.get("r1"), params.get("d1"))
+        r2 = radius(params.get("r2"), params.get("d2"))
+        return (r1 if r1 is not None else r if r is not None else 1), (r2 if r2 is not None else r if r is not None else 1)
+
+    # the extent of a cube or square, (low, high)
+    @staticmethod
+    def cube_box(params, dimensions):
+        size = params.get("size", 1)
+        size = np.broadcast_to(np.asarray(size, dtype=float), (dimensions,))
+        low = -size / 2 if params.get("center") else np.zeros(dimensions)
+        return low, low + size
+
+    # a circle, a bit bigger than the round one so the points bound it
+    def circle(self, r, z=0.0):
+        angle = np.arange(self.circle_points) * (2 * math.pi / self.circle_points)
+        r = r / math.cos(math.pi / self.circle_points)
+        return np.stack((r * np.cos(angle), r * np.sin(angle), np.full(len(angle), float(z))), axis=1)
+
+    # points the node is inside the convex hull of (bigger for cylinders, spheres and differences).
+    # None when there is nothing there.
+    def hull_points(self, node):
+        key = id(node)
+        if key in self._points:
+            return self._points[key]
+        name = node.name
+        params = dict(node.params)
+        children = [points for points in (self.hull_points(child) for child in node.children) if points is not None]
+        points = None
+        if name == "cube":
+            low, high = self.cube_box(params, 3)
+            points = np.array([[(low, high)[k >> axis & 1][axis] for axis in range(3)] for k in range(8)])
+        elif name == "square":
+            low, high = self.cube_box(params, 2)
+            points = np.array([[low[0], low[1], 0], [high[0], low[1], 0], [high[0], high[1], 0], [low[0], high[1], 0]])
+        elif name == "cylinder":
+            r1, r2 = self.cylinder_radii(params)
+            h = params.get("h", 1)
+            z = -h / 2.0 if params.get("center") else 0.0
+            points = np.concatenate((self.circle(r1, z), self.circle(r2, z + h)))
+        elif name in ("sphere", "circle"):
+            r = self.cylinder_radii(params)[0]
+            if name == "circle":
+                points = self.circle(r)
+            else:
+                r = r / math.cos(math.pi / self.circle_points)
+                points = np.concatenate([self.circle(r * math.sqrt(1 - z * z), r * z)
+                                         for z in np.linspace(-1, 1, 9)] + [[[0, 0, -r], [0, 0, r]]])
+        elif name == "polygon":
+            points = np.array([(x, y, 0.0) for x, y in params["points"]])
+        elif name in Symmetry.transforms:
+            if children:
+                matrix = self.matrix(node)
+                points = np.concatenate(children) @ matrix[:3, :3].T + matrix[:3, 3]
+        elif name in ("union", "hull") or (name in ("difference", "intersection") and children):
+            children = children[:1] if name in ("difference", "intersection") else children
+            points = np.concatenate(children) if children else None
+        elif name == "minkowski" and children:
+            points = children[0]
+            for other in children[1:]:
+                if len(points) * len(other) > 1 << 16:
+                    points, other = self.box_corners(points), self.box_corners(other)
+                points = (points[:, None] + other[None]).reshape(-1, 3)
+        elif name == "linear_extrude" and children:
+            flat = np.concatenate(children)
+            h = params.get("height", 100)
+            z = -h / 2.0 if params.get("center") else 0.0
+            top = flat * np.append(np.broadcast_to(np.asarray(params.get("scale", 1), dtype=float), (2,)), 0)
+            if params.get("twist"):
+                top = np.concatenate([top @ Symmetry.rotation(a)[:3, :3].T for a in np.linspace(0, -params["twist"], 9)])
+            points = np.concatenate((flat + (0, 0, z), top + (0, 0, z + h)))
+        elif name == "rotate_extrude" and children:
+            flat = np.concatenate(children)
+            r = np.abs(flat[:, 0]).max()
+            points = np.concatenate([self.circle(r, y) for y in (flat[:, 1].min(), flat[:, 1].max())])
+        elif name not in ("difference", "intersection", "minkowski", "linear_extrude", "rotate_extrude"):
+            self.left_out[name] += 1
+        if points is not None and len(points) > 4096:
+            points = self.extremes(points)
+        self._points[key] = points
+        return points
+
+    @staticmethod
+    def box_corners(points):
+        low, high = points.min(axis=0), points.max(axis=0)
+        return np.array([[(low, high)[k >> axis & 1][axis] for axis in range(3)] for k in range(8)])
+
+    # the points that are furthest in one of the directions, the hull of them is the same
+    def extremes(self, points):
+        return points[np.unique(np.argmax(points @ self.directions.T, axis=0))]
+
+    # the box of the node, (low, high), None when there is nothing there
+    def box(self, node):
+        key = id(node)
+        if key not in self._boxes:
+            points = self.hull_points(node)
+            if points is None:
+                self._boxes[key] = None
+            elif node.name == "intersection":
+                boxes = [self.box(child) for child in node.children]
+                if any(box is None for box in boxes):
+                    self._boxes[key] = None
+                else:
+                    low, high = np.max([box[0] for box in boxes], axis=0), np.min([box[1] for box in boxes], axis=0)
+                    self._boxes[key] = (low, high) if (low <= high).all() else None
+            else:
+                self._boxes[key] = (points.min(axis=0), points.max(axis=0))
+        return self._boxes[key]
+
+    # the points in the box of the node, extent is the box of the points
+    def near(self, node, points, candidates, extent):
+        box = self.box(node)
+        if box is None or (box[0] > extent[1] + 1e-9).any() or (box[1] < extent[0] - 1e-9).any():
+            return np.zeros(0, dtype=int)
+        close = candidates.copy()
+        for axis in range(3):
+            if box[0][axis] > extent[0][axis] + 1e-9:
+                close &= points[axis] >= box[0][axis] - 1e-9
+            if box[1][axis] < extent[1][axis] - 1e-9:
+                close &= points[axis] <= box[1][axis] + 1e-9
+        return np.flatnonzero(close)
+
+    @staticmethod
+    def extent(points):
+        return (points.min(axis=1), points.max(axis=1)) if points.shape[1] else (np.zeros(3), np.zeros(3))
+
+    def union_of(self, children, points):
+        result = np.zeros(points.shape[1], dtype=bool)
+        extent = self.extent(points)
+        for child in children:
+            where = self.near(child, points, ~result, extent)
+            if len(where):
+                result[where] = self.inside(child, points.take(where, axis=1))
+        return result
+
+    # points is an array of the x, the y and the z of the points.  The 2d shapes are asked about x, y with z 0.
+    def inside(self, node, points):
+        name = node.name
+        params = dict(node.params)
+        count = points.shape[1]
+        x, y, z = points
+        if name in Symmetry.transforms:
+            if name != "color":
+                matrix = np.linalg.inv(self.matrix(node))
+                points = matrix[:3, :3] @ points + matrix[:3, 3, None]
+            return self.union_of(node.children, points)
+        if name == "union":
+            return self.union_of(node.children, points)
+        if name in ("difference", "intersection"):
+            result = self.union_of(node.children[:1], points)
+            extent = self.extent(points)
+            for child in node.children[1:]:
+                if name == "difference":
+                    where = self.near(child, points, result, extent)
+                    if len(where):
+                        result[where] &= ~self.inside(child, points.take(where, axis=1))
+                else:
+                    where = self.near(child, points, result, extent)
+                    result = np.zeros(count, dtype=bool)
+                    if len(where):
+                        result[where] = self.inside(child, points.take(where, axis=1))
+            return result
+        if name in ("hull", "minkowski"):
+            if id(node) not in self._support:
+                hull = self.hull_points(node)
+                self._support[id(node)] = None if hull is None else (hull @ self.directions.T).max(axis=0) + 1e-9
+            support = self._support[id(node)]
+            if support is None:
+                return np.zeros(count, dtype=bool)
+            return (self.directions[6:] @ points <= support[6:, None]).all(axis=0)  # near() did the axes
+        if name in ("cube", "square"):
+            low, high = self.cube_box(params, 3 if name == "cube" else 2)
+            result = np.ones(count, dtype=bool)
+            for axis in range(len(low)):
+                result &= (points[axis] >= low[axis]) & (points[axis] <= high[axis])
+            return result
+        if name == "cylinder":
+            r1, r2 = self.cylinder_radii(params)
+            h = params.get("h", 1)
+            t = (z + h / 2.0 if params.get("center") else z) / h
+            r = r1 + (r2 - r1) * t
+            return (t >= 0) & (t <= 1) & (x * x + y * y <= r * r)
+        if name in ("sphere", "circle"):
+            r = self.cylinder_radii(params)[0]
+            return x * x + y * y + (z * z if name == "sphere" else 0) <= r * r
+        if name == "polygon":
+            return self.inside_polygon(np.asarray(params["points"], dtype=float), params.get("paths"), x, y)
+        if name == "linear_extrude":
+            h = params.get("height", 100)
+            t = (z + h / 2.0 if params.get("center") else z) / h
+            where = np.flatnonzero((t >= 0) & (t <= 1))
+            flat = np.zeros((3, len(where)))
+            flat[:2] = points[:2].take(where, axis=1)
+            if params.get("twist"):
+                angle = np.radians(params["twist"] * t[where])
+                c, s = np.cos(angle), np.sin(angle)
+                flat[0], flat[1] = c * flat[0] - s * flat[1], s * flat[0] + c * flat[1]
+            if "scale" in params:
+                scale = np.broadcast_to(np.asarray(params["scale"], dtype=float), (2,))
+                flat[:2] /= 1 + (scale[:, None] - 1) * t[where]
+            result = np.zeros(count, dtype=bool)
+            result[where] = self.union_of(node.children, flat)
+            return result
+        if name == "rotate_extrude":
+            flat = np.stack((np.hypot(x, y), z, np.zeros(count)))
+            result = self.union_of(node.children, flat)
+            angle = params.get("angle", 360)
+            if angle < 360:
+                result &= np.mod(np.degrees(np.arctan2(y, x)), 360) <= angle
+            return result
+        return np.zeros(count, dtype=bool)
+
+    # even-odd over all the edges of the paths
+    @staticmethod
+    def inside_polygon(vertices, paths, x, y):
+        result = np.zeros(len(x), dtype=bool)
+        for path in paths or [range(len(vertices))]:
+            loop = vertices[list(path)]
+            for (x1, y1), (x2, y2) in zip(loop, np.roll(loop, -1, axis=0)):
+                if y1 == y2:
+                    continue
+                crosses = (y1 > y) != (y2 > y)
+                result ^= crosses & (x < x1 + (y - y1) * (x2 - x1) / (y2 - y1))
+        return result
+
+    # the voxels inside the node, the grid is the one MeshDiff.grid makes around its box
+    def voxels(self, node, voxel_size=1.0, max_voxels=1 << 24):
+        box = self.box(node)
+        if box is None:
+            return None
+        low, voxel, shape = MeshDiff.grid([box], voxel_size, max_voxels)
+        low = low + voxel / 2  # the voxels start at the box, not half a voxel out like MeshDiff has them
+        result = np.zeros(shape, dtype=bool)
+        axes = [low[axis] + (np.arange(shape[axis]) + 0.5) * voxel for axis in range(3)]
+        # in blocks, most of the small shapes are not in the box of a block and are skipped at once
+        side = max(1, int(round(self.max_points ** (1.0 / 3))))
+        for i in range(0, shape[0], side):
+            for j in range(0, shape[1], side):
+                for k in range(0, shape[2], side):
+                    grid = np.meshgrid(axes[0][i:i + side], axes[1][j:j + side], axes[2][k:k + side], indexing="ij")
+                    points = np.stack([axis.ravel() for axis in grid])
+                    result[i:i + side, j:j + side, k:k + side] = self.union_of((node,), points).reshape(grid[0].shape)
+        return result, low, voxel
+
+    # the faces between full and empty voxels, two triangles each, facing out
+    @staticmethod
+    def surface(occupied, low, voxel):
+        padded = np.pad(occupied, 1)
+        triangles = []
+        corners = np.array([(0, 0), (1, 0), (1, 1), (0, 1)])
+        for axis in range(3):
+            b, c = (axis + 1) % 3, (axis + 2) % 3
+            lower = np.take(padded, np.arange(padded.shape[axis] - 1), axis=axis)
+            upper = np.take(padded, np.arange(1, padded.shape[axis]), axis=axis)
+            for facing, faces in ((1, lower & ~upper), (-1, upper & ~lower)):
+                index = np.argwhere(faces)
+                if not len(index):
+                    continue
+                quads = np.empty((len(index), 4, 3))
+                quads[:, :, axis] = index[:, axis, None]
+                quads[:, :, b] = index[:, b, None] - 1 + corners[:, 0]
+                quads[:, :, c] = index[:, c, None] - 1 + corners[:, 1]
+                order = [0, 1, 2, 0, 2, 3] if facing > 0 else [0, 2, 1, 0, 3, 2]
+                triangles.append(quads[:, order].reshape(-1, 3, 3))
+        if not triangles:
+            return np.zeros((0, 3, 3))
+        return np.concatenate(triangles) * voxel + low
+
+    # count layers of the voxels across, at the heights between the bottom and the top.  Returns the image and
+    # the heights.
+    @classmethod
+    def slices(cls, occupied, low, voxel, count=5, scale=None):
+        nx, ny, nz = occupied.shape
+        layers = np.linspace(0, nz - 1, count + 2)[1:-1].round().astype(int)
+        scale = scale or max(1, 200 // max(nx, ny))
+        image = np.zeros((ny, count * (nx + 1) - 1, 3), dtype=np.uint8)
+        image[:] = MeshPreview.background
+        for k, layer in enumerate(layers):
+            image[:, k * (nx + 1):k * (nx + 1) + nx][occupied[:, :, layer].T] = MeshPreview.color
+            if k:
+                image[:, k * (nx + 1) - 1] = 0
+        image = image[::-1]  # y up
+        return np.repeat(np.repeat(image, scale, axis=0), scale, axis=1), low[2] + (layers + 0.5) * voxel
+
+
+##################################################################
+# Cuts a mesh into pieces that fit the build volume of a printer.
+#
+# The part is meshed once by OpenSCAD and the mesh is cut here with
+# numpy: a cut clips the triangles against a plane and closes both
+# sides with a cap, which is a lot cheaper than OpenSCAD intersecting
+# the whole part with a cutter cube for every piece.  A piece that is
+# too big is cut across its longest overflowing axis, where the part
+# is thinnest among the positions that let the first side fit, until
+# everything fits.  With a dowel_diameter every cut also gets the
+# positions of two dowel holes that line the pieces up.
+#
+# A mesh is an (n, 3, 3) array of triangles, counter clockwise seen
+# from the outside.
+##################################################################
+class MeshSplitter:
+    def __init__(self, build_volume=(250, 250, 250), margin=2, dowel_diameter=None, dowel_length=20,
+                 candidates=40, min_piece=1.0):
+        self.build_volume = np.array(build_volume, dtype=float)
+        self.margin = margin  # keep the pieces this much smaller than the build volume
+        self.min_piece = min_piece  # no cut leaves a piece thinner than this
+        self.dowel_diameter = dowel_diameter
+        self.dowel_length = dowel_length
+        self.candidates = candidates  # how many cut positions to try
+
+    # split triangles into the pieces that fit.  Returns a list of (triangles, dowels) where dowels is
+    # a list of (position, axis) of the dowel holes on the cuts of that piece.
+    def split(self, triangles):
+        limit = self.build_volume - self.margin
+        pieces = []
+        todo = [(triangles, [])]
+        while todo:
+            triangles, dowels = todo.pop()
+            size = np.ptp(triangles.reshape(-1, 3), axis=0)
+            overflow = size / limit
+            axis = int(np.argmax(overflow))
+            if overflow[axis] <= 1 + 1e-6:
+                pieces.append((triangles, dowels))
+                continue
+            position = self.choose_cut(triangles, axis, limit[axis])
+            below, above, loops = self.cut(triangles, axis, position)
+            new_dowels = dowels + [(point, axis) for point in self.dowel_positions(loops, axis, position)]
+            todo.append((above, new_dowels))
+            todo.append((below, new_dowels))
+        return pieces
+
+    # where to cut along axis so the part below the cut fits in limit: of the positions that do,
+    # the one that cuts the fewest triangles (the smallest cap), and never exactly on a vertex or so close
+    # to the ends that a piece thinner than min_piece is left.
+    def choose_cut(self, triangles, axis, limit):
+        values = triangles[:, :, axis]
+        low, high = values.min(), values.max()
+        pieces_needed = math.ceil((high - low) / limit - 1e-6)
+        # the rest has to fit in pieces_needed - 1 pieces
+        first = max(high - (pieces_needed - 1) * limit, low + limit * 0.25, low + self.min_piece)
+        last = min(low + limit, high - self.min_piece)
+        lowest, highest = values.min(axis=1), values.max(axis=1)
+        best = None
+        for position in np.linspace(first, last, self.candidates):
+            # off a vertex towards the middle, so the cut stays between first and last
+            step = 1e-3 if position < (first + last) / 2 else -1e-3
+            while np.any(np.abs(values - position) < 1e-4):
+                position += step
+            crossing = np.count_nonzero((lowest < position) & (highest > position))
+            if best is None or crossing < best[0]:
+                best = (crossing, position)
+        return best[1]
+
+    # split a box that is too big for the build volume along every axis and make sure it comes out as the
+    # 8 closed pieces it should, with nothing lost.  Raises a MeshError if it does not.
+    @classmethod
+    def check(cls, size=400, build_volume=(250, 250, 250)):
+        pieces = cls(build_volume).split(MeshFiles.box((size, size, size)))
+        problems = []
+        if len(pieces) != 8:
+            problems.append("{} pieces instead of 8".format(len(pieces)))
+        volume = 0.0
+        for index, (triangles, _) in enumerate(pieces):
+            stats = MeshFiles.edge_stats(triangles)
+            if not len(triangles) or any(stats.values()):
+                problems.append("piece {} is not closed: {}".format(index + 1, stats))
+            a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+            volume += np.einsum("ij,ij->", a, np.cross(b, c)) / 6.0
+        if abs(volume - size ** 3) > 1e-6 * size ** 3:
+            problems.append("the pieces are {:.1f} mm3, not {} mm3".format(volume, size ** 3))
+        if problems:
+            raise MeshError("splitting a {} mm box: {}".format(size, ", ".join(problems)))
+        print("Split a {} mm box into {} closed pieces".format(size, len(pieces)))
+
+    # the triangles below and above position along axis, each closed with a cap, and the loops of the cut
+    def cut(self, triangles, axis, position):
+        position = round(float(position), 6)  # on the grid clip() rounds the points of the cut to
+        below, below_edges = self.clip(triangles, triangles[:, :, axis] - position)
+        above, above_edges = self.clip(triangles, position - triangles[:, :, axis])
+        loops = self.loops(below_edges)
+        below = np.concatenate((below, self.cap(loops, axis, position, 1)))
+        above = np.concatenate((above, self.cap(self.loops(above_edges), axis, position, -1)))
+        return below, above, loops
+
+    # the parts of the triangles where distance < 0, and the edges the cap has to fill in (in the
+    # direction the cap needs them).
+    def clip(self, triangles, distance):
+        inside = distance < 0
+        count = inside.sum(axis=1)
+        result = [triangles[count == 3]]
+        edges = []
+        for lone_inside in (True, False):
+            selected = count == (1 if lone_inside else 2)
+            if not np.any(selected):
+                continue
+            # roll every triangle so the vertex that is alone on its side comes first
+            first = np.argmax(inside[selected] == lone_inside, axis=1)
+            order = (first[:, None] + np.arange(3)[None, :]) % 3
+            v = np.take_along_axis(triangles[selected], order[:, :, None], axis=1)
+            d = np.take_along_axis(distance[selected], order, axis=1)
+            a, b, c = v[:, 0], v[:, 1], v[:, 2]
+            # always interpolate from the inside vertex so both triangles of an edge get the same point, and
+            # round it like loops() does, so points closer than that are one vertex of the cap and the sides
+            if lone_inside:
+                p_ab = np.round(a + (b - a) * (d[:, 0] / (d[:, 0] - d[:, 1]))[:, None], 6)
+                p_ac = np.round(a + (c - a) * (d[:, 0] / (d[:, 0] - d[:, 2]))[:, None], 6)
+                result.append(np.stack((a, p_ab, p_ac), axis=1))
+                edges.append(np.stack((p_ac, p_ab), axis=1))
+            else:
+                p_ab = np.round(b + (a - b) * (d[:, 1] / (d[:, 1] - d[:, 0]))[:, None], 6)
+                p_ac = np.round(c + (a - c) * (d[:, 2] / (d[:, 2] - d[:, 0]))[:, None], 6)
+                result.append(np.stack((p_ab, b, c), axis=1))
+                result.append(np.stack((p_ab, c, p_ac), axis=1))
+                edges.append(np.stack((p_ab, p_ac), axis=1))
+        if edges:
+            edges = np.concatenate(edges)
+        else:
+            edges = np.zeros((0, 2, 3))
+        result = np.concatenate(result)
+        # a triangle with two of its points rounded together is only an edge there and back, leave it out
+        same = np.all(result[:, 0] == result[:, 1], axis=1) | np.all(result[:, 1] == result[:, 2], axis=1) | \
+            np.all(result[:, 2] == result[:, 0], axis=1)
+        return result[~same], edges
+
+    # join the cut edges into closed loops of points
+    @classmethod
+    def loops(cls, edges):
+        keys = np.round(edges, 6)
+        following = dict()
+        points = dict()
+        for key, edge in zip(keys.tolist(), edges):
+            start, end = tuple(key[0]), tuple(key[1])
+            if start != end:
+                following[start] = end
+                points[start] = edge[0]
+        loops = []
+        while following:
+            start, end = following.popitem()
+            loop = [start]
+            while end != start and end in following:
+                loop.append(end)
+                end = following.pop(end)
+            if end == start and len(loop) >= 3:
+                loops.append(np.array([points[key] for key in loop]))
+            else:
+                print("Dropping an open cut outline of {} points, the mesh is not closed".format(len(loop)))
+        return loops
+
+    # the triangles that close the cut.  facing is 1 if the cap faces +axis, -1 if it faces -axis.
+    def cap(self, loops, axis, position, facing):
+        u, w = (axis + 1) % 3, (axis + 2) % 3
+        triangles = []
+        for outline in self.outlines([loop[:, (u, w)] * (facing, 1) for loop in loops]):
+            for triangle in self.triangulate(outline):
+                points = np.zeros((3, 3))
+                points[:, axis] = position
+                points[:, u] = triangle[:, 0] * facing
+                points[:, w] = triangle[:, 1]
+                triangles.append(points)
+        return np.array(triangles).reshape(-1, 3, 3)
+
+    @classmethod
+    def area(cls, loop):
+        x, y = loop[:, 0], loop[:, 1]
+        return (np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))) / 2
+
+    @classmethod
+    def inside(cls, point, loop):
+        x, y = loop[:, 0], loop[:, 1]
+        x2, y2 = np.roll(x, -1), np.roll(y, -1)
+        crosses = (y > point[1]) != (y2 > point[1])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            at = x + (point[1] - y) * (x2 - x) / (y2 - y)
+        return np.count_nonzero(crosses & (point[0] < at)) % 2 == 1
+
+    # counter clockwise loops are outlines, clockwise loops are holes.  Each hole is joined to the
+    # smallest outline around it, so every outline is one simple polygon.
+    def outlines(self, loops):
+        outlines = [loop for loop in loops if self.area(loop) > 0]
+        holes = [loop for loop in loops if self.area(loop) < 0]
+        outlines.sort(key=self.area)
+        holes.sort(key=lambda hole: -hole[:, 0].max())  # rightmost first
+        for hole in holes:
+            for index, outline in enumerate(outlines):
+                if self.inside(hole[0], outline):
+                    outlines[index] = self.bridge(outline, hole)
+                    break
+        return outlines
+
+    # join a hole into the outline with a pair of edges from the rightmost point of the hole to the
+    # closest point of the outline that can be seen from it
+    @classmethod
+    def bridge(cls, outline, hole):
+        start = int(np.argmax(hole[:, 0]))
+        point = hole[start]
+        edges = [(outline[i], outline[(i + 1) % len(outline)]) for i in range(len(outline))]
+        edges += [(hole[i], hole[(i + 1) % len(hole)]) for i in range(len(hole))]
+        for index in np.argsort(np.linalg.norm(outline - point, axis=1)):
+            target = outline[index]
+            if not any(cls.segments_cross(point, target, a, b) for a, b in edges):
+                break
+        hole = np.roll(hole, -start, axis=0)
+        return np.concatenate((outline[:index + 1], hole, hole[:1], outline[index:]))
+
+    @classmethod
+    def segments_cross(cls, p1, p2, q1, q2):
+        def side(a, b, c):
+            return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+        if any(np.array_equal(p, q) for p in (p1, p2) for q in (q1, q2)):
+            return False  # touching at a corner is fine
+        return side(p1, p2, q1) * side(p1, p2, q2) < 0 and side(q1, q2, p1) * side(q1, q2, p2) < 0
+
+    # ear clipping, for a counter clockwise polygon
+    @classmethod
+    def triangulate(cls, polygon):
+        points = [tuple(p) for p in polygon]
+        triangles = []
+
+        def cross(a, b, c):
+            return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+        def is_ear(i):
+            a, b, c = points[i - 1], points[i], points[(i + 1) % len(points)]
+            if cross(a, b, c) <= 1e-12:
+                return False
+            for p in points:
+                if p == a or p == b or p == c:
+                    continue
+                if cross(a, b, p) >= 0 and cross(b, c, p) >= 0 and cross(c, a, p) >= 0:
+                    return False
+            return True
+
+        i = 0
+        misses = 0
+        while len(points) > 3:
+            i %= len(points)
+            if is_ear(i):
+                triangles.append((points[i - 1], points[i], points[(i + 1) % len(points)]))
+                points.pop(i)
+                misses = 0
+            elif misses > len(points):
+                # only slivers are left (points on a line), drop a point that adds no area
+                i = min(range(len(points)),
+                        key=lambda i: abs(cross(points[i - 1], points[i], points[(i + 1) % len(points)])))
+                points.pop(i)
+                misses = 0
+            else:
+                i += 1
+                misses += 1
+        if len(points) == 3 and cross(*points) > 0:
+            triangles.append(tuple(points))
+        return [np.array(triangle) for triangle in triangles]
+
+    # two points inside the cut outlines that are as far from the edges as possible and from each
+    # other, for the dowels
+    def dowel_positions(self, loops, axis, position):
+        if not self.dowel_diameter or not loops:
+            return []
+        u, w = (axis + 1) % 3, (axis + 2) % 3
+        flat = [loop[:, (u, w)] for loop in loops]
+        edges = np.concatenate([np.stack((loop, np.roll(loop, -1, axis=0)), axis=1) for loop in flat])
+        low = np.min([loop.min(axis=0) for loop in flat], axis=0)
+        high = np.max([loop.max(axis=0) for loop in flat], axis=0)
+        grid = np.stack(np.meshgrid(np.linspace(low[0], high[0], 60), np.linspace(low[1], high[1], 60)),
+                        axis=-1).reshape(-1, 2)
+        grid = np.array([p for p in grid if sum(self.inside(p, loop) for loop in flat) % 2 == 1])
+        if len(grid) == 0:
+            return []
+        # distance from every grid point to the closest edge
+        a, b = edges[:, 0], edges[:, 1]
+        ab = b - a
+        t = np.clip(np.einsum("gij,ij->gi", grid[:, None, :] - a[None], ab) / np.maximum((ab * ab).sum(1), 1e-12),
+                    0, 1)
+        closest = a[None] + t[:, :, None] * ab[None]
+        clearance = np.linalg.norm(grid[:, None, :] - closest, axis=2).min(axis=1)
+        usable = grid[clearance >= self.dowel_diameter]
+        if len(usable) == 0:
+            print("The cut at {:.1f} is too thin for {}mm dowels".format(position, self.dowel_diameter))
+            return []
+        first = usable[np.argmax(clearance[clearance >= self.dowel_diameter])]
+        second = usable[np.argmax(np.linalg.norm(usable - first, axis=1))]
+        chosen = [first]
+        if np.linalg.norm(second - first) > 2 * self.dowel_diameter:
+            chosen.append(second)
+        result = []
+        for point in chosen:
+            position3d = np.zeros(3)
+            position3d[axis] = position
+            position3d[u], position3d[w] = point
+            result.append(tuple(position3d))
+        return result
+
+
+##################################################################
+# Finds geometry that a part builds and then throws away.
+#
+# While tracing, every CsgNode that is made is remembered and every
+# method of the model and its tools that returns geometry is timed.
+# After a part is built anything that can not be reached from what
+# the part returned was wasted: a method whose result was never used
+# (fence_bar building the table top it never uses) or a primitive
+# that was made and dropped.  The methods are swapped in on the
+# classes only while tracing so normal builds do not pay for it.
+##################################################################
+class DeadBuildProfiler:
+    primitives = frozenset(("cube", "sphere", "cylinder", "circle", "square", "polygon", "text", "import"))
+    # a + b + c drops the union()(a, b) it made on the way, but not what is in it
+    combined = frozenset(("union", "difference", "intersection"))
+
+    def __init__(self):
+        self.calls = []
+        self.stack = []
+        self.created = []
+
+    def reset(self):
+        self.calls = []
+        self.stack = []
+        self.created = []
+
+    @classmethod
+    def nodes_in(cls, result):
+        if isinstance(result, CsgNode):
+            return [result]
+        if isinstance(result, dict):
+            result = list(result.values())
+        if isinstance(result, (list, tuple)):
+            return [node for item in result for node in cls.nodes_in(item)]
+        return []
+
+    def traced(self, func):
+        profiler = self
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            call = dict(name=func.__name__, parent=profiler.stack[-1] if profiler.stack else None, seconds=0)
+            profiler.stack.append(len(profiler.calls))
+            profiler.calls.append(call)
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                call["seconds"] = time.perf_counter() - start
+                profiler.stack.pop()
+            call["nodes"] = profiler.nodes_in(result)
+            return result
+
+        return wrapper
+
+    @contextlib.contextmanager
+    def tracing(self, *objects):
+        originals = [(CsgNode, "__init__", CsgNode.__init__)]
+        for obj in objects:
+            cls = type(obj)
+            for name, value in vars(cls).items():
+                if not name.startswith("_") and isinstance(value, types.FunctionType):
+                    originals.append((cls, name, value))
+
+        created_init = CsgNode.__init__
+
+        def init(node, name, params=(), children=()):
+            created_init(node, name, params, children)
+            self.created.append(node)
+
+        CsgNode.__init__ = init
+        for cls, name, func in originals[1:]:
+            setattr(cls, name, self.traced(func))
+        try:
+            yield self
+        finally:
+            for cls, name, func in originals:
+                setattr(cls, name, func)
+
+    def analyze(self, part_name, result, seconds):
+        reachable = set()
+        stack = self.nodes_in(result)
+        while stack:
+            node = stack.pop()
+            if id(node) not in reachable:
+                reachable.add(id(node))
+                stack.extend(node.children)
+
+        def used(node):
+            if id(node) in reachable:
+                return True
+            return node.name in self.combined and not node.params and len(node.children) > 0 and \
+                all(used(child) for child in node.children)
+
+        dead = []
+        dead_calls = []
+        for call in self.calls:
+            parent_dead = call["parent"] is not None and dead[call["parent"]]
+            is_dead = parent_dead or (len(call.get("nodes", ())) > 0 and not any(map(used, call["nodes"])))
+            dead.append(is_dead)
+            if is_dead and not parent_dead:
+                dead_calls.append((call["name"], call["seconds"]))
+
+        dead_primitives = [node for node in self.created if node.name in self.primitives and id(node) not in reachable]
+        return dict(part=part_name, seconds=seconds, wasted_seconds=sum(call[1] for call in dead_calls),
+                    dead_calls=dead_calls, dead_primitives=len(dead_primitives))
+
+
+##################################################################
+# python BandSaw.py --serve keeps a model running and renders parts
+# when it is asked to, so trying one value is a fraction of a second
+# instead of a whole run.  It only listens on localhost:
+#   GET  /parts    the names of the parts
+#   GET  /status   the models it keeps and what they have cached
+#   POST /render   {"parts": ["table_top"], "parameters": {"table_top_width": 260},
+#                   "resolution": "draft", "stl": false}
+#                  or the same as text:
+#                  render table_top with table_top_width=260 at draft resolution
+# and answers with the files it made (and the mesh stats, with stl).
+#
+# Every set of values gets its own model, a copy of the first one
+# with the values changed before the derived values are worked out,
+# and its own directory, outputs/server/<fingerprint>.  A model keeps
+# the parts it built and knows which scad files it wrote, so asking
+# again only builds and writes what changed, and an stl is only made
+# again when its scad changed (see can_reuse_stl).  The models share
+# the stl_runner, so the memory history of the jobs stays loaded.
+# The last max_models models are kept.
+##################################################################
+class RenderServer:
+    def __init__(self, model, host="127.0.0.1", port=8765, max_models=8):
+        self.model = model
+        self.address = (host, port)
+        self.max_models = max_models
+        self.models = collections.OrderedDict()
+        self.part_names = [part[0].__name__ for part in model.parts]
+        self.requests = 0
+
+    def serve(self):
+        server = http.server.HTTPServer(self.address, RenderRequestHandler)
+        server.render_server = self
+        # build the parts of the model as it is before the first request comes in
+        start = time.perf_counter()
+        model = self.model_for(dict(), None)
+        for part in model.parts:
+            model.build_part(part[0])
+        print("Built {} parts in {:.1f}s, serving on http://{}:{}".format(
+            len(model.parts), time.perf_counter() - start, *self.address))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+    def render(self, request):
+        if not isinstance(request, dict):
+            raise ValueError("a request is a json object or a render command")
+        parts = request.get("parts")
+        if isinstance(parts, str):
+            parts = [parts]
+        if not parts:
+            raise ValueError("say which parts to render, /parts lists them")
+        unknown = [part for part in parts if part not in self.part_names]
+        if unknown:
+            raise ValueError("there is no part {}".format(", ".join(unknown)))
+        model = self.model_for(request.get("parameters") or dict(), request.get("resolution"))
+        model.make_stl = bool(request.get("stl", False))
+        # the jobs of the last request are done, the same stl files can be made again
+        model.stl_runner.jobs_by_file = dict()
+        model.stl_runner.finished = []
+        self.requests += 1
+        cached = len(model._part_cache)
+        start = time.perf_counter()
+        error = None
+        try:
+            model.render_all(parts=parts)
+        except MeshError as e:
+            error = str(e)
+        names = set(os.path.splitext(os.path.basename(output["file"]))[0] for output in model._outputs)
+        meshes = dict((name, model._manifest[name]["mesh"]) for name in sorted(names)
+                      if "mesh" in model._manifest.get(name, dict()))
+        return dict(ok=error is None, error=error, seconds=time.perf_counter() - start,
+                    fingerprint=model.params.fingerprint(), resolution=model.resolution_mode(),
+                    directory=model.output_path(""), parts_built=len(model._part_cache) - cached,
+                    outputs=model._outputs, meshes=meshes)
+
+    def status(self):
+        models = []
+        for key, model in self.models.items():
+            models.append(dict(parameters=json.loads(key[0]), resolution=model.resolution_mode(),
+                               fingerprint=model.params.fingerprint(), directory=model.output_path(""),
+                               cached_parts=len(model._part_cache), scad_files=len(model._scad_written)))
+        return dict(requests=self.requests, models=models, stl_jobs_known=len(self.model.stl_runner.history))
+
+    # the model for these values, made if it is not one of the last max_models used
+    def model_for(self, parameters, resolution):
+        if not isinstance(parameters, dict):
+            raise ValueError("parameters are a json object of name: value")
+        key = (json.dumps(parameters, sort_keys=True), resolution)
+        model = self.models.pop(key, None)
+        if model is None:
+            model = self.make_model(parameters, resolution)
+        self.models[key] = model
+        while len(self.models) > self.max_models:
+            self.models.popitem(last=False)
+        return model
+
+    @staticmethod
+    def same_kind(old, value):
+        # json true is not 1 mm, a count stays a whole number, a length may be given without a decimal point
+        if isinstance(old, bool) or isinstance(value, bool):
+            return isinstance(old, bool) and isinstance(value, bool)
+        if isinstance(old, numbers.Integral):
+            return isinstance(value, numbers.Integral)
+        if isinstance(old, numbers.Real):
+            return isinstance(value, numbers.Real)
+        return not isinstance(value, numbers.Number)
+
+    def make_model(self, parameters, resolution):
+        base = self.model
+        for key, value in parameters.items():
+            if key.startswith("_") or key in BandSawParameters.not_parameters or key not in vars(base) or \
+                    BandSawParameters.freeze(getattr(base, key)) is None:
+                raise ValueError("{} is not a parameter of the model".format(key))
+            if not self.same_kind(getattr(base, key), value):
+                raise ValueError("{} is {!r}, not {!r}".format(key, getattr(base, key), value))
+        if resolution is not None and resolution not in Resolution.profiles:
+            raise ValueError("the resolution is one of {}".format(", ".join(sorted(Resolution.profiles))))
+
+        derived = sorted(key for key in parameters if key in base._derived)
+        if derived:
+            raise ValueError("{} is worked out from the other values, change those instead".format(", ".join(derived)))
+
+        # a model of its own, nothing the requests change is shared with the others
+        model = BandSaw()
+        base.copy_settings(model)
+        for key, value in parameters.items():
+            if isinstance(getattr(base, key), float):
+                value = float(value)  # 260 for a float is 260.0
+            setattr(model, key, copy.deepcopy(value))  # the derived values and the resolution follow
+        if resolution:
+            model.set_resolution(resolution)
+        model.output_directory = os.path.join(base.output_directory, "server", model.params.fingerprint())
+        model.production_output_directory = model.output_directory
+        os.makedirs(model.output_directory, exist_ok=True)
+        model.stl_runner = base.stl_runner
+        model._render_farm = base._render_farm
+        model._part_cache = dict()
+        return model
+
+    # render table_top, c_form with table_top_width=260 wheel_offset_from_frame=7 stl at draft resolution
+    @staticmethod
+    def parse_command(text):
+        words = text.replace(",", " ").split()
+        if not words or words[0] != "render":
+            raise ValueError("a command looks like: render table_top with table_top_width=260 at draft resolution")
+        request = dict(parts=[], parameters=dict())
+        mode = "parts"
+        for word in words[1:]:
+            if word in ("with", "at"):
+                mode = word
+            elif word == "and":
+                continue
+            elif mode == "parts":
+                request["parts"].append(word)
+            elif mode == "at":
+                if word != "resolution":
+                    request["resolution"] = word
+            elif word == "stl":
+                request["stl"] = True
+            elif "=" in word:
+                key, value = word.split("=", 1)
+                try:
+                    value = json.loads(value)
+                except ValueError:
+                    pass  # a string
+                request["parameters"][key] = value
+            else:
+                raise ValueError("{} is not name=value".format(word))
+        return request
+
+
+class RenderRequestHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/parts":
+            self.reply(200, dict(parts=self.server.render_server.part_names))
+        elif self.path == "/status":
+            self.reply(200, self.server.render_server.status())
+        else:
+            self.reply(404, dict(ok=False, error="there is /parts, /status and POST /render"))
+
+    def do_POST(self):
+        if self.path != "/render":
+            self.reply(404, dict(ok=False, error="POST to /render"))
+            return
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode()
+        try:
+            if body.lstrip().startswith("{"):
+                request = json.loads(body)
+            else:
+                request = RenderServer.parse_command(body)
+            self.reply(200, self.server.render_server.render(request))
+        except ValueError as e:
+            self.reply(400, dict(ok=False, error=str(e)))
+        except Exception as e:
+            # the model is still fine, a part that fails does not stop the server
+            self.reply(500, dict(ok=False, error=repr(e)))
+
+    def reply(self, status, body):
+        data = json.dumps(body, indent=1, sort_keys=True).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
 class BandSaw:
     def __init__(self):
         self.make_stl = False  # this is turned off for debuging
         self.production = False # this is turned on for production
+        self.resolution_profile = None  # draft, preview or production, None follows self.production
+        self.scad_float_format = "{:.10f}"  # how numbers are written into the scad files
+        self.openscad_executable = '/Applications/OpenSCAD.app/Contents/MacOS/OpenSCAD'
+        self.stl_memory_budget_mb = 8000  # how much memory the OpenSCAD jobs running at the same time can use
+        self.stl_max_jobs = os.cpu_count()
+        self.stl_max_waiting = 4 * (os.cpu_count() or 1)  # how far the scad files can get ahead of the meshing
+        self.stl_format = "binary"  # OpenSCAD writes ascii stl files, "binary" converts them when they are made
+        self.symmetric_meshing = True  # mesh the shape once for parts made of mirrored or moved copies of it
+        self.make_previews = True  # a png of every output in previews/, and previews/index.html to see them all
+        self.preview_backend = None  # "openscad", or "numpy" to draw the stl files, None uses OpenSCAD if it is there
+        self.preview_size = (400, 300)
+        # the cameras, rotate = (x, y, z) like the OpenSCAD camera, and the outputs that are not seen best from iso
+        self.preview_cameras = dict(iso=(55, 0, 25), top=(90, 0, 0), front=(0, 0, 0), side=(0, 0, -90))
+        self.preview_views = dict(bottom_wheel="top", top_wheel="top", table_top="top", table_top_miter="top")
+        self.diff_voxel_size = 0.5  # mm, --diff compares the meshes on voxels this size (bigger for big parts)
+        self.diff_max_lines = 20  # of the scad diff of each part to print, diff/name.scad.diff has all of it
+        self.draft_voxel_size = 1.0  # mm, of the --draft meshes (bigger for big parts)
+        self.draft_slices = 5  # layers in draft/name_slices.png
+        # the stl jobs of --farm go to RenderFarm workers, "0.0.0.0" lets workers on other machines connect too
+        self.render_farm_host = "127.0.0.1"
+        self.render_farm_max_jobs = 64  # how many stl jobs can be out with the workers at a time
+        self.render_farm_heartbeat_timeout = 30  # a worker not heard from for this long is taken for dead
+        # parts that are printed together, each plate is written to name.3mf when the stl files are made
+        self.plates = [dict(name="wheels_plate", parts=["bottom_wheel", "top_wheel"], size=(250, 250)),
+                       dict(name="blade_guides_plate", parts=["top_blade_guide", "bottom_blade_guide"], size=(250, 250)),
+                       dict(name="fence_attachments_plate",
+                            parts=["fence_bar_attachment_front", "fence_bar_attachment_back"], size=(250, 250))]
+        # the parts whose bolt holes have to line up where full_assembly puts them, see check_bolt_holes()
+        self.assembly_parts = ["base_bottom_part", "base_center_plate", "c_form", "base_front_plate", "base_back_plate",
+                               "top_blade_guide", "bottom_blade_guide", "upper_blade_guide_bearing_holder",
+                               "lower_blade_guide_bearing_holder", "table_slider_attachment", "table_top",
+                               "table_slider_holder_panel", "blade_protector_cover", "blade_protector_cover_connector",
+                               "top_wheel_axle_bearing_holder", "top_bearing_back_plate", "table_top_miter_bar",
+                               "table_top_miter", "fence_bar"]
+        self.bolt_hole_tolerance = 0.05  # mm, how far apart two holes that line up can be
+        # the bolts and nuts that go into the holes of tools.bolt_sizes and tools.round_bolt_sizes, in mm: nut is
+        # across the flats of the nut that goes into the hexagonal pockets, flat of the one that goes into the slots
+        self.fasteners = {"1/4": dict(bolt=6.35, nut=11.11), "4mm": dict(bolt=4.0), "5mm": dict(bolt=5.0, flat=8.0),
+                          "8mm-rod": dict(bolt=8.0)}
+        # how far off a printer prints, the mean and the standard deviation of the error: outside dimensions (the
+        # width of a bar, too wide when positive) and inside ones (of a hole or a slot, too narrow when negative)
+        # in mm, and scale in parts of the dimension (negative when it shrinks)
+        self.printers = dict(pla=dict(outside=(0.05, 0.05), inside=(-0.2, 0.08), scale=(-0.002, 0.001)),
+                             petg=dict(outside=(0.1, 0.08), inside=(-0.25, 0.1), scale=(-0.003, 0.0015)),
+                             abs=dict(outside=(0.05, 0.08), inside=(-0.2, 0.1), scale=(-0.007, 0.002)))
+        self.tolerance_printer = "pla"
+        self.tolerance_samples = 50000  # builds that --tolerances samples
+        # mm of clearance (the hole less what goes into it) under which a fit binds and over which it is too loose
+        self.fit_limits = dict(bolt=(0.0, 1.0), nut=(0.0, 1.0), slide=(0.05, 1.0), fit=(0.0, 2.0))
 
         # initialize the tools.
-        self.tools = HelperTools()
+        self.tools = HelperTools(Resolution(self.resolution_mode()))
 
         # the width of the main c_frame.  It makes sense for this to be very thick. since it supports
         # the tension between the top and bottom wheels, and also has some side twist to help align
@@ -172,8 +3027,9 @@ class BandSaw:
         self.top_bearing_bottom_of_slot = 30
         self.top_bearing_extension_height = 165
         self.top_bearing_slide_capability = 8  # how much room above the holder
-        self.top_bearing_body_depth = self.c_form_width - self.top_bearing_tab_thickness
         self.top_bearing_body_gap = 0.75
+        # the slider on the plates is this much narrower than the groove of the c_form on both sides
+        self.inner_slider_clearance = 0.5
 
         # THE SUB_BASE
         # This is the part that connects to the base and suppors the sides that are bolted together to hold the c_frame
@@ -210,7 +3066,6 @@ class BandSaw:
 
         self.table_top_miter_thickness = 10
         self.table_top_miter_radius = 60
-        self.table_top_miter_hole_offset = self.table_top_miter_radius * .4
         self.table_top_miter_set_angles = [0, 30, 45]
         self.table_top_miter_back_plate_thickness = 5
         self.table_top_miter_back_plate_depth = 15
@@ -223,6 +3078,7 @@ class BandSaw:
         self.fence_attachment_width = 100
         self.fence_guide_depth = 5  # this determines the size and dept of the the slot on the front
         # and back of the table for the fence guide
+        self.fence_bar_slot_clearance = 0.4  # the tongue of the fence attachments is this much smaller than the slot
         self.table_fence_nut_depth = 25
 
         # The guide for the blade
@@ -231,7 +3087,6 @@ class BandSaw:
         self.guide_plate_thickness = 22
         self.guide_tongue_thickness = 16
         self.guide_tongue_width = 10
-        self.guide_small_groove = self.tools.bolt_sizes["1/4"]["bolt"] + .2  # to give it more slide
         self.guide_large_groove = 14
         self.guide_large_groove_depth = 5
         self.guide_groove_from_top = 20
@@ -243,8 +3098,6 @@ class BandSaw:
         self.back_plate_height = 178
         # Where is the tip of the back plate (we need his for the attachment calculatioins
         self.back_plate_length = 340
-        self.back_plate_tip = (
-            self.back_plate_length, self.back_plate_thickness + self.c_form_width / 2, self.back_plate_height)
 
         # Table values
 
@@ -252,6 +3105,7 @@ class BandSaw:
         self.table_vertical_plate_width = 121
         self.table_vertical_plate_thickness = 30
         self.table_slide_holder_width = 20
+        self.table_slide_clearance = 0.5  # between each slide of the holder panel and the table slider attachment
 
         self.table_attachment_top_thickness = 10
         self.table_distance_from_tip = 16
@@ -259,26 +3113,38 @@ class BandSaw:
 
         self.table_guide_slot_width = 20
         self.table_miter_slot_depth = 10
+        self.table_miter_bar_clearance = 0.6  # the miter bar is this much narrower than the slot for it
         self.table_guide_champher = 0
         self.table_top_guide_offset = 40
-        self.table_top_guide_bar_length = self.table_top_depth + 50
 
         # blade protectore values
         self.blade_protector_thickness = 5
         self.blade_protector_extension_ammount = 10  # The extra space in the protector
-        self.blade_protector_depth = self.wheel_thickness + self.blade_protector_extension_ammount
         self.blade_protector_height = 200
         self.blade_protector_cover_thickness = 5
         self.blade_protector_riser_front_width = 20
         self.blade_protector_cover_diameter_extendor = 8
-        self.blade_cover_radius = self.small_radius - 10
 
-        # here we calculate the center of the c-form and store it
-        bottom_height = 52 + 13  # from the diagaram, to calculate the center of the c_frame
+        # the blade guide bearing holders
+        self.bearing_plate_height = 30
+        self.bearing_plate_depth = 6
+        self.bearing_holder_height = 30
+        self.bearing_holder_extension = 3  # how much towards the front we need to push bearings
+        self.bearing_holder_front_length = 16
+        self.bearing_holder_slope_length = 16  # could link with the above
+        self.bearing_holder_front_slope_height = 17
+        self.bearing_holder_thickness = 18
+        self.guide_bearing_x_offset = 28
+        self.thrust_bearing_thickness = 15
 
-        self.center_x = self.big_radius
-        self.center_y = -self.c_form_width / 2
-        self.center_z = bottom_height + self.big_radius
+        # everything that is calculated from the values above.
+        settings = set(vars(self))
+        self.compute_derived_parameters()
+        self._derived = set(vars(self)) - settings
+
+        # the frozen snapshot of all the values above.  The parts are not allowed to change the model
+        # while they are being built, see generating()
+        self.params = BandSawParameters.from_model(self)
 
         # the list of all the parts to print
         self.parts = [[self.base_bottom_part, True],
@@ -361,15 +3227,33 @@ class BandSaw:
                       ]
 
         # prepare for where we dump the scad files.
-        home = os.path.expanduser("~")
         # get the path for the current working directory
         current_directory = os.path.dirname(os.path.realpath(__file__))
-        self.output_directory = os.path.join(current_directory, "outputs")
+        output_directory = os.path.join(current_directory, "outputs")
+        self.output_directory = output_directory
 
         # if you want your production files to go somewhere else, Uncomment following line
-        #self.production_output_directory = os.path.join(self.output_directory, "production")
-
-        self.production_output_directory = self.output_directory
+        # self.production_output_directory = os.path.join(output_directory, "production")
+
+        self.production_output_directory = output_directory
+
+        self.scad_writer = ScadWriter(float_format=self.scad_float_format)
+        self._split_parents = dict()  # see split_parent()
+        self._part_cache = None  # the results of the parts, see build_part(), only RenderServer keeps them
+        self._scad_written = dict()  # the structural hash of each scad file written, see render()
+        self._outputs = []  # the files written by render_all, for the build summary
+        self._manifest = dict()  # what render_all made and how, see write_manifest()
+        self._previous_manifest = dict()
+        self._current_part = None
+        self._remeshing = set()  # the stl files that are being made again in this run
+        self._structures = dict()  # the first output of each shape, see link_duplicate()
+        self._shapes = dict()  # the first output of each shape under its transforms, see render_symmetric()
+        self._checked = set()  # the meshes check_mesh() looked at in this run
+        self._journal = None  # see start_journal()
+        self._render_farm = None  # see start_render_farm()
+        self.stl_runner = StlJobRunner(os.path.join(output_directory, "stl_history.json"),
+                                       memory_budget_mb=self.stl_memory_budget_mb, max_jobs=self.stl_max_jobs,
+                                       max_waiting=self.stl_max_waiting)
 
         # make the output directory if it doesn't exist
         if not os.path.exists(self.output_directory):
@@ -377,6 +3261,446 @@ class BandSaw:
         if not os.path.exists(self.production_output_directory):
             os.makedirs(self.production_output_directory)
 
+    ##################################################################
+    # All the values that are calculated from other values.  These are
+    # computed once, up front, so that no part has to set them and no
+    # part depends on another part having been built first.
+    ##################################################################
+    def compute_derived_parameters(self):
+        self.top_bearing_body_depth = self.c_form_width - self.top_bearing_tab_thickness
+        self.table_top_miter_hole_offset = self.table_top_miter_radius * .4
+        self.guide_small_groove = self.tools.bolt_sizes["1/4"]["bolt"] + .2  # to give it more slide
+
+        # Where is the tip of the back plate (we need his for the attachment calculatioins
+        self.back_plate_tip = (
+            self.back_plate_length, self.back_plate_thickness + self.c_form_width / 2, self.back_plate_height)
+        self.table_top_guide_bar_length = self.table_top_depth + 50
+
+        self.blade_protector_depth = self.wheel_thickness + self.blade_protector_extension_ammount
+        self.blade_cover_radius = self.small_radius - 10
+        self.bearing_holder_length = self.c_form_width + self.bearing_holder_front_length
+
+        # here we calculate the center of the c-form and store it
+        bottom_height = 52 + 13  # from the diagaram, to calculate the center of the c_frame
+
+        self.center_x = self.big_radius
+        self.center_y = -self.c_form_width / 2
+        self.center_z = bottom_height + self.big_radius
+
+        # the table top is centered on the blade
+        self.table_top_center_x = self.center_x + self.wheel_diameter / 2
+        self.table_top_center_y = -self.c_form_width / 2 - self.wheel_offset_from_frame - (self.back_plate_thickness)
+        self.table_top_center_z = self.back_plate_tip[2]
+
+    ##################################################################
+    # Parts must not write to the model while they are being built,
+    # otherwise the result of a part depends on which parts were built
+    # before it and it can not be cached or built in parallel.
+    ##################################################################
+    def __setattr__(self, key, value):
+        generating = self.__dict__.get("_generating")
+        if generating:
+            raise ModelMutationError("{} tried to set {} while generating".format(generating, key))
+        object.__setattr__(self, key, value)
+        if key in ("scad_float_format", "stl_memory_budget_mb", "stl_max_jobs", "stl_max_waiting",
+                   "render_farm_max_jobs") and "stl_runner" in self.__dict__:
+            self.configure_runners()
+        # a value changed after the model is made (b.table_top_width = 260), the values worked out from it and
+        # the snapshot follow it
+        if "params" in self.__dict__ and not self.__dict__.get("_updating") and not key.startswith("_") and \
+                key != "params" and key not in self._derived:
+            self.update_parameters()
+
+    # work out the derived values and take the snapshot of the parameters again, after values of the model (or
+    # of the tools, in place) were changed
+    def update_parameters(self):
+        self._updating = True
+        try:
+            self.tools.resolution = Resolution(self.resolution_mode())
+            self.compute_derived_parameters()
+            self.params = BandSawParameters.from_model(self)
+        finally:
+            self._updating = False
+
+    # copy the values of this model (not the derived ones) onto model, the tools too
+    def copy_settings(self, model):
+        for key, value in vars(self).items():
+            if not key.startswith("_") and key not in ("params", "tools") and key not in self._derived and \
+                    BandSawParameters.freeze(value) is not None:
+                model.__dict__[key] = copy.deepcopy(value)
+        for key, value in vars(self.tools).items():
+            if not key.startswith("_") and BandSawParameters.freeze(value) is not None:
+                model.tools.__dict__[key] = copy.deepcopy(value)
+        model.update_parameters()
+        model.configure_runners()
+
+    # the scad writer and the stl runner follow the values they are made from (b.stl_max_jobs = 2).  They are
+    # changed in place, the runner keeps its memory history and the jobs it is running.
+    def configure_runners(self):
+        self.scad_writer.float_format = self.scad_float_format
+        self.stl_runner.memory_budget_mb = self.stl_memory_budget_mb
+        max_jobs = self.stl_max_jobs or os.cpu_count() or 1
+        self.stl_runner.max_waiting = self.stl_max_waiting or 4 * max_jobs
+        # with a farm the jobs only wait here, as many can be out as the workers can take
+        self.stl_runner.max_jobs = self.render_farm_max_jobs if self._render_farm else max_jobs
+
+    @contextlib.contextmanager
+    def generating(self, name):
+        outer = self.__dict__.get("_generating")
+        self.__dict__["_generating"] = name
+        try:
+            yield
+        finally:
+            self.__dict__["_generating"] = outer
+        # catch the sneaky ones that change a value in place (e.g. self.tools.bolt_sizes["1/4"]["bolt"] = 7)
+        if BandSawParameters.from_model(self) != self.params:
+            raise ModelMutationError("{} changed the model parameters while generating".format(name))
+
+    ##################################################################
+    # Build every part twice, in list order and in reverse order, on two
+    # fresh models with the values of this one and make sure each part
+    # is the same both times.
+    # Returns the list of the parts that failed.
+    ##################################################################
+    def check_part_purity(self):
+        self.update_parameters()
+        forward = BandSaw()
+        backward = BandSaw()
+        self.copy_settings(forward)
+        self.copy_settings(backward)
+        funcs = [part[0].__name__ for part in self.parts]
+        forward_results = dict()
+        failures = []
+        def build(model, func_name):
+            with model.generating(func_name):
+                obj, name = getattr(model, func_name)()[:2]
+            if name == "__SEGMENTS__":
+                return [model.scad_writer.to_string(segment["obj"]) for segment in obj]
+            if name == "__SPLIT__":
+                return model.scad_writer.to_string(obj["obj"])
+            return model.scad_writer.to_string(obj)
+
+        for func_name in funcs:
+            try:
+                forward_results[func_name] = build(forward, func_name)
+            except ModelMutationError as e:
+                print("FAILED: {}".format(e))
+                failures.append(func_name)
+        for func_name in reversed(funcs):
+            if func_name not in forward_results:
+                continue
+            try:
+                backward_result = build(backward, func_name)
+            except ModelMutationError as e:
+                print("FAILED: {}".format(e))
+                failures.append(func_name)
+                continue
+            if backward_result != forward_results[func_name]:
+                print("FAILED: {} depends on the order the parts are built in".format(func_name))
+                failures.append(func_name)
+        print("Checked {} parts, {} failed".format(len(funcs), len(failures)))
+        return failures
+
+    ##################################################################
+    # Build every part with the DeadBuildProfiler and print the parts
+    # that build geometry they never use, worst first.
+    # Returns the report for every part.
+    ##################################################################
+    def find_dead_builds(self):
+        profiler = DeadBuildProfiler()
+        report = []
+        with profiler.tracing(self, self.tools):
+            for part in self.parts:
+                func_name = part[0].__name__
+                profiler.reset()
+                start = time.perf_counter()
+                with self.generating(func_name):
+                    result = getattr(self, func_name)()
+                report.append(profiler.analyze(func_name, result, time.perf_counter() - start))
+
+        report.sort(key=lambda entry: entry["wasted_seconds"], reverse=True)
+        for entry in report:
+            if not entry["dead_calls"] and not entry["dead_primitives"]:
+                continue
+            calls = ", ".join("{} {:.4f}s".format(name, seconds) for name, seconds in entry["dead_calls"])
+            print("{}: {:.4f}s of {:.4f}s wasted, {} unused primitives{}".format(
+                entry["part"], entry["wasted_seconds"], entry["seconds"], entry["dead_primitives"],
+                ", unused results of " + calls if calls else ""))
+        print("Total {:.4f}s wasted".format(sum(entry["wasted_seconds"] for entry in report)))
+        return report
+
+    ##################################################################
+    # Holes that have to line up are made separately for each part:
+    # side_sub_base_connector_bolt_holes is cut out of the sub base,
+    # both plates and the table slider holder panel, and they only
+    # meet when the parts are printed.  check_bolt_holes builds the
+    # assembly_parts where full_assembly puts them, with every bolt
+    # hole registering itself as it is made (see
+    # HelperTools.register_hole), finds where each hole cut out of a
+    # part ends up from the transforms above it and cuts it to the
+    # box of the part (the holes are made 1000 mm long), and compares
+    # the holes of all the parts at once: two holes of parts that
+    # touch (to gap mm) on the same axis have to be the same size and
+    # line up to bolt_hole_tolerance.  A hole is paired with the
+    # nearest hole of each other part that is parallel, next to it
+    # along the axis and closer than the bigger diameter.  A hole
+    # made by a method that makes holes for several parts (e.g.
+    # blade_protector_bolts, for c_form and blade_protector_cover)
+    # that goes into one of the other parts and has no pair there is
+    # a problem too.  Nothing is meshed.
+    # Returns the problems.
+    ##################################################################
+    def check_bolt_holes(self, gap=1.0):
+        holes = []
+        boxes = []
+        names = []
+        for part_name in self.assembly_parts:
+            self.tools._holes = []
+            try:
+                with self.generating(part_name):
+                    obj = getattr(self, part_name)()[0]
+                box = CsgEvaluator().box(obj)
+                if box is not None:
+                    holes.extend(self.placed_holes(len(boxes), part_name, obj, self.tools._holes))
+                    boxes.append(box)
+                    names.append(part_name)
+            finally:
+                self.tools._holes = None
+
+        origin = np.array([hole["origin"] for hole in holes]).reshape(-1, 3)
+        axis = np.array([hole["axis"] for hole in holes]).reshape(-1, 3)
+        part = np.array([hole["part_index"] for hole in holes], dtype=int)
+        low = np.array([box[0] for box in boxes]).reshape(-1, 3)
+        high = np.array([box[1] for box in boxes]).reshape(-1, 3)
+        # where along its axis each hole goes through each part (gap mm around it), empty when it misses the part
+        with np.errstate(divide="ignore", invalid="ignore"):
+            first = (low[None] - gap - origin[:, None]) / axis[:, None]
+            last = (high[None] + gap - origin[:, None]) / axis[:, None]
+        along_axis = np.abs(axis[:, None]) < 1e-12
+        between = (origin[:, None] >= low[None] - gap) & (origin[:, None] <= high[None] + gap)
+        enter = np.where(along_axis, np.where(between, -np.inf, np.inf), np.minimum(first, last)).max(axis=2)
+        leave = np.where(along_axis, np.where(between, np.inf, -np.inf), np.maximum(first, last)).min(axis=2)
+        enter = np.maximum(enter, np.array([hole["start"] for hole in holes]).reshape(-1, 1))
+        leave = np.minimum(leave, np.array([hole["end"] for hole in holes]).reshape(-1, 1))
+        reaches = enter < leave
+        own = np.arange(len(holes))
+        keep = reaches[own, part]  # the others are cut through air
+        for hole, start, end in zip(holes, enter[own, part], leave[own, part]):
+            hole.update(start=float(start), end=float(end))
+        holes = [hole for hole, kept in zip(holes, keep) if kept]
+        origin, axis, part, reaches = origin[keep], axis[keep], part[keep], reaches[keep]
+        if not holes:
+            print("No bolt holes in {}".format(", ".join(self.assembly_parts)))
+            return []
+        diameter = np.array([hole["diameter"] for hole in holes])
+        start = np.array([hole["start"] for hole in holes])
+        end = np.array([hole["end"] for hole in holes])
+
+        # every hole against every other: j seen from the axis of i
+        cosine = axis @ axis.T
+        offsets = origin[None, :, :] - origin[:, None, :]
+        along = np.einsum("ijk,ik->ij", offsets, axis)
+        offset = np.linalg.norm(offsets - along[:, :, None] * axis[:, None, :], axis=2)
+        first, last = along + cosine * start[None, :], along + cosine * end[None, :]
+        touching = np.minimum(np.maximum(first, last), end[:, None]) >= \
+            np.maximum(np.minimum(first, last), start[:, None])
+        coaxial = (np.abs(cosine) > math.cos(math.radians(1))) & (offset < np.maximum.outer(diameter, diameter))
+
+        # the same hole cut twice into a part is one hole
+        same = coaxial & (offset <= self.bolt_hole_tolerance) & (part[:, None] == part[None, :]) & \
+            (np.abs(diameter[:, None] - diameter[None, :]) <= self.bolt_hole_tolerance)
+        unique = ~np.triu(same, 1).any(axis=0)
+        for i in np.flatnonzero(unique):
+            copies = np.flatnonzero(same[i])
+            holes[i].update(start=float(start[copies].min()), end=float(end[copies].max()))
+
+        # the nearest first, each hole gets at most one pair in each other part
+        candidates = coaxial & touching & (part[:, None] < part[None, :]) & unique[:, None] & unique[None, :]
+        pairs = []
+        paired = set()
+        for i, j in sorted(zip(*np.nonzero(candidates)), key=lambda pair: offset[pair]):
+            if (i, part[j]) in paired or (j, part[i]) in paired:
+                continue
+            paired.update(((i, part[j]), (j, part[i])))
+            pairs.append((i, j))
+
+        problems = []
+        for i, j in pairs:
+            a, b = holes[i], holes[j]
+            where = "{} in {} and {} in {}, at ({:.1f}, {:.1f}, {:.1f})".format(
+                a["made_by"], a["part"], b["made_by"], b["part"], *a["origin"])
+            if offset[i, j] > self.bolt_hole_tolerance:
+                problems.append(dict(kind="misaligned", holes=[a, b], offset=float(offset[i, j]),
+                                     text="{} holes {:.2f} mm apart: {}".format(a["size"], offset[i, j], where)))
+            if abs(a["diameter"] - b["diameter"]) > self.bolt_hole_tolerance:
+                problems.append(dict(kind="sizes differ", holes=[a, b],
+                                     text="{:.2f} mm ({}) and {:.2f} mm ({}) holes: {}".format(
+                                         a["diameter"], a["size"], b["diameter"], b["size"], where)))
+        made_for = collections.defaultdict(set)  # the parts each hole making method made holes for
+        for i, hole in enumerate(holes):
+            made_for[hole["made_by"]].add(part[i])
+        for i in np.flatnonzero(unique):
+            hole = holes[i]
+            for other in sorted(made_for[hole["made_by"]] - {part[i]}):
+                if reaches[i, other] and (i, other) not in paired:
+                    problems.append(dict(kind="no pair", holes=[hole], other_part=names[other],
+                                         text="{} hole of {} in {} at ({:.1f}, {:.1f}, {:.1f}) has no pair in {}".format(
+                                             hole["size"], hole["made_by"], hole["part"], *hole["origin"],
+                                             names[other])))
+
+        with atomic_file(self.output_path("bolt_holes.json")) as f:
+            json.dump(dict(holes=[holes[i] for i in np.flatnonzero(unique)], problems=problems,
+                           pairs=[dict(holes=[holes[i]["part"], holes[j]["part"]], made_by=holes[i]["made_by"],
+                                       origin=holes[i]["origin"], offset=float(offset[i, j])) for i, j in pairs]),
+                      f, indent=1, sort_keys=True)
+        print("Checked {} bolt holes in {} parts: {} pairs, {} problems".format(
+            int(unique.sum()), len(set(part.tolist())), len(pairs), len(problems)))
+        for problem in problems:
+            print("BOLT HOLES: " + problem["text"])
+        return problems
+
+    # the registered holes cut out of obj, where they are in obj
+    @staticmethod
+    def placed_holes(part_index, part_name, obj, registered):
+        by_node = dict((id(hole["node"]), hole) for hole in registered)
+        # the nodes with a hole under them, the rest of the tree is not looked at
+        with_holes = set()
+        done = set()
+        stack = [(obj, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if id(node) in done:
+                continue
+            if not children_done:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.children if id(child) not in done)
+                continue
+            done.add(id(node))
+            if id(node) in by_node or any(id(child) in with_holes for child in node.children):
+                with_holes.add(id(node))
+
+        placed = []
+        stack = [(obj, np.eye(4), False)] if id(obj) in with_holes else []
+        while stack:
+            node, matrix, cut = stack.pop()
+            hole = by_node.get(id(node))
+            if hole is not None:
+                if cut:
+                    axis = matrix[:3, :3] @ (0, 0, 1)
+                    length = np.linalg.norm(axis)
+                    radial = math.sqrt(abs(np.linalg.det(matrix[:3, :3])) / length)
+                    placed.append(dict(part=part_name, part_index=part_index, made_by=hole["made_by"], size=hole["size"],
+                                       diameter=hole["diameter"] * radial, origin=matrix[:3, 3].tolist(),
+                                       axis=(axis / length).tolist(), start=hole["start"] * length,
+                                       end=hole["end"] * length))
+                continue
+            if node.name in Symmetry.transforms:
+                matrix = matrix @ CsgEvaluator.matrix(node)
+            elif node.name not in ("union", "difference", "intersection"):
+                continue  # not in hulls or 2d shapes
+            for i, child in enumerate(node.children):
+                if id(child) in with_holes:
+                    stack.append((child, matrix, cut != (node.name == "difference" and i > 0)))
+        return placed
+
+    ##################################################################
+    # The fits of the parts that go into each other, from the values
+    # the parts are made with: hole is the width of the hole or the
+    # slot and shaft the width of what goes into it, in mm as they
+    # are in the model.  The bolts and nuts (fasteners) are bought,
+    # not printed.  kind picks the fit_limits of the fit.
+    ##################################################################
+    def fits(self):
+        fits = []
+        for table in ("bolt_sizes", "round_bolt_sizes"):
+            for size, data in sorted(getattr(self.tools, table).items()):
+                fastener = self.fasteners.get(size, dict())
+                if "bolt" in fastener:
+                    fits.append(dict(name="{} {} bolt".format(table, size), kind="bolt", hole=data["bolt"],
+                                     shaft=fastener["bolt"], shaft_printed=False))
+                if "nut" in fastener and table == "bolt_sizes":
+                    # the pocket is a hexagon with its corners on the circle of d=nut
+                    fits.append(dict(name="{} {} nut".format(table, size), kind="nut",
+                                     hole=data["nut"] * math.cos(math.pi / 6), shaft=fastener["nut"],
+                                     shaft_printed=False))
+                if "flat" in fastener and "flat" in data:
+                    fits.append(dict(name="{} {} nut slot".format(table, size), kind="nut", hole=data["flat"],
+                                     shaft=fastener["flat"], shaft_printed=False))
+        # the slider of the plates in the groove of the c_form (c_form_groove), on its inside and its outside
+        fits.append(dict(name="inner_slider inside", kind="slide", hole=142 + self.inner_slider_clearance, shaft=142,
+                         shaft_printed=True))
+        fits.append(dict(name="inner_slider outside", kind="slide", hole=168, shaft=168 - self.inner_slider_clearance,
+                         shaft_printed=True))
+        # the top bearing holder, across its tabs, in the cutout of the c_form and the top bearing back plate
+        width = self.top_bearing_holder_width + 2 * self.top_bearing_tab_depth
+        fits.append(dict(name="top_bearing_holder", kind="fit", hole=width + 2 * self.top_bearing_body_gap,
+                         shaft=width, shaft_printed=True))
+        # the table slider attachment between the slides of the table slider holder panel
+        fits.append(dict(name="table_holder_slide", kind="slide",
+                         hole=self.table_vertical_plate_width + 2 * self.table_slide_clearance,
+                         shaft=self.table_vertical_plate_width, shaft_printed=True))
+        # the miter bar in the slot of the table top (table_top_miter_bar_maker)
+        fits.append(dict(name="table_top_miter_bar", kind="slide", hole=self.table_guide_slot_width + 2,
+                         shaft=self.table_guide_slot_width + 2 - self.table_miter_bar_clearance, shaft_printed=True))
+        # the tongue of the fence attachments in the slot of the table top (fence_bar_slot_maker), both taper
+        # and it is tightest at the tip of the tongue
+        depth = self.fence_guide_depth - self.fence_bar_slot_clearance
+        fits.append(dict(name="fence_bar_slot", kind="fit", hole=3 * self.fence_guide_depth - 2 * depth, shaft=depth,
+                         shaft_printed=True))
+        return fits
+
+    ##################################################################
+    # Monte Carlo over the fits: samples builds printed on one of the
+    # printers, every printed hole and shaft of every build off by
+    # errors of its own, and counts the builds in which each fit
+    # binds or is too loose (fit_limits).  The clearance of a fit is
+    # the hole less the shaft, all the builds at once; nothing is
+    # built or meshed.  Writes tolerances.json.
+    # Returns the report of each fit.
+    ##################################################################
+    def tolerance_stackup(self, printer=None, samples=None, seed=0):
+        printer = printer or self.tolerance_printer
+        if printer not in self.printers:
+            raise ValueError("no printer {}, there are {}".format(printer, ", ".join(sorted(self.printers))))
+        errors = self.printers[printer]
+        samples = samples or self.tolerance_samples
+        fits = self.fits()
+        rng = np.random.default_rng(seed)
+        shape = (len(fits), samples)
+
+        def error(kind):
+            return rng.normal(*errors[kind], size=shape)
+
+        hole = np.array([fit["hole"] for fit in fits])[:, None]
+        shaft = np.array([fit["shaft"] for fit in fits])[:, None]
+        printed = np.array([fit["shaft_printed"] for fit in fits])[:, None]
+        tight, loose = np.array([self.fit_limits[fit["kind"]] for fit in fits]).T[:, :, None]
+        hole = hole * (1 + error("scale")) + error("inside")
+        shaft = np.where(printed, shaft * (1 + error("scale")) + error("outside"), shaft)
+        clearance = hole - shaft
+        binds = clearance < tight
+        too_loose = clearance > loose
+        low, middle, high = np.percentile(clearance, (2.5, 50, 97.5), axis=1)
+
+        report = []
+        print("{} builds printed in {}".format(samples, printer))
+        print("{:<30} {:>9} {:>9} {:>15} {:>8} {:>8}".format("fit", "clearance", "printed", "95% between",
+                                                              "binds", "loose"))
+        for i, fit in enumerate(fits):
+            report.append(dict(fit, clearance=fit["hole"] - fit["shaft"], printed=float(middle[i]),
+                               between=[float(low[i]), float(high[i])], limits=list(self.fit_limits[fit["kind"]]),
+                               binds=float(binds[i].mean()), too_loose=float(too_loose[i].mean())))
+            print("{name:<30} {clearance:9.2f} {printed:9.2f} {between[0]:7.2f}..{between[1]:<6.2f} "
+                  "{binds:8.2%} {too_loose:8.2%}".format(**report[-1]))
+        any_binds = float(binds.any(axis=0).mean())
+        any_too_loose = float(too_loose.any(axis=0).mean())
+        with atomic_file(self.output_path("tolerances.json")) as f:
+            json.dump(dict(printer=printer, errors=errors, samples=samples, fits=report, binds=any_binds,
+                           too_loose=any_too_loose), f, indent=1, sort_keys=True)
+        print("{:.2%} of the builds have a fit that binds, {:.2%} one that is too loose".format(
+            any_binds, any_too_loose))
+        return report
+
     def full_assembly(self):
         name = "full_assembly"
         rotation = 0
@@ -567,12 +3891,57 @@ class BandSaw:
     # the object to be rendered, the name of the object, and the stl file name.  The object is rendered individually   #
     #                                                                                                                  #
     ####################################################################################################################
-    def render_all(self):
+    def render_all(self, resume=False, parts=None):
+        if self.stl_format not in ("ascii", "binary"):
+            raise ValueError("stl_format has to be ascii or binary, not {}".format(self.stl_format))
+        self.update_parameters()  # for values changed in place since
+        self._outputs = []
+        self._manifest = dict()
+        self._previous_manifest = self.load_manifest(self.output_path("manifest.json"))
+        self._remeshing = set()
+        self._structures = dict()
+        self._shapes = dict()
+        self._checked = set()
+        self.stl_runner.failed_files = set()
+        self.remove_partial_files()
+        self.start_journal(resume)
+        try:
+            # the stl files are made at the end, as many at a time as fit in memory
+            with self.stl_runner.batch():
+                self.render_parts(parts)
+            if parts is not None:
+                # only some of the parts were rendered, the others are still what the last run made
+                for name, entry in self._previous_manifest.get("outputs", dict()).items():
+                    self._manifest.setdefault(name, entry)
+            problems = []
+            if self.make_stl:
+                problems = self.check_meshes()
+                self.write_plates()
+            if self.make_previews:
+                self.write_previews()
+            self.print_build_summary()
+            self.print_duplicates()
+            self.write_manifest()
+            self.journal("finished")
+        finally:
+            self._journal.close()
+            self._journal = None
+        if problems:
+            raise MeshError("{} broken meshes, see {}".format(len(problems), self.output_path("mesh_report.json")))
+
+    # parts is a list of the names of the parts to render, None renders them all
+    def render_parts(self, parts=None):
         for part in self.parts:
 
             func = part[0]
             stl = part[1]
-            result = func()
+            if parts is not None and func.__name__ not in parts:
+                continue
+            # the meshes that were made while the last part was built are checked now
+            self.stl_runner.poll()
+            start = time.perf_counter()
+            result = self.build_part(func)
+            self._current_part = dict(part=func.__name__, generation_seconds=time.perf_counter() - start)
             obj = result[0]
             name = result[1]
             if len(result) == 3:
@@ -584,7 +3953,9 @@ class BandSaw:
                 continue
 
             # If the object name is not __SEGMENTS__ then render it individually
-            if name != "__SEGMENTS__":
+            if name == "__SPLIT__":
+                self.render_split(obj, stl)
+            elif name != "__SEGMENTS__":
                 self.render(obj, name, stl)
             else:
                 # If the object name is __SEGMENTS__ then render each segment individually
@@ -594,6 +3965,18 @@ class BandSaw:
                     sub_stl = segment["stl"]
                     self.render(sub_obj, sub_name, sub_stl)
 
+    # a part is only built again when the parameters changed.  make_stl is in the key, the parts that
+    # are cut up import the stl of the whole part instead of building it (see split_parent)
+    def build_part(self, func):
+        key = (func.__name__, self.params, self.make_stl)
+        if self._part_cache is not None and key in self._part_cache:
+            return self._part_cache[key]
+        with self.generating(func.__name__):
+            result = func()
+        if self._part_cache is not None:
+            self._part_cache[key] = result
+        return result
+
     ##################################################################
     # Make the file path templates for the scad and stl files
     ##################################################################
@@ -610,25 +3993,932 @@ class BandSaw:
 
     ##################################################################
     def render(self, obj, name, stl):
+        # the stl files this one imports are rendered first
+        depends_on = []
+        if self.make_stl:
+            for parent in self.split_parents_in(obj):
+                if not parent["rendered"]:
+                    parent["rendered"] = True
+                    self.render(parent["obj"], parent["name"], True)
+                depends_on.append(self.make_file_path_templates(parent["name"])[1])
+
+        # the same shape importing the same files is the same stl
+        structural_hash = obj.structural_hash()
+        imports = self.imports_in(obj)
+        inputs = self.input_hashes(imports) if self.make_stl and stl else dict()
+        original = self._structures.setdefault((structural_hash, tuple(sorted(inputs.items()))),
+                                               dict(name=name, stl_file=None, job=None))
+        if original["name"] == name and (original["stl_file"] or not (self.make_stl and stl)) and \
+                name in self._manifest:
+            print("{} was already rendered".format(name))
+            return original["job"]
+
         output_scad_file, output_stl_file = self.make_file_path_templates(name)
         print("Rendering {} to {}".format(name, output_scad_file))
-        scad_render_to_file(obj, output_scad_file, include_orig_code=False)
+        start = time.perf_counter()
+        # the same shape is not written again while the file is the one this model wrote
+        written = self._scad_written.get(output_scad_file)
+        if written and written[0] == structural_hash and os.path.isfile(output_scad_file) and \
+                os.stat(output_scad_file).st_mtime_ns == written[1]:
+            self.record_output(output_scad_file, "scad", 0, "unchanged")
+        else:
+            self.scad_writer.write(obj, output_scad_file)
+            self._scad_written[output_scad_file] = (structural_hash, os.stat(output_scad_file).st_mtime_ns)
+            self.record_output(output_scad_file, "scad", time.perf_counter() - start)
+        seconds = time.perf_counter() - start
+
+        # a part can be rendered more than once (c_form, and the mesh of c_form_250), the stl entries stay
+        entry = self._manifest.setdefault(name, dict())
+        entry.update(self._current_part or dict(part=name))
+        entry.update(fingerprint=self.params.fingerprint(), resolution=self.resolution_mode(), backend="openscad",
+                     scad_file=os.path.basename(output_scad_file), scad_sha1=self.file_sha1(output_scad_file),
+                     scad_bytes=os.path.getsize(output_scad_file), serialization_seconds=seconds,
+                     imports=imports, structural_hash=structural_hash)
+        entry.pop("duplicate_of", None)
         if self.make_stl and stl:
-            # assuming that we cleared out the files before the run
-            # check to see if the stl file exists
-            if not os.path.isfile(output_stl_file):
-                self.make_stl_file_command(output_scad_file, output_stl_file)
+            entry.update(stl_file=os.path.basename(output_stl_file), stl_format=self.stl_format, inputs=inputs)
+        if original["name"] != name:
+            entry["duplicate_of"] = original["name"]
+            if self.make_stl and stl and original["stl_file"]:
+                return self.link_duplicate(name, output_stl_file, original)
+        if self.make_stl and stl:
+            original.update(name=name, stl_file=output_stl_file)
+            plan = self.symmetric_plan(name, obj, inputs, output_stl_file) if self.symmetric_meshing else None
+            if self.can_reuse_stl(name, entry, output_stl_file):
+                print("{} has not changed since the last run, keeping {}".format(name, output_stl_file))
+                self.record_output(output_stl_file, "kept", 0, "unchanged since the last run")
+                return None
+            self._remeshing.add(output_stl_file)
+            partial_stl_file = output_stl_file[:-len(".stl")] + ".partial.stl"  # OpenSCAD goes by the extension
+            if plan:
+                return self.render_symmetric(plan, name, output_scad_file, output_stl_file, partial_stl_file,
+                                             depends_on)
+            command = self.make_stl_file_command(output_scad_file, partial_stl_file)
+            if self._render_farm:
+                command = self._render_farm.make
+            job = StlJob(name, self.resolution_mode(), command, output_scad_file, output_stl_file, depends_on,
+                         partial_stl_file)
+            if self._render_farm:
+                job.imports = [self.output_path(file_name) for file_name in imports]
+                job.remote = True
+                job.key += ":farm"
+            job.after.append(self.stl_made)  # before it is submitted, submit() can wait for jobs to finish
+            job = self.stl_runner.submit(job)
+            original["job"] = job
+            return job
+        return None
+
+    ##################################################################
+    # Outputs that are made of copies of one shape (see Symmetry) only
+    # mesh that shape, the rest is done to the mesh with numpy in a job
+    # of the stl_runner, so it waits for the mesh it starts from:
+    #   moved:    the output is another output moved or mirrored, its
+    #             mesh is the mesh of the other output moved.
+    #   mirrored: only one of each mirrored pair is meshed, as
+    #             name_half.stl, and stitched to its mirror image.
+    #   copies:   the shape is meshed once, as name_shape.stl, and
+    #             copied to where the copies are.
+    # When the copies turn out to touch or the half crosses the mirror
+    # the job meshes the whole output with OpenSCAD after all.
+    ##################################################################
+    def symmetric_plan(self, name, obj, inputs, stl_file):
+        matrix, shape = Symmetry.transform_of(obj)
+        key = (shape.structural_hash(), tuple(sorted(inputs.items())))
+        source = self._shapes.get(key)
+        if source is not None and source["name"] != name and abs(np.linalg.det(source["matrix"])) > 1e-9:
+            return dict(kind="moved", source=source, matrix=matrix @ np.linalg.inv(source["matrix"]))
+        self._shapes[key] = dict(name=name, matrix=matrix, stl_file=stl_file)
+        mirrored = Symmetry.mirror_half(shape)
+        if mirrored:
+            return dict(kind="mirrored", shape=mirrored[0], reflection=mirrored[1], matrix=matrix)
+        copies = Symmetry.copies(shape)
+        if copies:
+            return dict(kind="copies", shape=copies[0], matrices=copies[1], matrix=matrix)
+        return None
+
+    def render_symmetric(self, plan, name, scad_file, stl_file, partial_stl_file, depends_on):
+        if plan["kind"] == "moved":
+            source_name = plan["source"]["name"]
+            source_file = plan["source"]["stl_file"]
+        else:
+            source_name = name + ("_half" if plan["kind"] == "mirrored" else "_shape")
+            self.render(plan["shape"], source_name, True)
+            source_file = self.make_file_path_templates(source_name)[1]
+
+        def make(job):
+            triangles = MeshFiles.read_stl(source_file)
+            if len(triangles) == 0:
+                print("{} is empty, can not make {} from it".format(source_file, stl_file))
+                return 1
+            if plan["kind"] == "mirrored":
+                triangles = MeshFiles.mirror_stitch(triangles, plan["reflection"])
+            elif plan["kind"] == "copies":
+                triangles = MeshFiles.place_copies(triangles, plan["matrices"])
+            if triangles is None:
+                print("The half of {} crosses its mirror, meshing all of it".format(name) if plan["kind"] == "mirrored"
+                      else "The copies in {} touch, meshing all of it".format(name))
+                job.made_by = "meshed"
+                job.backend = "openscad"
+                return subprocess.call(self.make_stl_file_command(scad_file, job.output_file))
+            MeshFiles.write_stl(job.output_file, MeshFiles.transform(triangles, plan["matrix"]))
+            return 0
+
+        job = StlJob(name, self.resolution_mode(), make, scad_file, stl_file, depends_on + [source_file],
+                     partial_stl_file)
+        job.key += ":" + plan["kind"]  # so the estimates of meshing it with OpenSCAD stay
+        job.made_by = "{} from {}".format(plan["kind"], source_name)
+        job.backend = "numpy"
+        job.after.append(self.stl_made)
+        return self.stl_runner.submit(job)
 
     ##################################################################
-    # Run the stl converter.
+    # Two outputs with the same structural hash (see CsgNode) are the
+    # same shape, so only the first is meshed and the stl of the other
+    # is a hard link to it, or a copy where links do not work.  The
+    # duplicates are listed at the end of render_all so the parts that
+    # make them can be cleaned up.
+    ##################################################################
+    def link_duplicate(self, name, stl_file, original):
+        print("{} is the same shape as {}, its stl is not made again".format(name, original["name"]))
+        job = original["job"]
+        if job is not None and not job.finished:
+            job.after.append(lambda job: self.link_stl(original["stl_file"], stl_file))
+        elif original["stl_file"] in self.stl_runner.failed_files:
+            self.stl_runner.failed_files.add(stl_file)
+        else:
+            self.link_stl(original["stl_file"], stl_file)
+        return job
+
+    def link_stl(self, source, target):
+        if not os.path.exists(target) or not os.path.samefile(source, target):
+            partial = target + ".partial"
+            if os.path.exists(partial):
+                os.remove(partial)
+            try:
+                os.link(source, partial)
+                how = "linked to"
+            except OSError:
+                shutil.copyfile(source, partial)
+                how = "copied from"
+            os.replace(partial, target)
+        else:
+            how = "already linked to"
+        self.record_output(target, "linked", 0, "{} {}".format(how, os.path.basename(source)))
+
+    def print_duplicates(self):
+        duplicates = dict()
+        for name, entry in sorted(self._manifest.items()):
+            if entry.get("duplicate_of"):
+                duplicates.setdefault(entry["duplicate_of"], []).append(name)
+        repeated = []
+        for list_name in ("parts", "parts2"):
+            listed = collections.Counter(part[0].__name__ for part in getattr(self, list_name, []))
+            repeated.extend((list_name, part, count) for part, count in sorted(listed.items()) if count > 1)
+        if not duplicates and not repeated:
+            return
+        print("Duplicates that could be cleaned up:")
+        for original, names in sorted(duplicates.items()):
+            print("  {} are the same shape as {}".format(", ".join(names), original))
+        for list_name, part, count in repeated:
+            print("  {} is in the {} list {} times".format(part, list_name, count))
+
+    # The stl of the last run is kept if it was made from the same scad, imported the same files, and is
+    # still the file it was then.  A file imported from one that is made again in this run is made again.
+    def can_reuse_stl(self, name, entry, stl_file):
+        previous = self._previous_manifest.get("outputs", dict()).get(name)
+        if not previous or stl_file in self._remeshing or not os.path.isfile(stl_file) or previous.get("mesh_problem"):
+            return False
+        if any(previous.get(key) != entry[key] for key in ("scad_sha1", "stl_format", "inputs")):
+            return False
+        if previous.get("stl_sha1") != self.file_sha1(stl_file):
+            return False
+        for key in ("stl_sha1", "stl_bytes", "meshing_seconds", "conversion_seconds", "mesh", "mesh_problem"):
+            if key in previous:
+                entry[key] = previous[key]
+        entry["stl_reused"] = True
+        return True
+
+    # the sha1 of each file of the output directory that is imported, None if it is missing or being made again
+    def input_hashes(self, files):
+        hashes = dict()
+        for file_name in files:
+            path = self.output_path(file_name)
+            if path in self._remeshing or not os.path.isfile(path):
+                hashes[file_name] = None
+            else:
+                hashes[file_name] = self.file_sha1(path)
+        return hashes
+
+    @staticmethod
+    def file_sha1(path, chunk_size=1 << 20):
+        sha1 = hashlib.sha1()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                sha1.update(chunk)
+        return sha1.hexdigest()
+
+    # called by the stl_runner as soon as OpenSCAD made the stl
+    def stl_made(self, job):
+        self._remeshing.discard(job.stl_file)  # it is made, the files that import it are made from this one
+        entry = self._manifest.get(job.name, dict())
+        entry.update(meshing_seconds=job.wall_seconds, conversion_seconds=0, made_by=job.made_by,
+                     backend=job.backend)
+        entry["inputs"] = self.input_hashes(entry.get("imports", ()))  # the imported files are made by now
+        ascii_bytes = os.path.getsize(job.stl_file)
+        seconds = job.wall_seconds
+        detail = "{} in {:.1f}s".format(job.made_by, job.wall_seconds)
+        if self.stl_format == "binary" and not MeshFiles.is_binary_stl(job.stl_file):
+            start = time.perf_counter()
+            try:
+                MeshFiles.make_binary(job.stl_file)
+            except (ValueError, OSError) as e:
+                print("Could not make {} binary, keeping the ascii file: {}".format(job.stl_file, e))
+            else:
+                convert_seconds = time.perf_counter() - start
+                entry["conversion_seconds"] = convert_seconds
+                seconds += convert_seconds
+                detail += ", {} ascii made binary in {:.1f}s".format(self.format_size(ascii_bytes), convert_seconds)
+        self.record_output(job.stl_file, "stl", seconds, detail)
+        entry.update(stl_sha1=self.file_sha1(job.stl_file), stl_bytes=os.path.getsize(job.stl_file))
+        self.check_mesh(job.name, job.stl_file)
+        self.journal("made", name=job.name, entry=entry)
+
+    ##################################################################
+    # The run journal, journal.jsonl, gets a line for every stl as soon
+    # as it is made.  The manifest is only written at the end of a run,
+    # so when a run is killed the journal is the only record of the
+    # stl files it did make.  render_all(resume=True) (--resume) keeps
+    # those the same way it keeps the ones in the manifest, when they
+    # were made from the same scad and still have the same hash, so
+    # only the unfinished jobs run again.  Half written files are only
+    # ever .partial files, and those are removed before a run.
+    ##################################################################
+    def start_journal(self, resume):
+        path = self.output_path("journal.jsonl")
+        if resume:
+            made = self.read_journal(path)
+            print("Resuming the last run, {} stl files were made before it stopped".format(len(made)))
+            self._previous_manifest.setdefault("outputs", dict()).update(made)
+        self._journal = open(path, "a" if resume else "w")
+        self.journal("started", resume=resume, fingerprint=self.params.fingerprint(), resolution=self.resolution_mode())
+
+    def journal(self, event, **values):
+        if self._journal is not None:
+            self._journal.write(json.dumps(dict(values, event=event, time=time.time()), sort_keys=True) + "\n")
+            self._journal.flush()
+
+    # the manifest entries of the stl files made since the last run that finished
+    @staticmethod
+    def read_journal(path):
+        made = dict()
+        if not os.path.isfile(path):
+            return made
+        with open(path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # the last line of a run that was killed can be cut off
+                if record["event"] == "finished":
+                    made = dict()
+                elif record["event"] == "made":
+                    made[record["name"]] = record["entry"]
+        return made
+
+    def remove_partial_files(self):
+        directory = self.output_path("")
+        for file_name in os.listdir(directory):
+            if file_name.endswith(".partial") or file_name.endswith(".partial.stl"):
+                print("Removing {}, it was left by a run that did not finish".format(file_name))
+                os.remove(os.path.join(directory, file_name))
+
+    def record_output(self, path, kind, seconds, detail=""):
+        self._outputs.append(dict(file=path, kind=kind, bytes=os.path.getsize(path), seconds=seconds, detail=detail))
+
+    @staticmethod
+    def format_size(size):
+        for unit in ("B", "KB", "MB"):
+            if size < 1024:
+                return "{:.0f} {}".format(size, unit) if unit == "B" else "{:.1f} {}".format(size, unit)
+            size /= 1024.0
+        return "{:.1f} GB".format(size)
+
+    def print_build_summary(self):
+        if not self._outputs:
+            return
+        print("Build summary:")
+        totals = dict()
+        for output in self._outputs:
+            print("  {:<6} {:<50} {:>10} {:>8.2f}s  {}".format(
+                output["kind"], os.path.basename(output["file"]), self.format_size(output["bytes"]),
+                output["seconds"], output["detail"]).rstrip())
+            total = totals.setdefault(output["kind"], [0, 0, 0])
+            total[0] += 1
+            total[1] += output["bytes"]
+            total[2] += output["seconds"]
+        for kind, (count, size, seconds) in totals.items():
+            print("  {} {} files, {} written in {:.1f}s".format(count, kind, self.format_size(size), seconds))
+
+    ##################################################################
+    # Every render_all writes manifest.json next to the files it made:
+    # for every output the part that made it, the fingerprint of the
+    # parameters, the resolution, how it was meshed, the hashes and
+    # sizes of the scad and stl files, how long each step took and the
+    # mesh stats.  The next run keeps an stl when its manifest entry
+    # says it was made from the same scad (see can_reuse_stl), and the
+    # two manifests tell what a change did.
+    ##################################################################
+    def write_manifest(self):
+        path = self.output_path("manifest.json")
+        manifest = dict(created=time.strftime("%Y-%m-%dT%H:%M:%S"), fingerprint=self.params.fingerprint(),
+                        resolution=self.resolution_mode(), production=self.production, make_stl=self.make_stl,
+                        parameters=BandSawParameters.flatten(self), outputs=self._manifest)
+        if self._previous_manifest:
+            self.print_manifest_changes(self.compare_manifests(self._previous_manifest, manifest))
+        with atomic_file(path) as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        return manifest
+
+    @staticmethod
+    def load_manifest(path):
+        if not os.path.isfile(path):
+            return dict()
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except ValueError:
+            print("Ignoring the broken manifest {}".format(path))
+            return dict()
+
+    # the outputs that were added, removed, changed (their scad or stl is not the same) or kept
+    @staticmethod
+    def compare_manifests(old, new):
+        old_outputs, new_outputs = old.get("outputs", dict()), new.get("outputs", dict())
+        changes = dict(added=sorted(set(new_outputs) - set(old_outputs)),
+                       removed=sorted(set(old_outputs) - set(new_outputs)), changed=[], unchanged=[])
+        for name in sorted(set(old_outputs) & set(new_outputs)):
+            same = all(old_outputs[name].get(key) == new_outputs[name].get(key) for key in ("scad_sha1", "stl_sha1"))
+            changes["unchanged" if same else "changed"].append(name)
+        return changes
+
+    @staticmethod
+    def print_manifest_changes(changes):
+        print("Since the last run: {} changed, {} unchanged, {} added, {} removed".format(
+            len(changes["changed"]), len(changes["unchanged"]), len(changes["added"]), len(changes["removed"])))
+        for kind in ("changed", "added", "removed"):
+            if changes[kind]:
+                print("  {}: {}".format(kind, ", ".join(changes[kind])))
+
+    # a file in the directory the scad and stl files go to
+    def output_path(self, file_name):
+        return os.path.join(self.production_output_directory if self.production else self.output_directory, file_name)
+
+    ##################################################################
+    # Check every stl file this run made before it goes to the
+    # printer: an empty stl (OpenSCAD failed half way) or a mesh that
+    # is not closed is a problem.  Each mesh is checked as soon as it
+    # is made (check_mesh), check_meshes checks the rest at the end,
+    # writes the stats of every mesh to mesh_report.json and returns
+    # the problems found.
+    ##################################################################
+    def check_meshes(self):
+        report = dict()
+        problems = []
+        for output in self._outputs:
+            if output["kind"] not in ("stl", "kept"):
+                continue
+            name = os.path.splitext(os.path.basename(output["file"]))[0]
+            entry = self._manifest.setdefault(name, dict(part=name, stl_file=os.path.basename(output["file"])))
+            if output["kind"] == "kept" and "mesh" in entry:
+                continue  # checked when it was made
+            if name not in self._checked:
+                self.check_mesh(name, output["file"])
+            report[name] = dict(entry["mesh"], problem=entry["mesh_problem"])
+            if entry["mesh_problem"]:
+                problems.append("{} is {}".format(name, entry["mesh_problem"]))
+        for stl_file in sorted(self.stl_runner.failed_files):
+            problems.append("{} was not made".format(os.path.basename(stl_file)))
+        for entry in self._manifest.values():
+            original = self._manifest.get(entry.get("duplicate_of"), dict())
+            if "stl_file" in entry and "stl_sha1" in original:
+                entry.update((key, original[key]) for key in ("stl_sha1", "stl_bytes", "mesh", "mesh_problem")
+                             if key in original)
+        with atomic_file(self.output_path("mesh_report.json")) as f:
+            json.dump(report, f, indent=1, sort_keys=True)
+        print("Checked {} meshes, {} problems".format(len(report), len(problems)))
+        for problem in problems:
+            print("BROKEN: " + problem)
+        return problems
+
+    def check_mesh(self, name, stl_file):
+        entry = self._manifest.setdefault(name, dict(part=name, stl_file=os.path.basename(stl_file)))
+        stats = MeshFiles.stats(stl_file)
+        problem = self.mesh_problem(stats)
+        if "stl_sha1" not in entry:
+            entry["stl_sha1"] = self.file_sha1(stl_file)
+        entry.update(stl_bytes=os.path.getsize(stl_file), mesh=stats, mesh_problem=problem)
+        self._checked.add(name)
+        size = np.subtract(*stats["bounding_box"][::-1]) if stats["bounding_box"] else np.zeros(3)
+        print("  {:<50} {:>8} triangles {:>10.1f} cm3  {:>6.1f} x {:>6.1f} x {:>6.1f} mm  {}".format(
+            name, stats["triangles"], stats["volume"] / 1000, size[0], size[1], size[2], problem or "ok"))
+
+    @staticmethod
+    def mesh_problem(stats):
+        if stats["triangles"] == 0:
+            return "empty"
+        if stats["boundary_edges"]:
+            return "not closed, {} open edges".format(stats["boundary_edges"])
+        if stats["non_manifold_edges"]:
+            return "not manifold, {} edges in more than two triangles".format(stats["non_manifold_edges"])
+        if stats["flipped_edges"]:
+            return "not oriented, {} edges between triangles facing opposite ways".format(stats["flipped_edges"])
+        if stats["volume"] <= 0:
+            return "inside out"
+        return None
+
+    ##################################################################
+    # Put the stl files of each plate in self.plates into one 3mf file,
+    # next to each other so the plate can be printed in one go.
+    ##################################################################
+    def write_plates(self):
+        for plate in self.plates:
+            objects = []
+            for part in plate["parts"]:
+                stl_file = self.make_file_path_templates(part)[1]
+                if not os.path.isfile(stl_file) or stl_file in self.stl_runner.failed_files:
+                    print("Leaving {} off {}, there is no stl for it".format(part, plate["name"]))
+                    continue
+                triangles = MeshFiles.read_stl(stl_file)
+                if len(triangles) == 0:
+                    print("Leaving {} off {}, its stl is empty".format(part, plate["name"]))
+                    continue
+                objects.append((part, triangles))
+            if not objects:
+                continue
+            path = self.output_path("{}.3mf".format(plate["name"]))
+            start = time.perf_counter()
+            left_over = MeshFiles.write_3mf(path, objects, plate.get("size", (250, 250)))
+            for part in left_over:
+                print("{} does not fit on {}".format(part, plate["name"]))
+            self.record_output(path, "3mf", time.perf_counter() - start,
+                               "{} parts".format(len(objects) - len(left_over)))
+
+    ##################################################################
+    # A png of every output in previews/, and previews/index.html that
+    # shows them all, to see what a change did without opening every
+    # scad file.  OpenSCAD draws them from the scad files when it is
+    # there, otherwise (or when it can not draw, e.g. on a machine
+    # without a display) MeshPreview draws the stl.  A preview is only
+    # drawn again when the scad it shows changed, the manifest keeps the
+    # hash it was drawn from.  They are drawn stl_max_jobs at a time.
+    ##################################################################
+    def write_previews(self):
+        backend = self.preview_backend or ("openscad" if shutil.which(self.openscad_executable) else "numpy")
+        directory = self.output_path("previews")
+        previous = self._previous_manifest.get("outputs", dict())
+        todo = []
+        for name, entry in sorted(self._manifest.items()):
+            if "scad_sha1" not in entry:
+                continue  # a piece cut with numpy, it has no scad
+            view = self.preview_views.get(name, self.preview_views.get(entry.get("part"), "iso"))
+            stl_file = self.output_path(entry["stl_file"]) if "stl_file" in entry else None
+            if stl_file and (not os.path.isfile(stl_file) or stl_file in self.stl_runner.failed_files):
+                stl_file = None
+            if backend == "numpy" and stl_file is None:
+                continue
+            key = hashlib.sha1(json.dumps([entry["scad_sha1"], backend, self.preview_cameras[view],
+                                           self.preview_size]).encode()).hexdigest()
+            path = os.path.join(directory, name + ".png")
+            old = previous.get(name, dict()).get("preview")
+            if old and old.get("key") == key and os.path.isfile(path):
+                entry["preview"] = old
+                continue
+            todo.append((name, entry, view, key, path, stl_file))
+        if not todo and not any("preview" in entry for entry in self._manifest.values()):
+            print("No previews, there is no {} and no stl files to draw".format(self.openscad_executable))
+            return
+        os.makedirs(directory, exist_ok=True)
+
+        def draw(item):
+            name, entry, view, key, path, stl_file = item
+            return self.draw_preview(backend, self.output_path(entry["scad_file"]), stl_file, view, path)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.stl_max_jobs) as pool:
+            for (name, entry, view, key, path, stl_file), (used, seconds) in zip(todo, pool.map(draw, todo)):
+                if used is None:
+                    print("Could not draw a preview of {}".format(name))
+                    continue
+                entry["preview"] = dict(file="previews/{}.png".format(name), key=key, backend=used, view=view,
+                                        seconds=seconds)
+                self.record_output(path, "png", seconds, "{} view drawn by {}".format(view, used))
+        self.write_contact_sheet(directory)
+
+    # the backend that drew it (None if it could not be drawn) and how long it took
+    def draw_preview(self, backend, scad_file, stl_file, view, path):
+        start = time.perf_counter()
+        rotate = self.preview_cameras[view]
+        if backend == "openscad":
+            command = [self.openscad_executable, "-o", path, "--imgsize={},{}".format(*self.preview_size),
+                       "--camera=0,0,0,{},{},{},0".format(*rotate), "--viewall", "--autocenter", scad_file]
+            try:
+                returncode = subprocess.call(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            except OSError:
+                returncode = -1
+            if returncode == 0 and os.path.isfile(path):
+                return "openscad", time.perf_counter() - start
+            if stl_file is None:
+                return None, time.perf_counter() - start
+        MeshPreview.write_png(path, MeshPreview.draw(MeshFiles.read_stl(stl_file), rotate, self.preview_size))
+        return "numpy", time.perf_counter() - start
+
+    def write_contact_sheet(self, directory):
+        escape = xml.sax.saxutils.escape
+        cards = []
+        for name, entry in sorted(self._manifest.items()):
+            preview = entry.get("preview")
+            if not preview:
+                continue
+            lines = ["{} view, drawn by {}".format(preview["view"], preview["backend"])]
+            mesh = entry.get("mesh")
+            if mesh and mesh["bounding_box"]:
+                size = np.subtract(*mesh["bounding_box"][::-1])
+                lines.append("{} triangles, {:.1f} cm3, {:.0f} x {:.0f} x {:.0f} mm".format(
+                    mesh["triangles"], mesh["volume"] / 1000, size[0], size[1], size[2]))
+            if entry.get("mesh_problem"):
+                lines.append("BROKEN: " + entry["mesh_problem"])
+            links = " ".join('<a href="../{0}">{0}</a>'.format(escape(entry[key]))
+                             for key in ("scad_file", "stl_file") if key in entry)
+            cards.append('<figure{}><img src="{}.png" alt="{}"><figcaption><b>{}</b><br>{}<br>{}</figcaption></figure>'.format(
+                ' class="broken"' if entry.get("mesh_problem") else "", escape(name), escape(name), escape(name),
+                "<br>".join(escape(line) for line in lines), links))
+        path = os.path.join(directory, "index.html")
+        with atomic_file(path) as f:
+            f.write("<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>Band saw parts</title><style>\n"
+                    "body { font-family: sans-serif; }\n"
+                    "figure { display: inline-block; vertical-align: top; margin: 8px; width: %dpx; }\n"
+                    "figure img { border: 1px solid #ccc; }\n"
+                    "figure.broken img { border: 2px solid red; }\n"
+                    "figcaption { font-size: 12px; }\n"
+                    "</style></head><body>\n<h1>Band saw parts</h1>\n<p>%s, %s resolution, %d parts</p>\n"
+                    % (self.preview_size[0], time.strftime("%Y-%m-%d %H:%M"), self.resolution_mode(), len(cards)))
+            f.write("\n".join(cards))
+            f.write("\n</body></html>\n")
+        self.record_output(path, "html", 0, "{} previews".format(len(cards)))
+
+    ##################################################################
+    # What changed between two builds, e.g. after a change to
+    # tools.bolt_sizes: python BandSaw.py --diff OLD NEW, with the
+    # manifest.json or the output directory of each build.  Prints the
+    # parameters that changed and for every part whose scad or stl is
+    # not the same the lines of the scad that changed and how the mesh
+    # changed: its volume, its size, and the material added and removed
+    # (the two stl files compared on voxels, see MeshDiff), with a png
+    # of where in diff/.  Nothing is meshed, the parts are compared
+    # stl_max_jobs at a time.
+    ##################################################################
+    def diff(self, old, new, directory=None):
+        start = time.perf_counter()
+        builds = []
+        for path in (old, new):
+            base = path if os.path.isdir(path) else os.path.dirname(path)
+            manifest = self.load_manifest(os.path.join(path, "manifest.json") if os.path.isdir(path) else path)
+            if not manifest:
+                raise ValueError("there is no manifest in {}".format(path))
+            builds.append((base, manifest))
+        (old_base, old_manifest), (new_base, new_manifest) = builds
+        directory = directory or os.path.join(new_base, "diff")
+        os.makedirs(directory, exist_ok=True)
+        print("Comparing {} ({}) with {} ({})".format(old_base, old_manifest.get("created"), new_base,
+                                                      new_manifest.get("created")))
+
+        old_parameters, new_parameters = old_manifest.get("parameters"), new_manifest.get("parameters")
+        parameters = dict()
+        if old_parameters is None or new_parameters is None:
+            print("Parameters: not in both manifests, {} and {} fingerprints".format(
+                old_manifest.get("fingerprint"), new_manifest.get("fingerprint")))
+        else:
+            for key in sorted(set(old_parameters) | set(new_parameters)):
+                if old_parameters.get(key) != new_parameters.get(key):
+                    parameters[key] = [old_parameters.get(key), new_parameters.get(key)]
+            print("Parameters: {} changed".format(len(parameters)))
+            for key, (old_value, new_value) in parameters.items():
+                print("  {}: {} -> {}".format(key, old_value, new_value))
+
+        changes = self.compare_manifests(old_manifest, new_manifest)
+        self.print_manifest_changes(changes)
+        old_outputs, new_outputs = old_manifest.get("outputs", dict()), new_manifest.get("outputs", dict())
+        names = changes["changed"] + changes["added"] + changes["removed"]
+
+        def compare(name):
+            return self.diff_output(name, (old_base, old_outputs.get(name)), (new_base, new_outputs.get(name)),
+                                    directory)
+
+        report = dict(old=old_base, new=new_base, parameters=parameters, outputs=dict())
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.stl_max_jobs) as pool:
+            for name, (result, lines) in zip(names, pool.map(compare, names)):
+                report["outputs"][name] = result
+                for line in lines:
+                    print(line)
+        with atomic_file(os.path.join(directory, "diff.json")) as f:
+            json.dump(report, f, indent=1, sort_keys=True)
+        print("Compared {} outputs in {:.1f}s, see {}".format(len(names), time.perf_counter() - start, directory))
+        return report
+
+    # how one output changed, and the lines to print about it
+    def diff_output(self, name, old, new, directory):
+        result = dict()
+        notes = []
+        (old_base, old_entry), (new_base, new_entry) = old, new
+        old_entry, new_entry = old_entry or dict(), new_entry or dict()
+        for key in ("resolution", "stl_format", "inputs"):
+            if old_entry and new_entry and old_entry.get(key) != new_entry.get(key):
+                result[key] = [old_entry.get(key), new_entry.get(key)]
+                notes.append("{} changed".format(key) if key == "inputs" else
+                             "{} {} -> {}".format(key, old_entry.get(key), new_entry.get(key)))
+
+        lines = []
+        files = [os.path.join(base, entry["scad_file"]) if "scad_file" in entry else None
+                 for base, entry in ((old_base, old_entry), (new_base, new_entry))]
+        if old_entry.get("scad_sha1") != new_entry.get("scad_sha1") and all(files) and \
+                all(os.path.isfile(path) for path in files):
+            old_lines, new_lines = [open(path).read().splitlines(True) for path in files]
+            # only the part between what is the same at the start and the end goes to difflib
+            same = 0
+            while same < min(len(old_lines), len(new_lines)) and old_lines[same] == new_lines[same]:
+                same += 1
+            end = 0
+            while end < min(len(old_lines), len(new_lines)) - same and old_lines[-1 - end] == new_lines[-1 - end]:
+                end += 1
+            context = min(same, 3)
+            lines = list(difflib.unified_diff(old_lines[same - context:len(old_lines) - end],
+                                              new_lines[same - context:len(new_lines) - end],
+                                              os.path.basename(files[0]), os.path.basename(files[1]), n=context))
+            for i, line in enumerate(lines):
+                if line.startswith("@@ "):  # the line numbers of the hunk are in the part that was compared
+                    words = line.split(" ")
+                    for k in (1, 2):
+                        first, comma, count = words[k][1:].partition(",")
+                        words[k] = words[k][0] + str(int(first) + same - context) + comma + count
+                    lines[i] = " ".join(words)
+            added = sum(1 for line in lines if line.startswith("+") and not line.startswith("+++"))
+            removed = sum(1 for line in lines if line.startswith("-") and not line.startswith("---"))
+            result["scad"] = dict(added_lines=added, removed_lines=removed)
+            if lines:
+                with atomic_file(os.path.join(directory, name + ".scad.diff")) as f:
+                    f.writelines(lines)
+                result["scad"]["file"] = name + ".scad.diff"
+                notes.append("scad +{} -{} lines".format(added, removed))
+
+        meshes = []
+        for base, entry in ((old_base, old_entry), (new_base, new_entry)):
+            path = os.path.join(base, entry["stl_file"]) if "stl_file" in entry else None
+            meshes.append(MeshFiles.read_stl(path) if path and os.path.isfile(path) and entry.get("stl_sha1") else None)
+        if old_entry.get("stl_sha1") != new_entry.get("stl_sha1") and any(mesh is not None for mesh in meshes):
+            result["mesh"] = mesh = self.diff_meshes(*meshes, path=os.path.join(directory, name + ".png"))
+            notes.append("volume {:+.2f} cm3".format(mesh["volume_change"] / 1000))
+            if "added_volume" in mesh:
+                notes.append("{:+.2f} added, {:+.2f} removed".format(mesh["added_volume"] / 1000,
+                                                                     -mesh["removed_volume"] / 1000))
+            if "size_change" in mesh:
+                notes.append("size {:+.1f} x {:+.1f} x {:+.1f} mm".format(*mesh["size_change"]))
+            if "image" in mesh:
+                notes.append("see {}".format(mesh["image"]))
+        text = ["  {}: {}".format(name, ", ".join(notes) if notes else "the stl changed" if new_entry and old_entry
+                                  else "added" if new_entry else "removed")]
+        text.extend("    " + line.rstrip("\n") for line in lines[2:2 + self.diff_max_lines])
+        if len(lines) > 2 + self.diff_max_lines:
+            text.append("    ... {} more lines in {}".format(len(lines) - 2 - self.diff_max_lines, name + ".scad.diff"))
+        return result, text
+
+    # the volume, size and voxels of the two meshes, either can be None (the output was added or removed)
+    def diff_meshes(self, old, new, path):
+        boxes = []
+        volumes = []
+        for triangles in (old, new):
+            if triangles is None or len(triangles) == 0:
+                boxes.append(None)
+                volumes.append(0.0)
+                continue
+            vertices = triangles.reshape(-1, 3)
+            boxes.append((vertices.min(axis=0), vertices.max(axis=0)))
+            volumes.append(float(np.einsum("ij,ij->", triangles[:, 0], np.cross(triangles[:, 1], triangles[:, 2])) / 6))
+        result = dict(volume_change=volumes[1] - volumes[0], volumes=volumes)
+        if all(box is not None for box in boxes):
+            result["size_change"] = (np.subtract(*boxes[1][::-1]) - np.subtract(*boxes[0][::-1])).tolist()
+            result["bounding_boxes"] = [[box[0].tolist(), box[1].tolist()] for box in boxes]
+        if not any(box is not None for box in boxes):
+            return result
+        low, voxel, shape = MeshDiff.grid([box for box in boxes if box is not None], self.diff_voxel_size)
+        occupied = [MeshDiff.voxels(triangles, low, voxel, shape) if box is not None else np.zeros(shape, dtype=bool)
+                    for triangles, box in zip((old, new), boxes)]
+        result.update(voxel_size=voxel, added_volume=float((occupied[1] & ~occupied[0]).sum()) * voxel ** 3,
+                      removed_volume=float((occupied[0] & ~occupied[1]).sum()) * voxel ** 3)
+        image, layer = MeshDiff.heatmap(*occupied)
+        MeshPreview.write_png(path, image)
+        result.update(image=os.path.basename(path), layer_z=float(low[2] + (layer + 0.5) * voxel))
+        return result
+
+    ##################################################################
+    # Draft meshes without OpenSCAD, to look at a change in seconds:
+    # python BandSaw.py --draft [PART ...].  Each output is turned into
+    # voxels of draft_voxel_size mm straight from its tree (see
+    # CsgEvaluator) and written to draft/: name.stl, the faces of the
+    # voxels; name.png, a preview of that; name_slices.png, layers of
+    # it from the bottom to the top.  The parts are the names of part
+    # functions or of outputs, all of them when there are none.
+    ##################################################################
+    def draft(self, parts=None):
+        directory = self.output_path("draft")
+        os.makedirs(directory, exist_ok=True)
+        drafted = []
+        for part in self.parts:
+            func = part[0]
+            result = self.build_part(func)
+            obj, name = result[0], result[1]
+            if len(result) == 3:
+                obj = result[2]
+            if name == "__SEGMENTS__":
+                outputs = [(segment["name"], segment["obj"]) for segment in obj]
+            elif name == "__SPLIT__":
+                outputs = [(obj["name"], obj["obj"])]
+            else:
+                outputs = [(name, obj)]
+            for name, obj in outputs:
+                if parts and func.__name__ not in parts and name not in parts:
+                    continue
+                drafted.append(name)
+                self.draft_output(name, obj, directory)
+        print("Drafted {} outputs into {}".format(len(drafted), directory))
+        return drafted
+
+    def draft_output(self, name, obj, directory):
+        start = time.perf_counter()
+        evaluator = CsgEvaluator()
+        voxels = evaluator.voxels(obj, self.draft_voxel_size)
+        if voxels is None:
+            print("  {:<50} nothing to draft".format(name))
+            return
+        occupied, low, voxel = voxels
+        triangles = CsgEvaluator.surface(occupied, low, voxel)
+        MeshFiles.write_stl(os.path.join(directory, name + ".stl"), triangles)
+        view = self.preview_views.get(name, "iso")
+        MeshPreview.write_png(os.path.join(directory, name + ".png"),
+                              MeshPreview.draw(triangles, self.preview_cameras[view], self.preview_size))
+        image, heights = CsgEvaluator.slices(occupied, low, voxel, self.draft_slices)
+        MeshPreview.write_png(os.path.join(directory, name + "_slices.png"), image)
+        size = np.array(occupied.shape) * voxel
+        left_out = ", ".join("{} {}".format(count, kind) for kind, count in sorted(evaluator.left_out.items()))
+        print("  {:<50} {:>10.1f} cm3  {:>6.1f} x {:>6.1f} x {:>6.1f} mm  {:.1f} mm voxels {:>6.2f}s{}".format(
+            name, occupied.sum() * voxel ** 3 / 1000, size[0], size[1], size[2], voxel, time.perf_counter() - start,
+            "  without " + left_out if left_out else ""))
+
+    ##################################################################
+    # A part that is too big for the printer returns "__SPLIT__" as its
+    # name and a dict as its object:
+    #   obj:           the part, the way it lies on the printer
+    #   mesh_name:     the name of the stl of the whole part, it can be
+    #                  the stl of another part
+    #   name:          the pieces are name_part1.stl, name_part2.stl ...
+    #   build_volume:  the size of the printer
+    #   dowel_diameter, dowel_length: the holes for the dowels that
+    #                  line the pieces up, no holes without a diameter
+    # The part is meshed once, and as soon as its stl is made the mesh
+    # is cut into pieces that fit (see MeshSplitter).
+    ##################################################################
+    def render_split(self, split, stl):
+        job = self.render(split["obj"], split["mesh_name"], stl)
+        if not (self.make_stl and stl):
+            print("Not cutting {} into pieces, there is no stl to cut".format(split["name"]))
+        elif job is not None and not job.finished:
+            job.after.append(lambda job: self.split_stl(split))
+        elif os.path.isfile(self.make_file_path_templates(split["mesh_name"])[1]):
+            self.split_stl(split)
+
+    def split_stl(self, split):
+        stl_file = self.make_file_path_templates(split["mesh_name"])[1]
+        dowel_diameter = split.get("dowel_diameter")
+        dowel_length = split.get("dowel_length", 20)
+        splitter = MeshSplitter(split["build_volume"], dowel_diameter=dowel_diameter, dowel_length=dowel_length)
+        triangles = MeshFiles.read_stl(stl_file)
+        if len(triangles) == 0:
+            print("FAILED: {} is empty, there is nothing to cut".format(stl_file))
+            return
+        pieces = splitter.split(triangles)
+        print("Cut {} into {} pieces for a {} printer".format(
+            stl_file, len(pieces), "x".join("{:g}".format(size) for size in split["build_volume"])))
+
+        # the pieces with dowels get their holes from OpenSCAD, that only has to cut the piece
+        files = []
+        imported = []
+        for index, (triangles, dowels) in enumerate(pieces):
+            piece_name = "{}_part{}".format(split["name"], index + 1)
+            if not dowels:
+                files.append((self.make_file_path_templates(piece_name)[1], triangles))
+                continue
+            cut_name = piece_name + "_cut"
+            files.append((self.make_file_path_templates(cut_name)[1], triangles))
+            holes = [translate(position)(
+                rotate(((0, 90, 0), (-90, 0, 0), (0, 0, 0))[axis])(
+                    self.tools.cylinder(d=dowel_diameter, h=dowel_length + 2, center=True)))
+                for position, axis in dowels]
+            imported.append((import_(file="{}.stl".format(cut_name)) - union()(*holes), piece_name))
+
+        def write(file):
+            start = time.perf_counter()
+            MeshFiles.write_stl(*file)
+            return time.perf_counter() - start
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.stl_runner.max_jobs) as pool:
+            for (path, triangles), seconds in zip(files, pool.map(write, files)):
+                self.record_output(path, "stl", seconds, "cut from {}".format(os.path.basename(stl_file)))
+                self._manifest[os.path.splitext(os.path.basename(path))[0]] = dict(
+                    part=split["name"], fingerprint=self.params.fingerprint(), resolution=self.resolution_mode(),
+                    backend="numpy", stl_file=os.path.basename(path), meshing_seconds=seconds,
+                    cut_from=os.path.basename(stl_file))
+        # only now that the pieces are written, so their hashes are known.  This runs when the stl of the
+        # whole part is made, while another part is being built
+        current_part = self._current_part
+        self._current_part = dict(part=split["name"])
+        try:
+            for piece, piece_name in imported:
+                self.render(piece, piece_name, True)
+        finally:
+            self._current_part = current_part
+
+    ##################################################################
+    # Parts that are pieces of a bigger part (blade_protector_cover_top
+    # and _bottom are the cover cut in half) start from
+    # split_parent(name, func, args) instead of calling func themselves.
+    # The parent is built once and shared by all its pieces.  When we
+    # make stl files the parent is also meshed once: it is rendered to
+    # its own stl (name.stl) and the pieces import that stl and only cut
+    # it, instead of OpenSCAD building the whole parent for every piece.
+    ##################################################################
+    def split_parent(self, name, func, *args):
+        parent = self._split_parents.get(name)
+        if parent is None or parent["params"] != self.params:
+            parent = dict(name=name, obj=func(*args)[0], params=self.params, rendered=False)
+            self._split_parents[name] = parent
+        if self.make_stl:
+            # the scad and stl files are in the same directory
+            return import_(file="{}.stl".format(name))
+        return parent["obj"]
+
+    # the split parents imported by obj
+    def split_parents_in(self, obj):
+        if not self._split_parents:
+            return []
+        by_file = dict(("{}.stl".format(name), parent) for name, parent in self._split_parents.items())
+        return [by_file[file_name] for file_name in self.imports_in(obj) if file_name in by_file]
+
+    # the files obj imports, sorted
+    @staticmethod
+    def imports_in(obj):
+        found = set()
+        seen = set()
+        stack = [obj]
+        while stack:
+            node = stack.pop()
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            if node.name == "import":
+                found.add(dict(node.params)["file"])
+            stack.extend(node.children)
+        return sorted(found)
+
+    # the name of the Resolution profile the circles are made with
+    def resolution_mode(self):
+        if self.resolution_profile:
+            return self.resolution_profile
+        return "production" if self.production else "preview"
+
+    def set_resolution(self, profile):
+        self.resolution_profile = profile  # the tools and the parameters follow, see __setattr__
+
+    # the stl jobs are made by the workers of a RenderFarm on port instead of OpenSCAD here
+    def start_render_farm(self, port):
+        self._render_farm = RenderFarm(os.path.join(self.output_directory, "stl_cache"), self.stl_format,
+                                       host=self.render_farm_host, port=port,
+                                       heartbeat_timeout=self.render_farm_heartbeat_timeout)
+        self._render_farm.start()
+        self.configure_runners()
+
+    def stop_render_farm(self):
+        if self._render_farm:
+            self._render_farm.stop()
+            self._render_farm = None
+            self.configure_runners()
+
+    ##################################################################
+    # The command for the stl converter.  The stl_runner runs it.
     #
     # WARNING:   this can take a long time
     ##################################################################
 
     def make_stl_file_command(self, scad_file, stl_file):
-        command_list = ['/Applications/OpenSCAD.app/Contents/MacOS/OpenSCAD', '-o', stl_file, scad_file]
-        print("Creating the stl file {}".format(stl_file))
-        subprocess.call(command_list)
+        command_list = [self.openscad_executable, '-o', stl_file, scad_file]
+        return command_list
 
     ##################################################################
     # Th base of the band saw
@@ -638,9 +4928,9 @@ class BandSaw:
 
         base = hull()(
             translate((self.base_corner_radius, self.base_width / 2 - self.base_corner_radius, 0))(
-                cylinder(r=30, h=self.base_thickness)),
+                self.tools.cylinder(r=30, h=self.base_thickness)),
             translate((self.base_corner_radius, -self.base_width / 2 + self.base_corner_radius, 0))(
-                cylinder(r=30, h=self.base_thickness)),
+                self.tools.cylinder(r=30, h=self.base_thickness)),
             translate((self.base_length - self.base_corner_radius, self.base_width / 2 - self.base_corner_radius, 0))(
                 cube((self.base_corner_radius, self.base_corner_radius, self.base_thickness))),
             translate((self.base_length - self.base_corner_radius, -self.base_width / 2, 0))(
@@ -651,15 +4941,13 @@ class BandSaw:
         # If the width and length are changed then this needs to be fixed.
         # here we are cutting out the sides with that elegant curve in the original design.
         # If you just want a square set self.base_is_square = True
-        segments = 30
-
         if not self.base_is_square:
             big_circle_diameter = 790
             offset = big_circle_diameter / 2 + 70
             base = difference()(base, translate((self.base_length / 2, offset, -10))(
-                cylinder(d=big_circle_diameter, h=self.base_thickness * 2, segments=segments)))
+                self.tools.cylinder(d=big_circle_diameter, h=self.base_thickness * 2)))
             base = difference()(base, translate((self.base_length / 2, -offset, -10))(
-                cylinder(d=big_circle_diameter, h=self.base_thickness * 2, segments=segments)))
+                self.tools.cylinder(d=big_circle_diameter, h=self.base_thickness * 2)))
 
         # move the base down by the thickness so the rest starts from the x_y plane
         base = translate((0, 0, -self.base_thickness))(base)
@@ -819,7 +5107,7 @@ class BandSaw:
 
             translate((bottom_length - radius, 0, 0))(cube((radius, thickness, 20))),
             translate((bottom_length - radius, 0, bottom_height - radius))(
-                rotate((-90, 0, 0))(cylinder(r=radius, h=thickness)))
+                rotate((-90, 0, 0))(self.tools.cylinder(r=radius, h=thickness)))
         )
 
         plate += bottom
@@ -829,10 +5117,10 @@ class BandSaw:
         plate += translate((0, 0, bottom_height - epsilon_glue))(
             hull()(
                 cube([10, thickness, 10]),
-                translate((5, 0, top_height - 5 + epsilon_glue))(rotate((-90, 0, 0))(cylinder(r=5, h=thickness))),
+                translate((5, 0, top_height - 5 + epsilon_glue))(rotate((-90, 0, 0))(self.tools.cylinder(r=5, h=thickness))),
                 translate((top_length - 10, 0, 0))(cube([10, thickness, 10])),
                 translate((top_length - 5, 0, top_height - 5 + epsilon_glue))(
-                    rotate((-90, 0, 0))(cylinder(r=5, h=thickness)))
+                    rotate((-90, 0, 0))(self.tools.cylinder(r=5, h=thickness)))
             )
         )
 
@@ -846,56 +5134,18 @@ class BandSaw:
     ################################################################## acti
     def c_form_groove(self, bottom_angle=30, top_angle=-30, large_diameter=168, small_diameter=142):
         # make a solid of the groove that is to be cut out.
-        segments = 20
-        if self.production:
-            segments = 100
         center_of_groove = (large_diameter + small_diameter) / 2.0
-        groove = self.big_circle_parametric(large_diameter, self.c_form_width) - \
-                 self.big_circle_parametric(small_diameter, self.c_form_width)
-
-        # cut the bottom out
-        cutter = rotate((0, bottom_angle, 0))(
-            translate((0, 0, -300))(
-                cube((400, 100, 600))
-            ))
-        groove = groove - translate((self.center_x, self.center_y, self.center_z))(
-            cutter
-        )
-
-        # cut the top off
-        cutter = rotate((0, top_angle, 0))(
-            translate((0, 0, -300))(
-                cube((400, 100, 600))
-            ))
-        groove = groove - translate((self.center_x, self.center_y, self.center_z))(
-            cutter
-        )
-
         groove_end_diameter = large_diameter - small_diameter
-        groove += translate((self.center_x, 0, self.center_z))(
-            rotate((0, bottom_angle, 0))(
-                translate((0, 0, -center_of_groove))(
-                    rotate((90, 0, 0))(
-                        cylinder(d2=groove_end_diameter, d1=groove_end_diameter, h=self.c_form_width, center=True,
-                                 segments=segments)
-                    )
 
-                )
-            )
+        # The groove runs between the two circles (the "diameters" are used as radii) from the top angle
+        # round the back to the bottom angle.  The angles are rotations about y of the top and bottom end
+        # of the groove, in the xz plane that is 90 - top_angle to 270 - bottom_angle.
+        groove = self.tools.arc_slot(center_of_groove, groove_end_diameter, 90 - top_angle, 270 - bottom_angle,
+                                     self.c_form_width, center=True)
+        # arc_slot is in the xy plane, turn it up into xz
+        groove = translate((self.center_x, self.center_y + self.c_form_width / 2, self.center_z))(
+            rotate((90, 0, 0))(groove)
         )
-        groove += translate((self.center_x, 0, self.center_z))(
-            rotate((0, top_angle, 0))(
-                translate((0, 0, center_of_groove))(
-                    rotate((90, 0, 0))(
-                        cylinder(d2=groove_end_diameter, d1=groove_end_diameter, h=self.c_form_width, center=True,
-                                 segments=segments)
-                    )
-
-                )
-            )
-        )
-
-        groove = translate((0, 0, 0))(groove)
         return groove
 
     # this is here for cutting out the material as per the wood version
@@ -921,16 +5171,7 @@ class BandSaw:
             self.blade_guide_shape(200))
 
         obj += translate((self.center_x, self.center_y, self.center_z + 125 + 20))(
-            hull()(
-                rotate((90, 0, 0))(
-                    cylinder(d=10, h=100, center=True)
-                ),
-                translate((0, 0, 20))(
-                    rotate((90, 0, 0))(
-                        cylinder(d=10, h=100, center=True)
-                    )
-                )
-            )
+            self.tools.horizontal_slot_d(d=10, h=100, centers=[(0, 0), (0, 20)], center=True)
 
         )
 
@@ -971,7 +5212,7 @@ class BandSaw:
 
     def blade_protector_cover_connector(self):
         name = "blade_protector_cover_connector"
-        connector, _ = self.blade_protector_cover()
+        connector = self.split_parent("blade_protector_cover", self.blade_protector_cover)
         slice = 158
         connector = intersection()(
             connector,
@@ -1065,7 +5306,7 @@ class BandSaw:
 
     def blade_protector_cover_top(self):
         name = "blade_protector_cover_top"
-        cover, _ = self.blade_protector_cover(True)
+        cover = self.split_parent("blade_protector_cover_with_connector_holes", self.blade_protector_cover, True)
 
         cutter = translate((-500, -500, self.center_z - 500))(cube((1000, 1000, 500)))
         cover -= cutter
@@ -1073,7 +5314,7 @@ class BandSaw:
 
     def blade_protector_cover_bottom(self):
         name = "blade_protector_cover_bottom"
-        cover, _ = self.blade_protector_cover(True)
+        cover = self.split_parent("blade_protector_cover_with_connector_holes", self.blade_protector_cover, True)
 
         cutter = translate((-500, -500, self.center_z))(cube((1000, 1000, 500)))
         cover -= cutter
@@ -1150,8 +5391,8 @@ class BandSaw:
 
         )
 
-        cutout = hull()(self.top_axle(8), translate((0, 0, 45))(self.top_axle(8)))
-        cutout2 = hull()(translate((0, 0, -5))(self.top_axle(25)), translate((0, 0, 5))(self.top_axle(25)))
+        cutout = self.top_axle_slot(8, [0, 45])
+        cutout2 = self.top_axle_slot(25, [-5, 5])
 
         back_plate -= cutout
         back_plate -= cutout2
@@ -1245,10 +5486,7 @@ class BandSaw:
 
     def top_bearing_extension(self, thickness):
         radius = 25
-        extension = hull()(
-            translate((radius, 0, 0))(cylinder(r=radius, h=thickness, center=True)),
-            translate((120 - radius, 0, 0))(cylinder(r=radius, h=thickness, center=True))
-        )
+        extension = self.tools.slot_d(d=2 * radius, h=thickness, centers=[(radius, 0), (120 - radius, 0)], center=True)
         extension = rotate((90, 0, 0))(extension)
 
         extension = translate((0, 0, self.top_bearing_extension_height - 2 * radius))(extension)
@@ -1280,49 +5518,13 @@ class BandSaw:
 
         return obj, name
 
-    def cutter_tool_for_c_frame(self, angle):
-        tool_x_center = self.center_x
-        tool_y_center = self.center_z
-
-        peg = cylinder(d=5, h=300, center=True) + cube((600, 2, 100), center=True)
-        under_cutter = cube((600, 500, self.c_form_width / 2))
-        under_cutter = translate((-300, 0, 0))(under_cutter)
-
-        under_cutter = peg + under_cutter
-        under_cutter = rotate((0, 0, angle))(under_cutter)
-        under_cutter = translate((tool_x_center, tool_y_center, 0))(under_cutter)
-        return under_cutter
-
+    # the c_form cut into pieces that fit a 250mm printer, see render_split
     def c_form_250(self):
-        name = "__SEGMENTS__"
-        pieces = []
-
-        main_c_form = self.c_form()[2]  # printable is aligned on the xy plane
-
-        main_c_form = translate((0, -self.bottom_axle_position()[2] + 29, self.c_form_width / 2))(main_c_form)
-
-        lower_x_top = 200
-        lower_x_bottom = lower_x_top - self.c_form_width / 2
-
-        lower_y = 100
-
-        bottom_cutter = self.cutter_tool_for_c_frame(70)
-        piece1 = union()(
-            main_c_form,
-            bottom_cutter)
-
-        piece1 += translate((0, 0, -110))(bottom_cutter)
-        piece1 = bottom_cutter
-        piece2 = intersection()(
-            main_c_form,
-            translate((0, 200, 0))(cube((200, 200, 100)))
-        )
-
-        pieces = [dict(obj=piece1, name="c_form_300_part1", stl=True),
-                  dict(obj=piece2, name="c_form_300_part2", stl=True),
-                  dict(obj=piece1 + piece2, name="c_form_300_assembled_NO_PRINT", stl=False)
-                  ]
-        return pieces, name
+        name = "__SPLIT__"
+        # the printable c_form is the c_form part's stl, it is only meshed once
+        split = dict(obj=self.c_form()[2], mesh_name="c_form", name="c_form_250", build_volume=(250, 250, 250),
+                     dowel_diameter=self.tools.bolt_sizes["5mm"]["bolt"], dowel_length=20)
+        return split, name
 
     def c_form(self):
         name = "c_form"
@@ -1429,24 +5631,21 @@ class BandSaw:
         return holes
 
     def miter_hole_cutter(self, angle, radius):
-        segments = 20 if self.production else 10
         hole = rotate((0, 0, angle))(
             translate((0, -radius, 0))(
-                cylinder(h=30, d=self.tools.bolt_sizes["1/4"]["bolt"], center=True, segments=segments))
+                self.tools.cylinder(h=30, d=self.tools.bolt_sizes["1/4"]["bolt"], center=True))
         )
         return hole
 
     def table_top_miter_rotation_slot(self):
-        cut_steps = 10
-        if self.production:
-            cut_steps = 40
-
+        cut_steps = self.tools.resolution.sweep_steps
         angle_delta = 60 / cut_steps
+        max_angle = (cut_steps - 1) * angle_delta
 
-        slot = self.miter_hole_cutter(0, self.table_top_miter_hole_offset)
-        for i in range(1, cut_steps):
-            slot += self.miter_hole_cutter(i * angle_delta, self.table_top_miter_hole_offset)
-            slot += self.miter_hole_cutter(-i * angle_delta, self.table_top_miter_hole_offset)
+        # the miter_hole_cutter at angle a is at -90 + a degrees, so the slot is the sweep of that hole
+        # from -max_angle to max_angle
+        slot = self.tools.arc_slot(self.table_top_miter_hole_offset, self.tools.bolt_sizes["1/4"]["bolt"],
+                                   -90 - max_angle, -90 + max_angle, 30, center=True)
         return slot
 
     def fence_bar_slot_maker(self, length=1000, epsilon=0):
@@ -1474,7 +5673,7 @@ class BandSaw:
         attachment += cube((self.fence_width, self.fence_width, self.table_top_thickness + self.fence_height))
 
         attachment += translate((0, self.fence_width, 0))(
-            self.fence_bar_slot_maker(self.fence_attachment_width, 0.4))
+            self.fence_bar_slot_maker(self.fence_attachment_width, self.fence_bar_slot_clearance))
 
         attachment -= self.fence_bar_bolt_holes()
         return attachment
@@ -1515,10 +5714,9 @@ class BandSaw:
 
         slot_diameter = self.tools.round_bolt_sizes["5mm"]["bolt"]
 
-        cutter = rotate((90, 0, 0))(cylinder(d=slot_diameter, h=60, center=True))
-
-        slot = hull()(translate((20, 0, self.table_top_thickness / 2))(cutter),
-                      translate((self.fence_attachment_width - 20, 0, self.table_top_thickness / 2))(cutter))
+        slot = self.tools.horizontal_slot_d(d=slot_diameter, h=60, center=True,
+                                            centers=[(20, self.table_top_thickness / 2),
+                                                     (self.fence_attachment_width - 20, self.table_top_thickness / 2)])
 
         bolts += slot
         return bolts
@@ -1563,12 +5761,6 @@ class BandSaw:
         bar_depth = self.total_table_depth()
         fence_bar = cube((self.fence_width, bar_depth, self.fence_height))
         fence_bar = translate((0, -bar_depth, self.table_top_thickness))(fence_bar)
-        table_top = self.table_top()[2]
-        front_attachment = self.fence_bar_attachment_front()[2]
-        back_attachment = self.fence_bar_attachment_back()[2]
-
-        printable = table_top + fence_bar + front_attachment + back_attachment
-
         fence_bar -= self.fence_bar_bolt_holes(True)
 
         fence_bar -= self.fence_nut_holes()
@@ -1581,10 +5773,8 @@ class BandSaw:
     def table_top_miter(self):
         name = "table_top_miter"
 
-        big_segments = 100 if self.production else 30
-
         # make the base circle
-        miter = cylinder(h=self.table_top_miter_thickness, r=self.table_top_miter_radius, segments=big_segments)
+        miter = self.tools.cylinder(h=self.table_top_miter_thickness, r=self.table_top_miter_radius)
 
         # cut off the flat part at the front
         miter = miter - translate((-100, 0, -10))(cube((200, 200, 200)))
@@ -1664,9 +5854,9 @@ class BandSaw:
     # make the guide for the pusher
     def table_top_miter_bar_maker(self, make_cutter):
 
-        offset = 0.7  # this is because i made the cutter the default
-        if make_cutter:
-            offset = 1
+        offset = 1  # the slot is this much wider than the guide on each side
+        if not make_cutter:
+            offset -= self.table_miter_bar_clearance / 2
 
         width = self.table_guide_slot_width + 2 * offset
         depth = self.table_miter_slot_depth
@@ -1698,10 +5888,6 @@ class BandSaw:
 
         guide_bar = translate((0, -self.table_top_miter_radius, 0))(guide_bar)
 
-        self.table_top_center_x = self.center_x + self.wheel_diameter / 2
-        self.table_top_center_y = -self.c_form_width / 2 - self.wheel_offset_from_frame - (self.back_plate_thickness)
-        self.table_top_center_z = self.back_plate_tip[2]
-
         guide_bar = translate((0, bar_length / 2, 0))(guide_bar)
 
         guide_bar -= self.miter_connect_holes()
@@ -1743,19 +5929,14 @@ class BandSaw:
         printable = rotate((90, 0, 0))(slider_holder)
         return slider_holder, name, printable
 
-    def table_holder_slide(self, thickness, width, height, separation, epsilon=0.5):
-        right = hull()(
-            translate((0, 0, 0))(cylinder(d=0.5, h=height)),
-            translate((width + thickness / 2, 0, 0))(cylinder(d=0.5, h=height)),
-            translate((width, thickness / 2, 0))(cylinder(d=0.5, h=height)),
-            translate((0, thickness / 2, 0))(cylinder(d=0.5, h=height))
-        )
-        outer_right = hull()(
-            translate((0, 0, 0))(cylinder(d=0.5, h=height)),
-            translate((width, 0, 0))(cylinder(d=0.5, h=height)),
-            translate((width + thickness / 2, thickness / 2, 0))(cylinder(d=0.5, h=height)),
-            translate((0, thickness / 2, 0))(cylinder(d=0.5, h=height))
-        )
+    def table_holder_slide(self, thickness, width, height, separation, epsilon=None):
+        if epsilon is None:
+            epsilon = self.table_slide_clearance
+        right = self.tools.slot_d(d=0.5, h=height, centers=[(0, 0), (width + thickness / 2, 0),
+                                                            (width, thickness / 2), (0, thickness / 2)])
+        outer_right = self.tools.slot_d(d=0.5, h=height, centers=[(0, 0), (width, 0),
+                                                                  (width + thickness / 2, thickness / 2),
+                                                                  (0, thickness / 2)])
         right += translate((0, thickness / 2, 0))(outer_right)
         left = scale((-1, 1, 1))(right)
         right = translate((-width - epsilon, 0, 0))(right)
@@ -1783,18 +5964,12 @@ class BandSaw:
         table_depth = self.table_top_depth + table_extra_depth
 
         table_width = self.table_top_width
-        # use the hull operator on cylinders to make it nice with round corners
-        table_top = hull()(
-            translate((self.table_top_corner_radius, self.table_top_corner_radius, 0))(cylinder(
-                r=self.table_top_corner_radius, h=self.table_top_thickness)),
-            translate((table_width - self.table_top_corner_radius, self.table_top_corner_radius, 0))(cylinder(
-                r=self.table_top_corner_radius, h=self.table_top_thickness)),
-            translate((table_width - self.table_top_corner_radius, table_depth - self.table_top_corner_radius, 0))(
-                cylinder(
-                    r=self.table_top_corner_radius, h=self.table_top_thickness)),
-            translate((self.table_top_corner_radius, table_depth - self.table_top_corner_radius, 0))(cylinder(
-                r=self.table_top_corner_radius, h=self.table_top_thickness))
-        )
+        # a rectangle with round corners
+        corner = self.table_top_corner_radius
+        table_top = self.tools.slot_d(d=2 * corner, h=self.table_top_thickness,
+                                      centers=[(corner, corner), (table_width - corner, corner),
+                                               (table_width - corner, table_depth - corner),
+                                               (corner, table_depth - corner)])
 
         # translated the table by the half of the back end of the table_depth
 
@@ -1827,9 +6002,9 @@ class BandSaw:
             center_hole += translate((x_origin_offset, y_origin_offset, z_offset))(
                 cube((square_top_width, square_top_width, 40)))
         else:
-            center_hole = cylinder(d=self.table_top_cutout_diameter, h=100, center=True)
+            center_hole = self.tools.cylinder(d=self.table_top_cutout_diameter, h=100, center=True)
             center_hole += translate((0, 0, self.table_top_thickness - self.table_top_cutout_depth))(
-                cylinder(d=self.table_top_cutout_diameter + 2 * self.table_top_cutout_extra, h=20))
+                self.tools.cylinder(d=self.table_top_cutout_diameter + 2 * self.table_top_cutout_extra, h=20))
             center_hole = translate((center_hole_x, center_hole_y, 0))(
                 center_hole)
         table_top -= center_hole
@@ -1864,7 +6039,7 @@ class BandSaw:
         bolt_offset_z = self.table_top_thickness / 2
         bolt_diameter = self.tools.round_bolt_sizes["5mm"]["bolt"]
 
-        bolt_cutter = rotate((90, 0, 0))(cylinder(d=bolt_diameter, h=1000, center=True))
+        bolt_cutter = rotate((90, 0, 0))(self.tools.cylinder(d=bolt_diameter, h=1000, center=True))
         bolt_cutter = translate((bolt_offset_x, 0, bolt_offset_z))(bolt_cutter)
         return bolt_cutter
 
@@ -1914,14 +6089,8 @@ class BandSaw:
         x_offsets = [self.table_vertical_plate_width / 2 - self.table_connector_bolt_separation / 2,
                      self.table_vertical_plate_width / 2 + self.table_connector_bolt_separation / 2]
 
-        adjustment_groove = hull()(
-            translate((0, 0, self.table_vertical_plate_height - 20))(
-                self.tools.horizontal_cylinder_d(d=self.guide_small_groove, h=200, center=True)
-            ),
-            translate((0, 0, 10))(
-                self.tools.horizontal_cylinder_d(d=self.guide_small_groove, h=200, center=True)
-            )
-        )
+        adjustment_groove = self.tools.horizontal_slot_d(d=self.guide_small_groove, h=200, center=True,
+                                                         centers=[(0, self.table_vertical_plate_height - 20), (0, 10)])
 
         table_attachment -= translate((x_offsets[1], self.table_vertical_plate_thickness - 5, 0))((adjustment_groove))
         table_attachment -= translate((x_offsets[0], self.table_vertical_plate_thickness - 5, 0))((adjustment_groove))
@@ -1970,28 +6139,25 @@ class BandSaw:
                 self.center_z + 185 - 29)
 
     def bottom_bearing(self, diameter, height):
-        segments = 15
-        if self.production:
-            segments = 30
         position = list(self.bottom_axle_position())
         position[1] = -self.c_form_width / 2
         axle = translate(position)(
             rotate((-90, 0, 0))(
-                cylinder(d=diameter, h=height, segments=segments)
+                self.tools.cylinder(d=diameter, h=height)
             )
         )
         # now put the bearing hole at the back
         back_y_position = self.c_form_width / 2 - height
         axle += translate((position[0], back_y_position, position[2]))(
             rotate((-90, 0, 0))(
-                cylinder(d=diameter, h=height, segments=segments)
+                self.tools.cylinder(d=diameter, h=height)
             )
         )
         # Now put an angle at the back to make it print with no supports
         back_y_position -= 7
         axle += translate((position[0], back_y_position, position[2]))(
             rotate((-90, 0, 0))(
-                cylinder(d2=diameter, d1=diameter - 14, h=7, segments=30)
+                self.tools.cylinder(d2=diameter, d1=diameter - 14, h=7)
             )
         )
         return axle
@@ -2001,7 +6167,7 @@ class BandSaw:
         position[1] = -self.c_form_width / 2
         axle = translate(position)(
             rotate((-90, 0, 0))(
-                cylinder(d=diameter, h=height, segments=30)
+                self.tools.cylinder(d=diameter, h=height)
             )
         )
 
@@ -2010,14 +6176,14 @@ class BandSaw:
         back_y_position = self.c_form_width / 2 + self.top_bearing_tab_thickness - height - back_y_offset
         axle += translate((position[0], back_y_position, position[2]))(
             rotate((-90, 0, 0))(
-                cylinder(d=diameter, h=height, segments=30)
+                self.tools.cylinder(d=diameter, h=height)
             )
         )
         # Now put an angle at the back to make it print with no supports
         back_y_position -= 7
         axle += translate((position[0], back_y_position, position[2]))(
             rotate((-90, 0, 0))(
-                cylinder(d2=diameter, d1=diameter - 14, h=7, segments=30)
+                self.tools.cylinder(d2=diameter, d1=diameter - 14, h=7)
             )
         )
         return axle
@@ -2025,7 +6191,7 @@ class BandSaw:
     def bottom_axle(self, diameter):
         axle = translate(self.bottom_axle_position())(
             rotate((-90, 0, 0))(
-                cylinder(d=diameter, h=1000, center=True, segments=30)
+                self.tools.cylinder(d=diameter, h=1000, center=True)
             )
         )
         return axle
@@ -2033,13 +6199,20 @@ class BandSaw:
     def top_axle(self, diameter):
         axle = translate(self.top_axle_position())(
             rotate((-90, 0, 0))(
-                cylinder(d=diameter, h=1000, center=True, segments=30)
+                self.tools.cylinder(d=diameter, h=1000, center=True)
             )
         )
         return axle
 
+    # the top axle moved up and down between z_offsets
+    def top_axle_slot(self, diameter, z_offsets):
+        slot = translate(self.top_axle_position())(
+            self.tools.horizontal_slot_d(d=diameter, h=1000, centers=[(0, z) for z in z_offsets], center=True)
+        )
+        return slot
+
     def inner_slider(self):
-        epsilon = 0.5
+        epsilon = self.inner_slider_clearance
         small_diameter = 142 + epsilon
         large_diameter = 168 - epsilon
 
@@ -2101,14 +6274,11 @@ class BandSaw:
         name = "test_wheel_connection"
         wheel = self.wheel(True)
         wheel = rotate((-90, 0, 0))(wheel)
-        wheel = intersection()(wheel, cylinder(d=40, h=200, center=True))
+        wheel = intersection()(wheel, self.tools.cylinder(d=40, h=200, center=True))
         return wheel, name
 
     def wheel_flat(self):
-        segments = 20
-        if self.production:
-            segments = 300
-        wheel = self.tools.horizontal_cylinder_d(d=self.wheel_diameter, h=self.wheel_thickness, segments=segments)
+        wheel = self.tools.horizontal_cylinder_d(d=self.wheel_diameter, h=self.wheel_thickness)
         wheel = translate((0, -self.wheel_thickness / 2.0))(wheel)
         return wheel
 
@@ -2122,12 +6292,7 @@ class BandSaw:
             center = 100 #bottom wheel has a slight arch
         offset = radius - center
 
-        slivers = 5
-        segments = 20
-        if self.production:
-            slivers = 20
-            segments = 300
-
+        slivers = self.tools.resolution.slivers
         delta = half_width / (slivers - 1)
 
         def radius(center, offset, x):
@@ -2139,12 +6304,11 @@ class BandSaw:
         for i in range(slivers):
             radii.append(radius(center, offset, i * delta))
 
-        wheel = self.tools.horizontal_cylinder_d1d2(d1=radii[0] * 2, d2=radii[1] * 2, h=delta, segments=segments)
+        wheel = self.tools.horizontal_cylinder_d1d2(d1=radii[0] * 2, d2=radii[1] * 2, h=delta)
         wheel += scale((1, -1, 1))(wheel)
         for i in range(slivers - 2):
             j = i + 1
-            sliver = self.tools.horizontal_cylinder_d1d2(d1=radii[j] * 2, d2=radii[j + 1] * 2, h=delta,
-                                                         segments=segments)
+            sliver = self.tools.horizontal_cylinder_d1d2(d1=radii[j] * 2, d2=radii[j + 1] * 2, h=delta)
             sliver = translate((0, j * delta, 0))(sliver)
             sliver += scale((1, -1, 1))(sliver)
             wheel += sliver
@@ -2160,11 +6324,11 @@ class BandSaw:
 
         # now the holes for the nuts that will hold the wheel to the collet
 
-        coupling_holes = translate((0, 0, -self.wheel_thickness / 2))(cylinder(d=32.6, h=6, segments=30))
+        coupling_holes = translate((0, 0, -self.wheel_thickness / 2))(self.tools.cylinder(d=32.6, h=6))
         for angle in [0, 90, 180, 270]:
             hole = rotate((0, 0, angle))(
                 translate((12.1, 0, 0))(
-                    cylinder(d=self.tools.bolt_sizes["4mm"]["bolt"], h=100, center=True, segments=20)
+                    self.tools.cylinder(d=self.tools.bolt_sizes["4mm"]["bolt"], h=100, center=True)
                 ))
             if coupling_holes:
                 coupling_holes += hole
@@ -2236,35 +6400,19 @@ class BandSaw:
         # the plate
         guide = self.blade_guide_shape(height)
         # the groove to allow this piece to move up and down.
+        groove_centers = [(0, height - self.guide_groove_from_top), (0, self.guide_groove_from_bottom)]
         adjustment_groove = rotate((0, 0, -90))(
-            hull()(
-                translate((0, 0, height - self.guide_groove_from_top))(
-                    self.tools.horizontal_cylinder_d(d=self.guide_small_groove, h=200, center=True)
-                ),
-                translate((0, 0, self.guide_groove_from_bottom))(
-                    self.tools.horizontal_cylinder_d(d=self.guide_small_groove, h=200, center=True)
-                )
-            )
+            self.tools.horizontal_slot_d(d=self.guide_small_groove, h=200, centers=groove_centers, center=True)
         )
 
         # the slot for the head of the bolt.
         big_groove = rotate((0, 0, -90))(
-            hull()(
-                translate((0, 0, height - self.guide_groove_from_top))(
-                    self.tools.horizontal_cylinder_d(d=self.guide_large_groove, h=200, center=False)
-                ),
-                translate((0, 0, self.guide_groove_from_bottom))(
-                    self.tools.horizontal_cylinder_d(d=self.guide_large_groove, h=200, center=False)
-                )
-            )
+            self.tools.horizontal_slot_d(d=self.guide_large_groove, h=200, centers=groove_centers, center=False)
         )
         adjustment_groove += translate((self.guide_large_groove_depth, 0, 0))(big_groove)
         guide -= adjustment_groove
 
         # now cut out the holder for the metal part that will hold the bearings for the guide.
-        self.bearing_plate_height = 30
-        self.bearing_plate_depth = 6
-
         bearing_plate_cutter = cube((self.bearing_plate_depth, self.c_form_width, self.bearing_plate_height))
         bearing_plate_cutter = translate(
             (self.guide_plate_thickness - self.bearing_plate_depth, -self.c_form_width / 2, 0))(bearing_plate_cutter)
@@ -2282,17 +6430,9 @@ class BandSaw:
         return guide, name
 
     def thrust_bearing_hole(self):
-        y_offsets = [-self.c_form_width / 4, self.c_form_width / 4]
-
-        def hole():
-            hole = rotate((0, 0, 90))(
-                self.tools.horizontal_cylinder_d(d=self.guide_plate_bolt_diameter, h=100, center=True)
-            )
-            return hole
-
-        slot = hull()(
-            translate((0, 7, 11))(hole()),
-            translate((0, 15, 11))(hole())
+        slot = rotate((0, 0, 90))(
+            self.tools.horizontal_slot_d(d=self.guide_plate_bolt_diameter, h=100, centers=[(7, 11), (15, 11)],
+                                         center=True)
         )
         return slot
 
@@ -2300,30 +6440,17 @@ class BandSaw:
         z_offset = -7
         slot_depth = 10
         screw_depth = 32
-        slots = hull()(
-            translate((-22, -screw_depth, z_offset))(
-                self.tools.horizontal_cylinder_d(d=4.4, h=screw_depth, segments=4)),
-            translate((12, -screw_depth, z_offset))(self.tools.horizontal_cylinder_d(d=4.4, h=screw_depth, segments=4))
+        slots = translate((0, -screw_depth, 0))(
+            self.tools.horizontal_slot_d(d=4.4, h=screw_depth, centers=[(-22, z_offset), (12, z_offset)], segments=4)
         )
 
-        slots += hull()(
-            translate((-100, 0, z_offset))(self.tools.horizontal_cylinder_d(d=7.7, h=slot_depth, center=False)),
-            translate((100, 0, z_offset))(self.tools.horizontal_cylinder_d(d=7.7, h=slot_depth, center=False))
-        )
+        slots += self.tools.horizontal_slot_d(d=7.7, h=slot_depth, centers=[(-100, z_offset), (100, z_offset)])
 
         slots = translate((0, 20, 0))(slots)
         return slots
 
     def blade_guide_bearing_holder(self):
 
-        self.bearing_holder_height = 30
-        self.bearing_holder_extension = 3  # how much towards the front we need to push bearings
-        self.bearing_holder_front_length = 16
-        self.bearing_holder_slope_length = 16  # could link with the above
-        self.bearing_holder_front_slope_height = 17
-        self.bearing_holder_length = self.c_form_width + self.bearing_holder_front_length
-        self.bearing_holder_thickness = 18
-
         constructor_cube = cube((self.bearing_holder_thickness, 1, 1))
         # The shape of the holder according to the original plan
         obj = hull()(
@@ -2367,30 +6494,23 @@ class BandSaw:
         controller_handle_length = 60
         controller_handle_angle = 150
 
-        drill_cutter = hull()(
-            cylinder(d=drill_handle_width, h=100, center=True),
-            translate((drill_handle_length - drill_handle_width, 0, 0))(
-                cylinder(d=drill_handle_width, h=100, center=True))
-        )
+        drill_cutter = self.tools.slot_d(d=drill_handle_width, h=100, center=True,
+                                         centers=[(0, 0), (drill_handle_length - drill_handle_width, 0)])
         cut_width = drill_handle_width + 2
         drill_cutter = translate((-(drill_handle_length - drill_handle_width) / 2, 0, 0))(drill_cutter)
         drill_cutter += translate((-cut_width / 2, 0, -50))(cube((cut_width, 100, 100)))
 
-        base_body = hull()(
-            cylinder(d=drill_handle_width + 2 * base_wall_thickness, h=base_height),
-            translate((drill_handle_length - drill_handle_width + axle_offset, 0, 0))(
-                cylinder(d=drill_handle_width + 2 * base_wall_thickness, h=base_height))
-        )
+        base_body = self.tools.slot_d(d=drill_handle_width + 2 * base_wall_thickness, h=base_height,
+                                      centers=[(0, 0), (drill_handle_length - drill_handle_width + axle_offset, 0)])
         base = base_body - translate((axle_offset, 0, 0))(drill_cutter)
 
         bolt_hole = self.tools.hexagonal_bolt_hole_z("1/4", 50)
-        controller_pusher = cylinder(d=30, h=pusher_thickness)
+        controller_pusher = self.tools.cylinder(d=30, h=pusher_thickness)
 
         controller_handle = translate((controller_handle_length / 2, 0, handle_width / 2))(
             cube((controller_handle_length, handle_width, handle_width), center=True))
         controller_handle = rotate((0, 0, controller_handle_angle))(controller_handle)
 
-        controller_base = cylinder(d=50, h=5)
         controller = controller_pusher + controller_handle
         controller = translate((-10, 0, 0))(controller)
 
@@ -2415,9 +6535,6 @@ class BandSaw:
                   dict(obj=controller + base, name="controller_NO_PRINT", stl=False)
                   ]
         return pieces, name
-        result = base + controller_pusher
-        # result = drill_cutter
-        return pieces, name
 
     def blade_guide_bearing_bolt_v2(self):
         bolt = self.tools.round_bolt_hole_z("4mm", length=50)
@@ -2433,17 +6550,6 @@ class BandSaw:
     def blade_guide_bearing_holder_v2(self):
         name = "blade_guide_bearing_holder_v2"
 
-        self.bearing_holder_height = 30
-        self.bearing_holder_extension = 3  # how much towards the front we need to push bearings
-        self.bearing_holder_front_length = 16
-        self.bearing_holder_slope_length = 16  # could link with the above
-        self.bearing_holder_front_slope_height = 17
-        self.bearing_holder_length = self.c_form_width + self.bearing_holder_front_length
-        self.bearing_holder_thickness = 18
-        self.guide_bearing_x_offset = 28
-
-        self.thrust_bearing_thickness = 15
-
         obj = cube((self.bearing_holder_thickness, self.c_form_width, self.bearing_holder_height))
         obj = translate((0, self.bearing_holder_front_length, 0))(obj)
 
@@ -2525,30 +6631,25 @@ class BandSaw:
             slot_offset = [-2, 6]
 
         def hole():
+            if make_slot:
+                return rotate((0, 0, 90))(
+                    self.tools.horizontal_slot_d(d=self.guide_plate_bolt_diameter, h=100, center=True,
+                                                 centers=[(slot_offset[0], 0), (slot_offset[1], 0)])
+                )
 
             result = rotate((0, 0, 90))(
                 self.tools.horizontal_cylinder_d(d=self.guide_plate_bolt_diameter, h=100, center=True)
             )
-            if not make_slot:
-                nut_hole = rotate((0, 0, 90))(
-                    self.tools.horizontal_cylinder_d(d=self.guide_plate_nut_diameter, h=100, center=False, segments=6)
-                )
-                result += nut_hole
+            nut_hole = rotate((0, 0, 90))(
+                self.tools.horizontal_cylinder_d(d=self.guide_plate_nut_diameter, h=100, center=False, segments=6)
+            )
+            result += nut_hole
             return result
 
         holes = None
         for y in y_offsets:
             for z in z_offsets:
-                if make_slot:
-                    new_hole = translate((0, y, z))(
-                        hull()(
-                            translate((0, slot_offset[0], 0))(hole()),
-                            translate((0, slot_offset[1], 0))(hole())
-                        )
-                    )
-
-                else:
-                    new_hole = translate((0, y, z))(hole())
+                new_hole = translate((0, y, z))(hole())
                 if holes:
                     holes += new_hole
                 else:
@@ -2567,11 +6668,8 @@ class BandSaw:
         return origin_x, origin_y, origin_z
 
     def big_circle_parametric(self, radius, thickness=43):
-        segments = 50
-        if self.production:
-            segments = 400
         obj = translate((self.center_x, self.center_y, self.center_z))(
-            rotate((-90, 0, 0))(cylinder(r=radius, h=thickness, segments=segments)))
+            rotate((-90, 0, 0))(self.tools.cylinder(r=radius, h=thickness)))
         return obj
 
     def big_circle(self):
@@ -2583,8 +6681,8 @@ class BandSaw:
     def bottom_bolt(self):
         bolt_diameter = self.tools.bolt_sizes["1/4"]["bolt"]
         nut_diameter = 10.5
-        bolt_hole = cylinder(d=bolt_diameter, h=1000)
-        bolt_hole += cylinder(d1=bolt_diameter * 3, d2=bolt_diameter, h=bolt_diameter)
+        bolt_hole = self.tools.cylinder(d=bolt_diameter, h=1000)
+        bolt_hole += self.tools.cylinder(d1=bolt_diameter * 3, d2=bolt_diameter, h=bolt_diameter)
 
         return bolt_hole
 
@@ -2679,7 +6777,114 @@ class BandSaw:
         obj = translate((-30, 0, -200))(obj)
         return obj, name
 
-
-b = BandSaw()
-
-b.render_all()
+    ##################################################################
+    # Time building every part (no files are written) and measure the
+    # peak memory used while doing it.
+    ##################################################################
+    def benchmark(self, repeat=3):
+        funcs = [part[0] for part in self.parts]
+
+        def build_all():
+            results = []
+            for func in funcs:
+                with self.generating(func.__name__):
+                    results.append(func())
+            return results
+
+        times = []
+        for i in range(repeat):
+            start = time.perf_counter()
+            build_all()
+            times.append(time.perf_counter() - start)
+
+        # measure the memory on a separate run, tracemalloc slows everything down
+        tracemalloc.start()
+        results = build_all()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        del results
+
+        print("Built {} parts: best {:.3f}s, worst {:.3f}s, peak memory {:.1f} MiB".format(
+            len(funcs), min(times), max(times), peak / (1024 * 1024)))
+        return min(times), peak
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the OpenSCAD files for the band saw")
+    parser.add_argument("--benchmark", action="store_true", help="time building all the parts, do not render them")
+    parser.add_argument("--resolution", choices=sorted(Resolution.profiles),
+                        help="how fine the circles are, the default follows production")
+    parser.add_argument("--find-dead-builds", action="store_true",
+                        help="report geometry the parts build and never use, do not render them")
+    parser.add_argument("--check-bolt-holes", action="store_true",
+                        help="check that the bolt holes of the parts that are bolted together line up")
+    parser.add_argument("--check-purity", action="store_true",
+                        help="check that every part builds the same in any order and does not change the model")
+    parser.add_argument("--check-splitter", action="store_true",
+                        help="check that a box too big for the printer is split into closed pieces")
+    parser.add_argument("--tolerances", nargs="?", const="", metavar="PRINTER",
+                        help="how likely the parts that go into each other bind or are too loose when printed on "
+                             "PRINTER (pla, petg, abs)")
+    parser.add_argument("--resume", action="store_true",
+                        help="keep the stl files an interrupted run made, only run the jobs it did not finish")
+    parser.add_argument("--farm", type=int, metavar="PORT",
+                        help="make the stl files, by the workers that connect to PORT, see --worker")
+    parser.add_argument("--worker", metavar="URL", help="make stl files for the --farm at URL, e.g. http://host:8766")
+    parser.add_argument("--worker-jobs", type=int, default=1, metavar="N",
+                        help="how many OpenSCADs the worker runs at a time")
+    parser.add_argument("--worker-openscad", metavar="PATH",
+                        help="the OpenSCAD the worker runs, stand-in sends back a 10 mm cube for every job "
+                             "to try the farm without OpenSCAD")
+    parser.add_argument("--diff", nargs=2, metavar=("OLD", "NEW"),
+                        help="what changed between two builds, each a manifest.json or an output directory")
+    parser.add_argument("--draft", nargs="*", metavar="PART",
+                        help="draft meshes of the parts (all of them without a PART) in seconds, without OpenSCAD")
+    parser.add_argument("--serve", type=int, nargs="?", const=8765, metavar="PORT",
+                        help="keep the model running and render parts when asked, on localhost:PORT (8765)")
+    args = parser.parse_args()
+
+    b = BandSaw()
+    if args.resolution:
+        b.set_resolution(args.resolution)
+
+    if args.benchmark:
+        b.benchmark()
+    elif args.find_dead_builds:
+        b.find_dead_builds()
+    elif args.check_bolt_holes:
+        if b.check_bolt_holes():
+            sys.exit(1)
+    elif args.check_purity:
+        if b.check_part_purity():
+            sys.exit(1)
+    elif args.check_splitter:
+        try:
+            MeshSplitter.check()
+        except MeshError as e:
+            sys.exit("Splitting failed, {}".format(e))
+    elif args.tolerances is not None:
+        try:
+            b.tolerance_stackup(args.tolerances or None)
+        except ValueError as e:
+            sys.exit("Can not check the fits, {}".format(e))
+    elif args.diff:
+        try:
+            b.diff(*args.diff)
+        except ValueError as e:
+            sys.exit("Can not compare the builds, {}".format(e))
+    elif args.draft is not None:
+        b.draft(args.draft)
+    elif args.serve:
+        RenderServer(b, port=args.serve).serve()
+    elif args.worker:
+        RenderWorker(args.worker, args.worker_openscad or b.openscad_executable, jobs=args.worker_jobs).run()
+    else:
+        if args.farm:
+            b.make_stl = True  # the farm is there to make the stl files
+            b.start_render_farm(args.farm)
+        try:
+            b.render_all(resume=args.resume)
+        except MeshError as e:
+            sys.exit("Build failed, {}".format(e))
+        finally:
+            b.stop_render_farm()